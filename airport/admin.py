@@ -8,6 +8,7 @@ from .models import (
     Crew,
     Flight,
     Order,
+    SeatHold,
     Ticket,
 )
 
@@ -46,3 +47,10 @@ class RouteAdmin(admin.ModelAdmin):
 class CrewAdmin(admin.ModelAdmin):
     ordering = ("first_name", "last_name")
     search_fields = ("first_name", "last_name")
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    ordering = ("expires_at",)
+    list_display = ("flight", "row", "seat", "user", "expires_at")
+    list_filter = ("flight",)
@@ -0,0 +1,107 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.response import Response
+
+from airport.renderers import FastJSONRenderer
+from airport.seat_holds import aget_held_map
+from airport.seat_map import aget_seat_map
+from airport.views import AirportViewSet, FlightViewSet
+
+
+def async_action(viewset_class, action):
+    """
+    Serve ``action`` of ``viewset_class`` from an async view. The viewset
+    still provides authentication, permissions, throttling, the queryset and
+    the serializer, so responses match the sync endpoint; only database
+    access is awaited. Responses are always JSON.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        async def view(request, **kwargs):
+            viewset = viewset_class(
+                action_map={"get": action},
+                renderer_classes=(FastJSONRenderer,),
+                args=(),
+                kwargs=kwargs,
+                format_kwarg=None,
+                headers={"Allow": "GET"},
+            )
+            request = viewset.initialize_request(request, **kwargs)
+            viewset.request = request
+            try:
+                await sync_to_async(viewset.initial)(request, **kwargs)
+                if request.method != "GET":
+                    raise MethodNotAllowed(request.method)
+                response = await handler(viewset, request, **kwargs)
+            except Exception as exc:
+                response = viewset.handle_exception(exc)
+
+            response = viewset.finalize_response(request, response)
+            content = response.rendered_content
+            return HttpResponse(
+                content,
+                status=response.status_code,
+                headers=dict(response.items()),
+            )
+
+        view.csrf_exempt = True
+        return view
+
+    return decorator
+
+
+async def aget_object(viewset):
+    """``GenericAPIView.get_object`` with the lookup awaited."""
+    queryset = viewset.filter_queryset(viewset.get_queryset())
+    lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+    try:
+        obj = await queryset.aget(
+            **{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]}
+        )
+    except (
+        queryset.model.DoesNotExist,
+        DjangoValidationError,
+        TypeError,
+        ValueError,
+    ):
+        raise Http404(
+            f"No {queryset.model._meta.object_name} matches the given query."
+        )
+    viewset.check_object_permissions(viewset.request, obj)
+    return obj
+
+
+@async_action(FlightViewSet, "list")
+async def flight_list(viewset, request):
+    queryset = viewset.filter_queryset(viewset.get_queryset())
+    page = await viewset.paginator.apaginate_queryset(
+        queryset, request, viewset
+    )
+    serializer = viewset.get_serializer(page, many=True)
+    return viewset.get_paginated_response(serializer.data)
+
+
+@async_action(FlightViewSet, "retrieve")
+async def flight_detail(viewset, request, pk):
+    flight = await aget_object(viewset)
+    return Response(viewset.get_serializer(flight).data)
+
+
+@async_action(FlightViewSet, "seat_map")
+async def flight_seat_map(viewset, request, pk):
+    flight = await aget_object(viewset)
+    seat_map = await aget_seat_map(flight)
+    seat_map.held = await aget_held_map(flight)
+    return Response(viewset.get_serializer(seat_map).data)
+
+
+@async_action(AirportViewSet, "list")
+async def airport_list(viewset, request):
+    queryset = viewset.filter_queryset(viewset.get_queryset())
+    airports = [airport async for airport in queryset.aiterator()]
+    return Response(viewset.get_serializer(airports, many=True).data)
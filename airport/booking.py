@@ -0,0 +1,169 @@
+
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from airport import search_index, seat_map
+from airport.models import Flight, SeatHold, Ticket
+
+LOCK_TIMEOUT_MS = 5000
+# SQLSTATE lock_not_available, raised when lock_timeout runs out.
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class SeatConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are already taken."
+    default_code = "seat_conflict"
+
+    def __init__(self, seats=(), detail=None):
+        super().__init__(detail)
+        self.detail = {
+            "detail": self.detail,
+            "conflicts": [
+                {"flight": flight_id, "row": row, "seat": seat}
+                for flight_id, row, seat in sorted(seats)
+            ],
+        }
+
+
+def is_lock_timeout(error):
+    """
+    Whether the ``OperationalError`` ``error`` means a lock wait ran out,
+    as opposed to a lost connection or another server error.
+    """
+    if connection.vendor == "postgresql":
+        cause = error.__cause__
+        return LOCK_NOT_AVAILABLE in (
+            getattr(cause, "sqlstate", None), getattr(cause, "pgcode", None)
+        )
+    if connection.vendor == "sqlite":
+        return str(error) in ("database is locked", "database table is locked")
+    return False
+
+
+def get_taken_seats(seats):
+    flight_ids = {flight_id for flight_id, _, _ in seats}
+    rows = {row for _, row, _ in seats}
+    seat_numbers = {seat for _, _, seat in seats}
+    taken = Ticket.objects.filter(
+        flight_id__in=flight_ids, row__in=rows, seat__in=seat_numbers
+    ).values_list("flight_id", "row", "seat")
+    return set(taken) & set(seats)
+
+
+def get_held_seats(seats, exclude_user_id=None):
+    """
+    Seats among ``(flight_id, row, seat)`` triples with an active hold
+    of anybody but ``exclude_user_id``.
+    """
+    holds = SeatHold.objects.filter(
+        flight_id__in={flight_id for flight_id, _, _ in seats},
+        row__in={row for _, row, _ in seats},
+        seat__in={seat for _, _, seat in seats},
+        expires_at__gt=timezone.now(),
+    )
+    if exclude_user_id is not None:
+        holds = holds.exclude(user_id=exclude_user_id)
+    return set(holds.values_list("flight_id", "row", "seat")) & set(seats)
+
+
+def release_user_holds(user_id, seats):
+    holds = SeatHold.objects.filter(
+        user_id=user_id,
+        flight_id__in={flight_id for flight_id, _, _ in seats},
+        row__in={row for _, row, _ in seats},
+        seat__in={seat for _, _, seat in seats},
+    ).values_list("id", "flight_id", "row", "seat")
+    hold_ids = [
+        hold_id for hold_id, *seat in holds if tuple(seat) in seats
+    ]
+    if hold_ids:
+        SeatHold.objects.filter(id__in=hold_ids).delete()
+
+
+def validate_tickets(tickets_data):
+    flights = Flight.objects.select_related("airplane").in_bulk(
+        {ticket_data["flight_id"] for ticket_data in tickets_data}
+    )
+
+    errors = []
+    seen = set()
+    for ticket_data in tickets_data:
+        flight_id = ticket_data["flight_id"]
+        seat = (flight_id, ticket_data["row"], ticket_data["seat"])
+        flight = flights.get(flight_id)
+
+        if flight is None:
+            errors.append({
+                "flight": f'Invalid pk "{flight_id}" - '
+                          "object does not exist."
+            })
+            continue
+        try:
+            Ticket.validate_ticket(
+                ticket_data["row"],
+                ticket_data["seat"],
+                flight.airplane,
+                ValidationError
+            )
+        except ValidationError as error:
+            errors.append(error.detail)
+            continue
+        if seat in seen:
+            errors.append({"seat": "Seat is repeated in this order."})
+            continue
+
+        errors.append({})
+        seen.add(seat)
+
+    if any(errors):
+        raise ValidationError({"tickets": errors})
+
+
+def lock_flights(flight_ids):
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {LOCK_TIMEOUT_MS}")
+    list(
+        Flight.objects.select_for_update()
+        .filter(id__in=flight_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def create_tickets(order, tickets_data):
+    """
+    Must run inside a transaction. Bookings of the same flight are
+    serialized by locking its row, so taken seats are reported as a
+    ``SeatConflict`` instead of a unique constraint failure.
+    """
+    seats = [
+        (ticket_data["flight_id"], ticket_data["row"], ticket_data["seat"])
+        for ticket_data in tickets_data
+    ]
+    try:
+        lock_flights({flight_id for flight_id, _, _ in seats})
+        taken = get_taken_seats(seats) | get_held_seats(seats, order.user_id)
+        if taken:
+            raise SeatConflict(taken)
+        release_user_holds(order.user_id, set(seats))
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create(
+                Ticket(order=order, **ticket_data)
+                for ticket_data in tickets_data
+            )
+        search_index.add_sold(tickets)
+    except IntegrityError:
+        raise SeatConflict(get_taken_seats(seats))
+    except OperationalError as error:
+        if not is_lock_timeout(error):
+            raise
+        raise SeatConflict(
+            detail="Seats are being booked by another order, try again."
+        )
+
+    seat_map.add_tickets(tickets)
+    return tickets
@@ -0,0 +1,151 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+from airport.booking import LOCK_TIMEOUT_MS
+from airport.models import Crew, Flight
+
+
+def lock_crew(crew_ids):
+    """
+    Serialize assignments of the same crew members until the end of the
+    transaction, so concurrent writes can't both pass the conflict check.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {LOCK_TIMEOUT_MS}")
+    list(
+        Crew.objects.select_for_update()
+        .filter(id__in=crew_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+class _Interval:
+    __slots__ = ("key", "end", "priority", "reach", "left", "right")
+
+    def __init__(self, start, end, flight_id):
+        self.key = (start, end, flight_id)
+        self.end = end
+        self.priority = random.random()
+        self.reach = end
+        self.left = None
+        self.right = None
+
+    def update(self):
+        self.reach = max(
+            self.end,
+            self.left.reach if self.left else self.end,
+            self.right.reach if self.right else self.end,
+        )
+
+
+def _rotate_right(node):
+    child = node.left
+    node.left, child.right = child.right, node
+    node.update()
+    child.update()
+    return child
+
+
+def _rotate_left(node):
+    child = node.right
+    node.right, child.left = child.left, node
+    node.update()
+    child.update()
+    return child
+
+
+class DutySchedule:
+    """
+    Duty intervals of one crew member (or airplane) in an interval tree:
+    a treap ordered by ``(start, end, flight_id)`` in which every node
+    keeps the latest end in its subtree (``reach``). Adding an interval
+    takes O(log n) expected time in whatever order they come. A lookup
+    skips the subtrees ending by the start of the range and those
+    starting after its end, so on a schedule without overlaps, which the
+    checks keep it, it visits O(log n + k) nodes for ``k`` results.
+    """
+
+    def __init__(self):
+        self._root = None
+
+    def _insert(self, node, interval):
+        if node is None:
+            return interval
+        if interval.key < node.key:
+            node.left = self._insert(node.left, interval)
+            if node.left.priority > node.priority:
+                node = _rotate_right(node)
+        else:
+            node.right = self._insert(node.right, interval)
+            if node.right.priority > node.priority:
+                node = _rotate_left(node)
+        node.update()
+        return node
+
+    def add(self, start, end, flight_id):
+        self._root = self._insert(self._root, _Interval(start, end, flight_id))
+
+    def _collect(self, node, start, end, flight_ids):
+        # Latest start first; subtrees ending by ``start`` are skipped.
+        if node is None or node.reach <= start:
+            return
+        if node.key[0] < end:
+            self._collect(node.right, start, end, flight_ids)
+            if node.end > start:
+                flight_ids.append(node.key[2])
+        self._collect(node.left, start, end, flight_ids)
+
+    def overlapping(self, start, end):
+        """Flight ids of the intervals overlapping ``[start, end)``."""
+        flight_ids = []
+        self._collect(self._root, start, end, flight_ids)
+        return flight_ids
+
+
+def overlapping_duty(crew_ids, start, end, exclude_flight_id=None):
+    """
+    Crew assignments of ``crew_ids`` to flights overlapping the range,
+    bounded like ``fleet.overlapping``.
+    """
+    assignments = Flight.crew_members.through.objects.filter(
+        crew_id__in=crew_ids,
+        flight__departure_time__gt=start - settings.MAX_FLIGHT_DURATION,
+        flight__departure_time__lt=end,
+        flight__arrival_time__gt=start,
+    )
+    if exclude_flight_id is not None:
+        assignments = assignments.exclude(flight_id=exclude_flight_id)
+    return assignments
+
+
+def crew_conflicts(crew_ids, departure_time, arrival_time,
+                   exclude_flight_id=None):
+    """
+    ``{crew_id: [flight_id, ...]}`` of the flights that ``crew_ids``
+    already fly between ``departure_time`` and ``arrival_time``. Run it
+    after ``lock_crew`` so the answer holds until the transaction ends.
+    """
+    conflicts = defaultdict(list)
+    for crew_id, flight_id in (
+        overlapping_duty(
+            crew_ids, departure_time, arrival_time, exclude_flight_id
+        )
+        .order_by("crew_id", "flight_id")
+        .values_list("crew_id", "flight_id")
+    ):
+        conflicts[crew_id].append(flight_id)
+    return dict(conflicts)
+
+
+def describe_conflicts(conflicts, crew_names):
+    return [
+        f"{crew_names[crew_id]} is already on flight"
+        f"{'s' if len(flight_ids) > 1 else ''} "
+        f"{', '.join(map(str, flight_ids))} at an overlapping time."
+        for crew_id, flight_ids in sorted(conflicts.items())
+    ]
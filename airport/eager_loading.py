@@ -0,0 +1,117 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class EagerLoadingPlan:
+    """
+    ``select_related`` / ``prefetch_related`` lookups needed to render a
+    serializer without issuing queries per object.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.select_related = []
+        self.prefetches = []
+
+    def add_select(self, lookup):
+        if lookup not in self.select_related:
+            self.select_related.append(lookup)
+
+    def add_prefetch(self, lookup, plan):
+        self.prefetches.append((lookup, plan))
+
+    def get_prefetches(self):
+        prefetches = []
+        for lookup, plan in self.prefetches:
+            queryset = plan.model._default_manager.all()
+            if not queryset.ordered:
+                # Related lists come out in a stable order on every database.
+                queryset = queryset.order_by("pk")
+            prefetches.append(Prefetch(lookup, queryset=plan.apply(queryset)))
+        return prefetches
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetches:
+            queryset = queryset.prefetch_related(*self.get_prefetches())
+        return queryset
+
+
+def _walk_serializer(serializer, model, plan, prefix=""):
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        _walk_path(field, field.source_attrs, model, plan, prefix)
+
+
+def _walk_path(field, attrs, model, plan, prefix):
+    lookup = prefix
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return
+        if not model_field.is_relation:
+            return
+
+        lookup = f"{lookup}{attr}"
+        related_model = model_field.related_model
+
+        if model_field.many_to_many or model_field.one_to_many:
+            child_plan = EagerLoadingPlan(related_model)
+            _walk_child(field, attrs[index + 1:], related_model, child_plan)
+            plan.add_prefetch(lookup, child_plan)
+            return
+
+        remaining = attrs[index + 1:]
+        if (
+            not remaining
+            and isinstance(field, serializers.PrimaryKeyRelatedField)
+        ):
+            return
+
+        plan.add_select(lookup)
+        model = related_model
+        lookup = f"{lookup}__"
+
+    _walk_child(field, (), model, plan, prefix=lookup)
+
+
+def _walk_child(field, attrs, model, plan, prefix=""):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    elif isinstance(field, serializers.ManyRelatedField):
+        field = field.child_relation
+
+    if attrs:
+        _walk_path(field, attrs, model, plan, prefix)
+    elif isinstance(field, serializers.BaseSerializer):
+        _walk_serializer(field, model, plan, prefix)
+    elif isinstance(field, serializers.SlugRelatedField):
+        _walk_path(field, field.slug_field.split("."), model, plan, prefix)
+
+
+@lru_cache(maxsize=None)
+def get_eager_loading_plan(serializer_class):
+    serializer = serializer_class()
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    plan = EagerLoadingPlan(model)
+    if model is not None:
+        _walk_serializer(serializer, model, plan)
+    return plan
+
+
+class EagerLoadingMixin:
+    """
+    Applies the eager-loading plan of the serializer used by the current
+    action to the viewset queryset.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        plan = get_eager_loading_plan(self.get_serializer_class())
+        return plan.apply(queryset)
@@ -0,0 +1,148 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from rest_framework import serializers
+
+from airport.fast_serializers import FastFlightListSerializer
+from airport.models import Flight, Order, Ticket
+
+CHUNK_SIZE = 2000
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _flights_by_id(flight_ids):
+    return FastFlightListSerializer().serialize_by_id(flight_ids)
+
+
+def _ticket_row(ticket, flights):
+    return {
+        "id": ticket["id"],
+        "row": ticket["row"],
+        "seat": ticket["seat"],
+        "flight": flights[ticket["flight_id"]],
+    }
+
+
+def export_flights(chunk_size=CHUNK_SIZE):
+    """Rows in the layout of ``FlightListSerializer``."""
+    fast_serializer = FastFlightListSerializer()
+    rows = fast_serializer.get_rows(Flight.objects.order_by("id")).iterator(
+        chunk_size=chunk_size
+    )
+    for chunk in _chunked(rows, chunk_size):
+        yield from fast_serializer.serialize(chunk)
+
+
+def export_tickets(chunk_size=CHUNK_SIZE):
+    """Rows in the layout of ``TicketListSerializer``."""
+    values = Ticket.objects.order_by("id").values(
+        "id", "row", "seat", "flight_id"
+    ).iterator(chunk_size=chunk_size)
+    for chunk in _chunked(values, chunk_size):
+        flights = _flights_by_id({ticket["flight_id"] for ticket in chunk})
+        for ticket in chunk:
+            yield _ticket_row(ticket, flights)
+
+
+def export_orders(chunk_size=CHUNK_SIZE):
+    """Rows in the layout of ``OrderListSerializer``."""
+    values = Order.objects.order_by("id").values(
+        "id", "created_at"
+    ).iterator(chunk_size=chunk_size)
+    for chunk in _chunked(values, chunk_size):
+        tickets = defaultdict(list)
+        for ticket in Ticket.objects.filter(
+                order_id__in=[order["id"] for order in chunk]
+        ).values("id", "row", "seat", "flight_id", "order_id"):
+            tickets[ticket["order_id"]].append(ticket)
+        flights = _flights_by_id(
+            {
+                ticket["flight_id"]
+                for order_tickets in tickets.values()
+                for ticket in order_tickets
+            }
+        )
+        for order in chunk:
+            yield {
+                "id": order["id"],
+                "tickets": [
+                    _ticket_row(ticket, flights)
+                    for ticket in tickets[order["id"]]
+                ],
+                "created_at": _datetime_field.to_representation(
+                    order["created_at"]
+                ),
+            }
+
+
+DATASETS = {
+    "flights": export_flights,
+    "orders": export_orders,
+    "tickets": export_tickets,
+}
+
+
+def _flatten(row, prefix=""):
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix=f"{prefix}{key}."))
+        elif isinstance(value, list):
+            flat[f"{prefix}{key}"] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, chunk_size):
+    writer = csv.writer(_Echo())
+    header = None
+    for chunk in _chunked(rows, chunk_size):
+        lines = []
+        for row in chunk:
+            row = _flatten(row)
+            if header is None:
+                header = list(row)
+                lines.append(writer.writerow(header))
+            lines.append(writer.writerow(row.values()))
+        yield "".join(lines)
+
+
+def _ndjson_lines(rows, chunk_size):
+    for chunk in _chunked(rows, chunk_size):
+        yield "".join(
+            json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in chunk
+        )
+
+
+def stream(dataset, output_format, chunk_size=CHUNK_SIZE):
+    """
+    Yield ``dataset`` as CSV or NDJSON text, one block per chunk of
+    ``chunk_size`` rows, reading the database through server-side cursors.
+    """
+    rows = DATASETS[dataset](chunk_size=chunk_size)
+    if output_format == "csv":
+        return _csv_lines(rows, chunk_size)
+    return _ndjson_lines(rows, chunk_size)
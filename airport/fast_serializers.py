@@ -0,0 +1,244 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from airport.models import Crew, Flight, Ticket
+from airport.serializers import (
+    AirplaneListSerializer,
+    FlightListSerializer,
+    OrderListSerializer,
+    RouteListSerializer,
+)
+
+_datetime = serializers.DateTimeField().to_representation
+
+
+def _datetime_getter(key):
+    def get(row):
+        return _datetime(row[key])
+    return get
+
+
+class FastListSerializer:
+    """
+    Read-only counterpart of ``serializer_class`` for list actions: rows
+    are fetched with ``.values()`` and turned into the same output by a
+    tuple of precompiled ``(name, getter)`` pairs.
+
+    ``fields`` are ``(name, key)`` pairs where ``key`` is a ``.values()``
+    key or a callable taking the row.
+    """
+
+    serializer_class = None
+    values = ()
+    fields = ()
+
+    def __init__(self):
+        self.getters = tuple(
+            (name, key if callable(key) else itemgetter(key))
+            for name, key in self.get_fields()
+        )
+
+    def get_fields(self):
+        return self.fields
+
+    def get_values(self):
+        return self.values
+
+    def get_rows(self, queryset):
+        return queryset.prefetch_related(None).values(*self.get_values())
+
+    def prepare(self, rows):
+        """Hook to batch-load related data into ``rows`` in place."""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        getters = self.getters
+        return [
+            {name: getter(row) for name, getter in getters}
+            for row in rows
+        ]
+
+
+class FastRouteListSerializer(FastListSerializer):
+    serializer_class = RouteListSerializer
+    values = ("id", "source__name", "destination__name", "distance")
+    fields = (
+        ("id", "id"),
+        ("source", "source__name"),
+        ("destination", "destination__name"),
+        ("distance", "distance"),
+    )
+
+
+class FastAirplaneListSerializer(FastListSerializer):
+    serializer_class = AirplaneListSerializer
+    values = ("id", "name", "rows", "seats_in_row", "airplane_type__name")
+    fields = (
+        ("id", "id"),
+        ("name", "name"),
+        ("rows", "rows"),
+        ("seats_in_row", "seats_in_row"),
+        ("airplane_type", "airplane_type__name"),
+    )
+
+
+def _route(row):
+    return {
+        "id": row["route_id"],
+        "source": row["route__source__name"],
+        "destination": row["route__destination__name"],
+        "distance": row["route__distance"],
+    }
+
+
+def _capacity(row):
+    return row["airplane__rows"] * row["airplane__seats_in_row"]
+
+
+class FastFlightListSerializer(FastListSerializer):
+    """
+    ``tickets_available`` is only rendered with ``with_availability``,
+    like ``FlightListSerializer`` skips it on non-annotated flights.
+    """
+
+    serializer_class = FlightListSerializer
+    values = (
+        "id",
+        "route_id",
+        "route__source__name",
+        "route__destination__name",
+        "route__distance",
+        "airplane__name",
+        "airplane__rows",
+        "airplane__seats_in_row",
+        "departure_time",
+        "arrival_time",
+    )
+    fields = (
+        ("id", "id"),
+        ("route", _route),
+        ("airplane", "airplane__name"),
+        ("departure_time", _datetime_getter("departure_time")),
+        ("arrival_time", _datetime_getter("arrival_time")),
+        ("crew_members", "crew_members"),
+        ("capacity", _capacity),
+    )
+
+    def __init__(self, with_availability=True):
+        self.with_availability = with_availability
+        super().__init__()
+
+    def get_fields(self):
+        if self.with_availability:
+            return self.fields + (("tickets_available", "tickets_available"),)
+        return self.fields
+
+    def get_values(self):
+        if self.with_availability:
+            return self.values + ("tickets_available",)
+        return self.values
+
+    def get_rows(self, queryset):
+        if (
+            self.with_availability
+            and "tickets_available" not in queryset.query.annotations
+        ):
+            queryset = queryset.with_tickets_available()
+        return super().get_rows(queryset)
+
+    def prepare(self, rows):
+        crew_names = defaultdict(list)
+        for flight_id, first_name, last_name in Crew.objects.filter(
+                flights__in=[row["id"] for row in rows]
+        ).order_by("flights", "id").values_list(
+            "flights", "first_name", "last_name"
+        ):
+            crew_names[flight_id].append(f"{first_name} {last_name}")
+        for row in rows:
+            row["crew_members"] = crew_names[row["id"]]
+
+    def serialize_by_id(self, flight_ids):
+        return {
+            flight["id"]: flight
+            for flight in self.serialize(
+                self.get_rows(Flight.objects.filter(id__in=flight_ids))
+            )
+        }
+
+
+def _ticket(flights):
+    def build(ticket):
+        return {
+            "id": ticket["id"],
+            "row": ticket["row"],
+            "seat": ticket["seat"],
+            "flight": flights[ticket["flight_id"]],
+        }
+    return build
+
+
+class FastOrderListSerializer(FastListSerializer):
+    serializer_class = OrderListSerializer
+    values = ("id", "created_at")
+    fields = (
+        ("id", "id"),
+        ("tickets", "tickets"),
+        ("created_at", _datetime_getter("created_at")),
+    )
+
+    def prepare(self, rows):
+        tickets = defaultdict(list)
+        for ticket in Ticket.objects.filter(
+                order_id__in=[row["id"] for row in rows]
+        ).values("id", "row", "seat", "flight_id", "order_id"):
+            tickets[ticket["order_id"]].append(ticket)
+
+        flights = FastFlightListSerializer(
+            with_availability=False
+        ).serialize_by_id(
+            {
+                ticket["flight_id"]
+                for order_tickets in tickets.values()
+                for ticket in order_tickets
+            }
+        )
+        build_ticket = _ticket(flights)
+        for row in rows:
+            row["tickets"] = [
+                build_ticket(ticket) for ticket in tickets[row["id"]]
+            ]
+
+
+class FastListMixin:
+    """
+    Serves the ``list`` action with ``fast_serializer_class`` when the
+    ``FAST_LIST_SERIALIZERS`` setting is on.
+    """
+
+    fast_serializer_class = None
+
+    def use_fast_serializer(self):
+        return (
+            settings.FAST_LIST_SERIALIZERS
+            and self.fast_serializer_class is not None
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_serializer():
+            return super().list(request, *args, **kwargs)
+
+        fast_serializer = self.fast_serializer_class()
+        rows = fast_serializer.get_rows(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                fast_serializer.serialize(page)
+            )
+        return Response(fast_serializer.serialize(rows))
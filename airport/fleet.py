@@ -0,0 +1,105 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F, Max, Q, Sum, Value, Window
+from django.db.models.functions import Greatest, Lag, Least
+
+from airport.booking import LOCK_TIMEOUT_MS
+from airport.models import Airplane, Flight
+
+
+def lock_airplanes(airplane_ids):
+    """
+    Serialize flight writes on the same airplanes until the end of the
+    transaction, so concurrent writes can't both pass the overlap check.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {LOCK_TIMEOUT_MS}")
+    list(
+        Airplane.objects.select_for_update()
+        .filter(id__in=airplane_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def overlapping(airplane_id, start, end, exclude_flight_id=None):
+    """
+    Flights of ``airplane_id`` overlapping ``[start, end)``.
+
+    No flight lasts longer than ``MAX_FLIGHT_DURATION``, so only flights
+    departing in ``(start - MAX_FLIGHT_DURATION, end)`` can overlap: one
+    range seek on the ``(airplane, departure_time)`` index, however long
+    the airplane's history and schedule are.
+    """
+    flights = Flight.objects.filter(
+        airplane_id=airplane_id,
+        departure_time__gt=start - settings.MAX_FLIGHT_DURATION,
+        departure_time__lt=end,
+        arrival_time__gt=start,
+    )
+    if exclude_flight_id is not None:
+        flights = flights.exclude(id=exclude_flight_id)
+    return flights
+
+
+def overlapping_flights(airplane_id, start, end, exclude_flight_id=None):
+    """Sorted ids of the flights of ``airplane_id`` overlapping the range."""
+    return list(
+        overlapping(airplane_id, start, end, exclude_flight_id)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def get_utilization(airplanes, start, end):
+    """
+    ``airplanes`` with their flying over ``[start, end)``: ``flight_count``,
+    ``flight_time`` (clipped to the window) and ``gaps``, the idle
+    ``{"start", "end"}`` ranges between flights. Totals come from one grouped
+    query and the gaps from one query using ``LAG`` over each airplane's
+    flights, so no per-flight work happens in Python.
+    """
+    in_window = Q(
+        flights__departure_time__lt=end, flights__arrival_time__gt=start
+    )
+    airplanes = list(
+        airplanes.annotate(
+            flight_count=Count("flights", filter=in_window),
+            flight_time=Sum(
+                Least(F("flights__arrival_time"), Value(end))
+                - Greatest(F("flights__departure_time"), Value(start)),
+                filter=in_window,
+            ),
+            last_arrival=Max("flights__arrival_time", filter=in_window),
+        ).order_by("id")
+    )
+
+    gaps = defaultdict(list)
+    for airplane_id, gap_start, gap_end in (
+        Flight.objects.filter(
+            airplane_id__in=[airplane.id for airplane in airplanes],
+            departure_time__lt=end,
+            arrival_time__gt=start,
+        )
+        .annotate(
+            previous_arrival=Window(
+                Lag("arrival_time", default=Value(start)),
+                partition_by=F("airplane_id"),
+                order_by=[F("departure_time").asc(), F("id").asc()],
+            )
+        )
+        .filter(previous_arrival__lt=F("departure_time"))
+        .order_by("airplane_id", "departure_time")
+        .values_list("airplane_id", "previous_arrival", "departure_time")
+    ):
+        gaps[airplane_id].append({"start": gap_start, "end": gap_end})
+
+    for airplane in airplanes:
+        airplane.gaps = gaps[airplane.id]
+        last_arrival = airplane.last_arrival or start
+        if last_arrival < end:
+            airplane.gaps.append({"start": last_arrival, "end": end})
+    return airplanes
@@ -0,0 +1,210 @@
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current = ContextVar("request_metrics", default=None)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """``sql`` with the parts that vary between N+1 repeats collapsed."""
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class RequestMetrics:
+    """Queries and phase timings of the current request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = Counter()
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self.response_size = 0
+        self._view_started = None
+        self._view_db_time = 0.0
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.queries.values() if count > 1)
+
+    def most_repeated(self):
+        return self.queries.most_common(1)[0] if self.queries else None
+
+    def add_query(self, sql, duration):
+        self.queries[fingerprint(sql)] += 1
+        self.db_time += duration
+
+    def start_view(self):
+        self._view_started = time.perf_counter()
+        self._view_db_time = self.db_time
+
+    def finish_view(self):
+        """
+        Count the time since ``start_view`` spent outside SQL as serializer
+        time: a DRF view builds ``serializer.data`` before it returns, and
+        the rest of its Python work is small next to it.
+        """
+        if self._view_started is None:
+            return
+        self.serializer_time += (
+            time.perf_counter()
+            - self._view_started
+            - (self.db_time - self._view_db_time)
+        )
+        self._view_started = None
+
+    def server_timing(self):
+        description = f"{self.query_count} queries"
+        if self.duplicate_count:
+            description += f", {self.duplicate_count} duplicates"
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{description}"',
+            f"serialize;dur={self.serializer_time * 1000:.2f}",
+            f"render;dur={self.render_time * 1000:.2f}",
+            f"total;dur={self.total_time * 1000:.2f}",
+        ])
+
+
+def start():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - started)
+
+
+def _add_execute_wrapper(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def install():
+    """Time the queries of every connection."""
+    connection_created.connect(_add_execute_wrapper, weak=False)
+    for connection in connections.all(initialized_only=True):
+        _add_execute_wrapper(connection)
+
+
+class MetricsRegistry:
+    """
+    In-process totals per view, exported in the Prometheus text format.
+    Every server process keeps its own; scrape each one.
+    """
+
+    counters = (
+        ("http_requests_total", "Requests handled."),
+        ("http_request_seconds_total", "Time spent handling requests."),
+        ("db_queries_total", "SQL queries executed."),
+        (
+            "db_duplicate_queries_total",
+            "Queries repeating an earlier query of the same request.",
+        ),
+        ("db_seconds_total", "Time spent in SQL."),
+        ("serializer_seconds_total", "Time spent in serializers."),
+        ("render_seconds_total", "Time spent rendering responses."),
+        ("response_bytes_total", "Response body bytes."),
+        (
+            "query_budget_exceeded_total",
+            "Requests that ran more queries than their view's budget.",
+        ),
+    )
+
+    def __init__(self, prefix="airport_"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._values = defaultdict(float)
+
+    def observe(self, view, method, status, metrics, over_budget=False):
+        view_label = (("view", view),)
+        with self._lock:
+            values = self._values
+            values["http_requests_total", view_label + (
+                ("method", method), ("status", str(status))
+            )] += 1
+            for name, value in (
+                ("http_request_seconds_total", metrics.total_time),
+                ("db_queries_total", metrics.query_count),
+                ("db_duplicate_queries_total", metrics.duplicate_count),
+                ("db_seconds_total", metrics.db_time),
+                ("serializer_seconds_total", metrics.serializer_time),
+                ("render_seconds_total", metrics.render_time),
+                ("response_bytes_total", metrics.response_size),
+                ("query_budget_exceeded_total", int(over_budget)),
+            ):
+                values[name, view_label] += value
+
+    @staticmethod
+    def _escape(value):
+        return (
+            value.replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"')
+        )
+
+    @staticmethod
+    def _format(value):
+        if float(value).is_integer():
+            return str(int(value))
+        return repr(float(value))
+
+    def export(self):
+        with self._lock:
+            values = dict(self._values)
+        lines = []
+        for name, help_text in self.counters:
+            lines.append(f"# HELP {self.prefix}{name} {help_text}")
+            lines.append(f"# TYPE {self.prefix}{name} counter")
+            for (metric, labels), value in sorted(values.items()):
+                if metric != name:
+                    continue
+                label_text = ",".join(
+                    f'{key}="{self._escape(label)}"' for key, label in labels
+                )
+                lines.append(
+                    f"{self.prefix}{name}{{{label_text}}} "
+                    f"{self._format(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
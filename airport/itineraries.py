@@ -0,0 +1,334 @@
+import threading
+import time
+import uuid
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timedelta
+
+from airport import response_cache
+from airport.models import Flight
+
+EPOCH_KEY = "airport:itineraries:epoch"
+SEQUENCE_KEY = "airport:itineraries:sequence"
+CHANGE_KEY = "airport:itineraries:change:{epoch}:{sequence}"
+
+# Changes are kept this long; a process lagging further behind rebuilds.
+CHANGE_TIMEOUT = 60 * 60
+# Most changes replayed at once before a full rebuild is cheaper.
+MAX_REPLAYED_CHANGES = 1000
+# How long a missing change may be waited for: a writer bumps the
+# sequence just before it stores the change.
+CHANGE_GRACE = 5.0
+
+DEFAULT_MIN_CONNECTION = timedelta(minutes=45)
+DEFAULT_MAX_CONNECTION = timedelta(hours=24)
+
+
+def bump_version():
+    """Start a new epoch, making every process rebuild its index."""
+    response_cache.get_cache().set_many(
+        {EPOCH_KEY: uuid.uuid4().hex, SEQUENCE_KEY: 0}, None
+    )
+
+
+def get_position():
+    """The current ``(epoch, sequence)`` of the shared change log."""
+    cache = response_cache.get_cache()
+    position = cache.get_many([EPOCH_KEY, SEQUENCE_KEY])
+    if len(position) < 2:
+        bump_version()
+        position = cache.get_many([EPOCH_KEY, SEQUENCE_KEY])
+    return position.get(EPOCH_KEY), position.get(SEQUENCE_KEY, 0)
+
+
+def record_change(flight_ids):
+    """Append the ids of changed flights to the shared change log."""
+    cache = response_cache.get_cache()
+    epoch = cache.get(EPOCH_KEY)
+    try:
+        sequence = cache.incr(SEQUENCE_KEY)
+    except ValueError:
+        sequence = None
+    if epoch is None or sequence is None or not cache.add(
+        CHANGE_KEY.format(epoch=epoch, sequence=sequence),
+        list(flight_ids),
+        CHANGE_TIMEOUT,
+    ):
+        # Lost log state or a colliding writer: rebuild everywhere.
+        bump_version()
+
+
+def _dominated(labels, first_departure, arrival, airports, final):
+    """
+    At the destination a journey is dominated by one departing no earlier
+    and arriving no later. At a connecting airport a later arrival keeps
+    the connection window open longer, so only a journey arriving at the
+    same time through no other airports dominates it.
+    """
+    return any(
+        other_departure >= first_departure
+        and (
+            other_arrival <= arrival if final
+            else other_arrival == arrival and other_airports <= airports
+        )
+        for other_departure, other_arrival, other_airports in labels
+    )
+
+
+class Schedule:
+    """
+    One version of the index: for every airport a list of ``(departure,
+    arrival, flight_id, destination_id)`` tuples sorted by departure
+    timestamp, and the entry of every flight.
+    """
+
+    def __init__(self, epoch, sequence):
+        self.epoch = epoch
+        self.sequence = sequence
+        self.departures = {}
+        self.entries = {}
+
+    @staticmethod
+    def _load(flight_ids=None):
+        flights = Flight.objects.order_by()
+        if flight_ids is not None:
+            flights = flights.filter(id__in=flight_ids)
+        for (
+            flight_id, source_id, destination_id, departure_time, arrival_time
+        ) in flights.values_list(
+            "id",
+            "route__source_id",
+            "route__destination_id",
+            "departure_time",
+            "arrival_time",
+        ):
+            yield flight_id, source_id, (
+                departure_time.timestamp(),
+                arrival_time.timestamp(),
+                flight_id,
+                destination_id,
+            )
+
+    @classmethod
+    def build(cls, epoch, sequence):
+        schedule = cls(epoch, sequence)
+        departures = defaultdict(list)
+        for flight_id, source_id, entry in cls._load():
+            departures[source_id].append(entry)
+            schedule.entries[flight_id] = (source_id, entry)
+        for entries in departures.values():
+            entries.sort()
+        schedule.departures = dict(departures)
+        return schedule
+
+    def apply(self, flight_ids, sequence):
+        """
+        Reload ``flight_ids`` with one query. Changed airports get new
+        lists, so searches running on the old ones are not disturbed.
+        """
+        departures = dict(self.departures)
+        copied = set()
+
+        def airport_departures(airport_id):
+            if airport_id not in copied:
+                departures[airport_id] = list(departures.get(airport_id, ()))
+                copied.add(airport_id)
+            return departures[airport_id]
+
+        for flight_id in flight_ids:
+            source_id, entry = self.entries.pop(flight_id, (None, None))
+            if entry is None:
+                continue
+            entries = airport_departures(source_id)
+            index = bisect_left(entries, entry)
+            if index < len(entries) and entries[index] == entry:
+                del entries[index]
+        for flight_id, source_id, entry in self._load(flight_ids):
+            insort(airport_departures(source_id), entry)
+            self.entries[flight_id] = (source_id, entry)
+
+        self.departures = departures
+        self.sequence = sequence
+
+
+class ItineraryIndex:
+    """
+    In-memory time-expanded view of the flight schedule, built lazily from
+    one query.
+
+    Flight writes append the changed flight ids to a change log in the
+    reference cache after they commit, and every process replays the new
+    entries with one query before its next search. Route changes and
+    imports start a new epoch instead, which every process answers with a
+    full rebuild. Rebuilds and replays run outside of searches: a search
+    arriving while another thread refreshes the index uses the previous
+    version.
+    """
+
+    def __init__(self):
+        self._refresh_lock = threading.Lock()
+        self._schedule = None
+        self._gap = None
+
+    def _refresh(self):
+        epoch, sequence = get_position()
+        schedule = self._schedule
+        if (
+            schedule is not None
+            and schedule.epoch == epoch
+            and schedule.sequence == sequence
+        ):
+            return schedule
+        if not self._refresh_lock.acquire(blocking=schedule is None):
+            return schedule
+        try:
+            schedule = self._schedule
+            if (
+                schedule is None
+                or schedule.epoch != epoch
+                or schedule.sequence > sequence
+                or sequence - schedule.sequence > MAX_REPLAYED_CHANGES
+                or not self._replay(schedule, sequence)
+            ):
+                self._gap = None
+                self._schedule = Schedule.build(epoch, sequence)
+            return self._schedule
+        finally:
+            self._refresh_lock.release()
+
+    def _replay(self, schedule, sequence):
+        """
+        Apply the changes after ``schedule.sequence`` up to ``sequence``.
+        Returns ``False`` when a change stays missing, so the index has to
+        be rebuilt.
+        """
+        sequences = range(schedule.sequence + 1, sequence + 1)
+        keys = [
+            CHANGE_KEY.format(epoch=schedule.epoch, sequence=number)
+            for number in sequences
+        ]
+        changes = response_cache.get_cache().get_many(keys)
+        flight_ids = set()
+        applied = schedule.sequence
+        for number, key in zip(sequences, keys):
+            if key not in changes:
+                break
+            flight_ids.update(changes[key])
+            applied = number
+
+        if applied < sequence:
+            missing = applied + 1
+            if self._gap is None or self._gap[0] != (schedule.epoch, missing):
+                self._gap = ((schedule.epoch, missing), time.monotonic())
+            elif time.monotonic() - self._gap[1] > CHANGE_GRACE:
+                return False
+        if flight_ids:
+            schedule.apply(flight_ids, applied)
+        return True
+
+    def update_flights(self, *flight_ids):
+        """Must run after the write commits."""
+        record_change(flight_ids)
+
+    def invalidate(self):
+        """Must run after the write commits."""
+        bump_version()
+
+    def search(
+            self,
+            source_id,
+            destination_id,
+            departure_after,
+            departure_before,
+            max_stops=1,
+            min_connection=DEFAULT_MIN_CONNECTION,
+            max_connection=DEFAULT_MAX_CONNECTION,
+            limit=20,
+    ):
+        """
+        Round-based (RAPTOR-style) search: round ``k`` extends journeys of
+        ``k`` legs by one connecting flight. Dominated journeys (see
+        ``_dominated``) are dropped, so only Pareto-optimal itineraries are
+        kept.
+
+        Returns lists of flight ids, earliest arrival first.
+        """
+        min_connection = min_connection.total_seconds()
+        max_connection = max_connection.total_seconds()
+
+        schedule = self._refresh()
+        best = defaultdict(list)
+        results = []
+        labels = [(source_id, None, None, (), frozenset((source_id,)))]
+
+        for _ in range(max_stops + 1):
+            next_labels = []
+            for airport_id, arrival, first_departure, path, airports in (
+                    labels
+            ):
+                if path:
+                    earliest = arrival + min_connection
+                    latest = arrival + max_connection
+                else:
+                    earliest = departure_after.timestamp()
+                    latest = departure_before.timestamp()
+
+                departures = schedule.departures.get(airport_id, ())
+                index = bisect_left(departures, (earliest,))
+                while (
+                        index < len(departures)
+                        and departures[index][0] <= latest
+                ):
+                    departure, leg_arrival, flight_id, next_airport = (
+                        departures[index]
+                    )
+                    index += 1
+                    if next_airport in airports:
+                        continue
+
+                    journey_departure = (
+                        departure if first_departure is None
+                        else first_departure
+                    )
+                    next_airports = airports | {next_airport}
+                    final = next_airport == destination_id
+                    if _dominated(
+                            best[next_airport],
+                            journey_departure,
+                            leg_arrival,
+                            next_airports,
+                            final,
+                    ):
+                        continue
+                    best[next_airport].append(
+                        (journey_departure, leg_arrival, next_airports)
+                    )
+
+                    label = (
+                        next_airport,
+                        leg_arrival,
+                        journey_departure,
+                        path + (flight_id,),
+                        next_airports,
+                    )
+                    if final:
+                        results.append(label)
+                    else:
+                        next_labels.append(label)
+            labels = next_labels
+
+        pareto = [
+            label for label in results
+            if not any(
+                other is not label
+                and other[2] >= label[2]
+                and other[1] <= label[1]
+                and (other[2], other[1]) != (label[2], label[1])
+                for other in results
+            )
+        ]
+        pareto.sort(key=lambda label: (label[1], -label[2], len(label[3])))
+        return [label[3] for label in pareto[:limit]]
+
+
+itinerary_index = ItineraryIndex()
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from airport import export
+
+
+class Command(BaseCommand):
+    help = "Streams flights, orders or tickets as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(export.DATASETS))
+        parser.add_argument(
+            "--output-format",
+            choices=sorted(export.CONTENT_TYPES),
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--file", help="Write to this path instead of stdout"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=export.CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        lines = export.stream(
+            options["dataset"],
+            options["output_format"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["file"]:
+            with open(options["file"], "w", newline="") as file:
+                file.writelines(lines)
+        else:
+            for block in lines:
+                self.stdout.write(block, ending="")
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from airport import schedule_import
+
+
+class Command(BaseCommand):
+    help = "Bulk imports flights with crew from a CSV or NDJSON timetable"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--input-format",
+            choices=schedule_import.FORMATS,
+            help="Defaults to csv for .csv files and ndjson otherwise",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=schedule_import.CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Import valid rows instead of aborting on the first error",
+        )
+
+    def handle(self, *args, **options):
+        input_format = options["input_format"] or (
+            schedule_import.guess_format(options["path"])
+        )
+        importer = schedule_import.ScheduleImporter(
+            chunk_size=options["chunk_size"],
+            skip_invalid=options["skip_invalid"],
+        )
+        with open(options["path"], newline="", encoding="utf-8") as file:
+            try:
+                result = importer.run(
+                    schedule_import.read_rows(file, input_format)
+                )
+            except UnicodeDecodeError:
+                raise CommandError(f"{options['path']} is not valid UTF-8")
+
+        for error in result.errors:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        if result.error_count and not options["skip_invalid"]:
+            raise CommandError(
+                f"{result.error_count} invalid rows, nothing was imported"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} flights in "
+                f"{result.seconds:.1f}s ({result.rate:.0f} flights/s), "
+                f"skipped {result.error_count} invalid rows"
+            )
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from airport import search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized flight search table from flights"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = search_index.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {count} flights for search")
+        )
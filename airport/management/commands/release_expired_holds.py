@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from airport.seat_holds import release_expired_holds, run_sweeper
+
+
+class Command(BaseCommand):
+    help = (
+        "Releases seat holds whose time to live has expired, once or, with "
+        "--interval, every given number of seconds until stopped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Seconds between sweeps, 0 to sweep once and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["interval"]:
+            run_sweeper(options["interval"], options["batch_size"])
+            return
+
+        released = release_expired_holds(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired seat holds")
+        )
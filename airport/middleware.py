@@ -0,0 +1,103 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from airport import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, duplicate queries, SQL, serializer and render time
+    and response size of every request. They are sent back in a
+    ``Server-Timing`` header and added to the totals served by ``/metrics``.
+
+    Requests running more queries than ``QUERY_BUDGETS`` allows for their
+    view are logged, or fail with ``QueryBudgetExceeded`` when
+    ``QUERY_BUDGET_STRICT`` is set (as in tests).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        instrumentation.install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics, token = instrumentation.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.finish(token)
+        return self.process_metrics(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = instrumentation.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.finish(token)
+        return self.process_metrics(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.start_view()
+
+    def process_template_response(self, request, response):
+        # Called once the view has returned, before the response renders.
+        metrics = instrumentation.current()
+        if metrics is not None:
+            metrics.finish_view()
+            started = time.perf_counter()
+
+            def record_render_time(response):
+                metrics.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(record_render_time)
+        return response
+
+    def process_metrics(self, request, response, metrics):
+        # Views returning a plain HttpResponse skip process_template_response.
+        metrics.finish_view()
+        metrics.total_time = time.perf_counter() - metrics.started
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+        response["Server-Timing"] = metrics.server_timing()
+
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        budget = settings.QUERY_BUDGETS.get(view)
+        over_budget = budget is not None and metrics.query_count > budget
+        instrumentation.registry.observe(
+            view,
+            request.method,
+            response.status_code,
+            metrics,
+            over_budget=over_budget,
+        )
+
+        if over_budget:
+            message = (
+                f"{request.method} {request.path} ({view}) ran "
+                f"{metrics.query_count} queries, budget is {budget}"
+            )
+            if metrics.duplicate_count:
+                sql, count = metrics.most_repeated()
+                message += f"; repeated {count} times: {sql}"
+            if settings.QUERY_BUDGET_STRICT:
+                raise instrumentation.QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,83 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def populate_search_index(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    FlightSearchIndex = apps.get_model("airport", "FlightSearchIndex")
+
+    flights = Flight.objects.select_related(
+        "route__source", "route__destination", "airplane"
+    ).annotate(tickets_sold=Count("tickets")).order_by()
+    FlightSearchIndex.objects.bulk_create(
+        (
+            FlightSearchIndex(
+                flight_id=flight.id,
+                source_name=flight.route.source.name,
+                source_city=flight.route.source.closest_big_city,
+                destination_name=flight.route.destination.name,
+                destination_city=flight.route.destination.closest_big_city,
+                departure_date=timezone.localdate(flight.departure_time),
+                departure_time=flight.departure_time,
+                arrival_time=flight.arrival_time,
+                capacity=flight.airplane.rows * flight.airplane.seats_in_row,
+                tickets_sold=flight.tickets_sold,
+            )
+            for flight in flights.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0005_flight_and_order_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightSearchIndex",
+            fields=[
+                (
+                    "flight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="airport.flight",
+                    ),
+                ),
+                ("source_name", models.CharField(max_length=63)),
+                ("source_city", models.CharField(max_length=63)),
+                ("destination_name", models.CharField(max_length=63)),
+                ("destination_city", models.CharField(max_length=63)),
+                ("departure_date", models.DateField()),
+                ("departure_time", models.DateTimeField()),
+                ("arrival_time", models.DateTimeField()),
+                ("capacity", models.IntegerField()),
+                ("tickets_sold", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["departure_time"],
+                "indexes": [
+                    models.Index(
+                        fields=["source_city", "destination_city", "departure_date"],
+                        name="airport_fli_source__91a4ee_idx",
+                    ),
+                    models.Index(
+                        fields=["departure_date", "departure_time"],
+                        name="airport_fli_departu_926748_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_search_index, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_flightsearchindex"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["airplane", "departure_time"],
+                name="airport_fli_airplan_da655c_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0007_flight_airplane_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["airplane", "arrival_time"],
+                name="airport_fli_airplan_515d4d_idx",
+            ),
+        ),
+    ]
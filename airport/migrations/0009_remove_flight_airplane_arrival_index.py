@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0008_flight_airplane_arrival_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="flight",
+            name="airport_fli_airplan_515d4d_idx",
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count, F
 from rest_framework.exceptions import ValidationError
 
 from django.conf import settings
@@ -72,6 +73,16 @@ class Airplane(models.Model):
         ordering = ["name"]
 
 
+class FlightQuerySet(models.QuerySet):
+    def with_tickets_available(self):
+        return self.annotate(
+            tickets_available=(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - Count("tickets")
+            )
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         to=Route,
@@ -87,6 +98,8 @@ class Flight(models.Model):
     arrival_time = models.DateTimeField()
     crew_members = models.ManyToManyField(to=Crew, related_name="flights")
 
+    objects = FlightQuerySet.as_manager()
+
     def __str__(self):
         return (f"Route: {self.route}; "
                 f"Airplane: {self.airplane}; "
@@ -94,6 +107,12 @@ class Flight(models.Model):
 
     class Meta:
         ordering = ["-departure_time"]
+        indexes = [
+            models.Index(fields=["departure_time"]),
+            models.Index(fields=["arrival_time"]),
+            models.Index(fields=["route", "departure_time"]),
+            models.Index(fields=["airplane", "departure_time"]),
+        ]
 
 
 class Order(models.Model):
@@ -109,6 +128,9 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
 
 
 class Ticket(models.Model):
@@ -168,3 +190,62 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("flight", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class SeatHold(models.Model):
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(
+        to=Flight,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return (f"Row: {self.row}; Seat: {self.seat}; "
+                f"Flight: {self.flight_id}; Expires: {self.expires_at}")
+
+    class Meta:
+        unique_together = ("flight", "row", "seat")
+        ordering = ["row", "seat"]
+
+
+class FlightSearchIndex(models.Model):
+    flight = models.OneToOneField(
+        to=Flight,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_entry"
+    )
+    source_name = models.CharField(max_length=63)
+    source_city = models.CharField(max_length=63)
+    destination_name = models.CharField(max_length=63)
+    destination_city = models.CharField(max_length=63)
+    departure_date = models.DateField()
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+    capacity = models.IntegerField()
+    tickets_sold = models.IntegerField(default=0)
+
+    @property
+    def tickets_available(self):
+        return self.capacity - self.tickets_sold
+
+    def __str__(self):
+        return (f"{self.source_city} - {self.destination_city}; "
+                f"Departure: {self.departure_time}")
+
+    class Meta:
+        ordering = ["departure_time"]
+        indexes = [
+            models.Index(
+                fields=["source_city", "destination_city", "departure_date"]
+            ),
+            models.Index(fields=["departure_date", "departure_time"]),
+        ]
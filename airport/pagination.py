@@ -0,0 +1,240 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class Pagination(PageNumberPagination):
+    page_size = 10
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over ``ordering``, which must end with
+    a unique field. The cursor is the opaque ordering key of the last row
+    of the previous page; the total count is only computed on
+    ``?count=true``.
+    """
+
+    page_size = 10
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view):
+        if hasattr(view, "get_keyset_ordering"):
+            return view.get_keyset_ordering()
+        return self.ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, position):
+        data = json.dumps(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in position
+            ]
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    @staticmethod
+    def get_ordering_field(queryset, name):
+        """Model field or annotation output field ordered by ``name``."""
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        model = queryset.model
+        for part in name.split("__"):
+            field = (
+                model._meta.pk if part == "pk" else model._meta.get_field(part)
+            )
+            model = field.related_model
+        return field
+
+    def decode_cursor(self, request, queryset):
+        """
+        The position in the cursor, each value converted by its ordering
+        field. Anything that doesn't decode to valid, non-null values is an
+        invalid cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if (
+                not isinstance(position, list)
+                or len(position) != len(self.current_ordering)
+            ):
+                raise ValueError("Unexpected cursor shape")
+            position = [
+                self.get_ordering_field(
+                    queryset, field.lstrip("-")
+                ).to_python(value)
+                for field, value in zip(self.current_ordering, position)
+            ]
+            if None in position:
+                raise ValueError("Null cursor value")
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_position(self, obj):
+        position = []
+        for field in self.current_ordering:
+            field = field.lstrip("-")
+            if isinstance(obj, dict):
+                position.append(obj[field])
+                continue
+            value = obj
+            for attr in field.split("__"):
+                value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    def get_position_filter(self, position):
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.current_ordering, position):
+            lookup = "lt" if field.startswith("-") else "gt"
+            field = field.lstrip("-")
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+
+        # Repeat the bound on the leading field on its own so the database
+        # can turn it into an index range scan.
+        field = self.current_ordering[0]
+        lookup = "lte" if field.startswith("-") else "gte"
+        return Q(**{f"{field.lstrip('-')}__{lookup}": position[0]}) & condition
+
+    def get_page_querysets(self, queryset, request, view=None):
+        """The ordered queryset to count and the slice to fetch."""
+        self.request = request
+        self.current_ordering = tuple(self.get_ordering(view))
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.current_ordering)
+
+        page_queryset = queryset
+        position = self.decode_cursor(request, queryset)
+        if position is not None:
+            page_queryset = queryset.filter(
+                self.get_position_filter(position)
+            )
+        return queryset, page_queryset[:page_size + 1]
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param) in (
+            "1", "true", "True"
+        )
+
+    def get_page(self, results):
+        page_size = self.get_page_size(self.request)
+        self.next_position = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            self.next_position = self.get_position(results[-1])
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, page_queryset = self.get_page_querysets(
+            queryset, request, view
+        )
+        self.count = queryset.count() if self.wants_count(request) else None
+        return self.get_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, page_queryset = self.get_page_querysets(
+            queryset, request, view
+        )
+        self.count = None
+        if self.wants_count(request):
+            self.count = await queryset.acount()
+        return self.get_page([obj async for obj in page_queryset.aiterator()])
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data):
+        response = {"next": self.get_next_link()}
+        if self.count is not None:
+            response["count"] = self.count
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "count": {
+                    "type": "integer",
+                    "description": f"Only with ?{self.count_query_param}=true",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ("-departure_time", "-id")
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("-order__created_at", "-id")
+
+
+class FlightSearchPagination(KeysetPagination):
+    ordering = ("departure_time", "flight_id")
@@ -0,0 +1,80 @@
+import math
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_default = encoders.JSONEncoder().default
+
+
+def _has_non_finite(data):
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return False
+    return any(_has_non_finite(item) for item in data)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Drop-in ``JSONRenderer`` encoding with ``orjson`` when it is installed
+    and with the stdlib otherwise. The output is the same bytes except for
+    floats Python writes in exponent notation, which orjson writes in its
+    shorter form (``1e16`` for ``1e+16``, ``1e-7`` for ``1e-07``); both
+    parse to the same value. NaN and infinities raise ``ValueError`` like
+    the strict ``JSONRenderer`` rather than turning into ``null``.
+
+    Responses with ``pre_encoded_content`` (cached reference data) are
+    written out as is instead of being encoded again.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        if indent is None:
+            pre_encoded = getattr(
+                renderer_context.get("response"), "pre_encoded_content", None
+            )
+            if pre_encoded is not None:
+                return pre_encoded
+
+        if (
+            data is None
+            or indent is not None
+            or orjson is None
+            or self.ensure_ascii
+            or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data,
+                default=_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            # Non-string keys, integers over 64 bits and the like.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # orjson writes NaN and infinities as null; only walk the data when
+        # there is a null they could hide behind.
+        if b"null" in content and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping of the JavaScript line terminators as JSONRenderer.
+        if not content.isascii():
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return content
+
+    def can_pre_encode(self, request):
+        return self.get_indent(request.accepted_media_type, {}) is None
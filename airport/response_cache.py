@@ -0,0 +1,111 @@
+import hashlib
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "airport:version:{model}"
+RESPONSE_KEY = "airport:response:{digest}"
+
+
+def get_cache():
+    return caches[settings.REFERENCE_CACHE_ALIAS]
+
+
+def _version_key(model):
+    return VERSION_KEY.format(model=model._meta.label_lower)
+
+
+def get_versions(models):
+    """
+    Current version tokens of ``models``. Tokens are random, so a version
+    evicted from the cache can never come back and revive stale entries.
+    """
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    get_cache().set(_version_key(model), uuid.uuid4().hex, None)
+
+
+def can_pre_encode(request):
+    renderer = getattr(request, "accepted_renderer", None)
+    return hasattr(renderer, "can_pre_encode") and (
+        renderer.can_pre_encode(request)
+    )
+
+
+def store_encoded(key, data, response):
+    """Post-render callback keeping the rendered bytes next to the data."""
+    get_cache().set(
+        key, (data, response.content), settings.REFERENCE_CACHE_TIMEOUT
+    )
+
+
+class CachedResponseMixin:
+    """
+    Read-through cache for list/retrieve responses of rarely changing
+    models. Entries are keyed on the full path, the negotiated renderer and
+    the versions of ``cache_models``, which model signals bump on write.
+    Renderers that support it also get the encoded body cached, so hits
+    skip both serialization and encoding.
+    """
+
+    cache_models = ()
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        versions = get_versions(self.cache_models)
+        digest = hashlib.sha1(
+            "|".join([
+                request.get_full_path(),
+                request.accepted_renderer.format,
+                *versions,
+            ]).encode()
+        ).hexdigest()
+        etag = f'"{digest}"'
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        cache = get_cache()
+        key = RESPONSE_KEY.format(digest=digest)
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            if can_pre_encode(request):
+                response.add_post_render_callback(
+                    partial(store_encoded, key, response.data)
+                )
+            else:
+                cache.set(
+                    key,
+                    (response.data, None),
+                    settings.REFERENCE_CACHE_TIMEOUT
+                )
+        else:
+            data, encoded = entry
+            response = Response(data)
+            response.pre_encoded_content = encoded
+
+        response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
@@ -0,0 +1,524 @@
+import csv
+import json
+import operator
+import time
+from collections import defaultdict
+from functools import reduce
+from itertools import count, islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.crew_roster import (
+    DutySchedule,
+    describe_conflicts,
+    lock_crew,
+    overlapping_duty,
+)
+from airport.fleet import lock_airplanes, overlapping
+from airport.itineraries import itinerary_index
+from airport.models import (
+    Airplane,
+    Airport,
+    Crew,
+    Flight,
+    FlightSearchIndex,
+    Route,
+)
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+FORMATS = ("csv", "ndjson")
+
+
+def guess_format(filename):
+    return "csv" if str(filename).lower().endswith(".csv") else "ndjson"
+
+
+def read_rows(lines, input_format):
+    """
+    Yield ``(line_number, row)`` pairs from CSV or NDJSON text lines;
+    NDJSON lines that are not valid JSON yield ``None`` as the row.
+    """
+    if input_format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def _is_reference(value):
+    """Whether ``value`` can be an id or a name; NDJSON allows any JSON."""
+    return isinstance(value, (int, str)) and not isinstance(value, bool)
+
+
+def _by_name(pairs):
+    lookup = {}
+    for name, object_id in pairs:
+        # Names that are not unique can only be referenced by id.
+        lookup[name] = None if name in lookup else object_id
+    return lookup
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class InvalidRow(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rate(self):
+        return self.created / self.seconds if self.seconds else 0.0
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "seconds": round(self.seconds, 3),
+            "flights_per_second": round(self.rate),
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+class ScheduleImporter:
+    """
+    Bulk loads flights with their crew assignments.
+
+    Every row has ``departure_time``, ``arrival_time``, an ``airplane``
+    (id or name), either a ``route`` id or ``source`` and ``destination``
+    airport names, and optional ``crew_members`` (ids or full names, as a
+    list or a ``;``-separated string). References are resolved from
+    lookup tables loaded once, so only inserts hit the database.
+
+    Neither airplanes nor crew members may be on two flights at
+    overlapping times, counting both existing flights and earlier rows of
+    the import.
+
+    The import runs in one transaction; unless ``skip_invalid`` is set,
+    any invalid row rolls the whole import back. Each chunk locks the
+    airplanes and crew it references, up to the end of the import.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, skip_invalid=False):
+        self.chunk_size = chunk_size
+        self.skip_invalid = skip_invalid
+
+        self.airports = _by_name(Airport.objects.values_list("name", "id"))
+        self.routes = {}
+        self.route_airports = {}
+        for route_id, source_id, destination_id, *airports in (
+            Route.objects.values_list(
+                "id",
+                "source_id",
+                "destination_id",
+                "source__name",
+                "source__closest_big_city",
+                "destination__name",
+                "destination__closest_big_city",
+            )
+        ):
+            self.routes[(source_id, destination_id)] = route_id
+            self.route_airports[route_id] = airports
+        self.route_ids = set(self.route_airports)
+        airplanes = Airplane.objects.values_list(
+            "id", "name", "rows", "seats_in_row"
+        )
+        self.airplanes = _by_name(
+            (name, airplane_id) for airplane_id, name, _, _ in airplanes
+        )
+        self.capacities = {
+            airplane_id: rows * seats_in_row
+            for airplane_id, _, rows, seats_in_row in airplanes
+        }
+        self.airplane_ids = set(self.capacities)
+        self.airplane_names = {
+            airplane_id: name for airplane_id, name, _, _ in airplanes
+        }
+        crew = Crew.objects.values_list("id", "first_name", "last_name")
+        self.crew = _by_name(
+            (f"{first_name} {last_name}", crew_id)
+            for crew_id, first_name, last_name in crew
+        )
+        self.crew_ids = {crew_id for crew_id, _, _ in crew}
+        self.crew_names = {
+            crew_id: f"{first_name} {last_name}"
+            for crew_id, first_name, last_name in crew
+        }
+        # Flights of the airplanes and the crew, the existing ones loaded
+        # around the rows of each chunk and the imported ones under
+        # placeholder ids as the flights are not saved yet.
+        self._placeholder_ids = count(-1, -1)
+        self.airplane_schedules = defaultdict(DutySchedule)
+        self._loaded_flight_ids = set()
+        self.crew_schedules = defaultdict(DutySchedule)
+        self._loaded_duty = set()
+        self._locked_airplane_ids = set()
+        self._locked_crew_ids = set()
+
+    @staticmethod
+    def _resolve(value, by_name, ids):
+        if not _is_reference(value):
+            return None
+        if isinstance(value, int) or value.isdecimal():
+            return int(value) if int(value) in ids else None
+        return by_name.get(value)
+
+    def _resolve_route(self, row, errors):
+        if row.get("route"):
+            route_id = self._resolve(row["route"], {}, self.route_ids)
+            if route_id is None:
+                errors["route"] = f"Unknown route: {row['route']}"
+            return route_id
+
+        airport_ids = []
+        for field in ("source", "destination"):
+            if not row.get(field):
+                errors[field] = "This field is required without route."
+                continue
+            airport_id = (
+                self.airports.get(row[field])
+                if _is_reference(row[field]) else None
+            )
+            if airport_id is None:
+                errors[field] = f"Unknown airport: {row[field]}"
+            airport_ids.append(airport_id)
+        if errors:
+            return None
+
+        route_id = self.routes.get(tuple(airport_ids))
+        if route_id is None:
+            errors["route"] = (
+                f"No route from {row['source']} to {row['destination']}"
+            )
+        return route_id
+
+    def _parse_time(self, row, field, errors):
+        try:
+            value = parse_datetime(str(row.get(field) or ""))
+        except ValueError:
+            value = None
+        if value is None:
+            errors[field] = "Expected an ISO 8601 datetime."
+            return None
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    def _resolve_crew(self, value, errors):
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = [name.strip() for name in value.split(";")]
+        if not isinstance(value, list):
+            errors["crew_members"] = (
+                "Expected a list or a ;-separated string."
+            )
+            return []
+        crew_ids = []
+        for member in value:
+            if member == "":
+                continue
+            crew_id = self._resolve(member, self.crew, self.crew_ids)
+            if crew_id is None:
+                errors["crew_members"] = f"Unknown crew member: {member}"
+                return []
+            crew_ids.append(crew_id)
+        return list(dict.fromkeys(crew_ids))
+
+    def lock(self, built):
+        """
+        Lock the airplanes and crew of the ``(line, flight, crew_ids)``
+        rows of a chunk that earlier chunks didn't lock. They stay locked
+        until the import ends, while flight writes elsewhere go on.
+        """
+        airplane_ids = {
+            flight.airplane_id for _, flight, _ in built
+        } - self._locked_airplane_ids
+        crew_ids = {
+            crew_id for _, _, crew_ids in built for crew_id in crew_ids
+        } - self._locked_crew_ids
+        if airplane_ids:
+            lock_airplanes(airplane_ids)
+            self._locked_airplane_ids |= airplane_ids
+        if crew_ids:
+            lock_crew(crew_ids)
+            self._locked_crew_ids |= crew_ids
+
+    def load_airplane_schedules(self, flights):
+        """
+        Add the existing flights that may overlap ``flights`` to the
+        airplane schedules, with one query per chunk.
+        """
+        spans = {}
+        for flight in flights:
+            start, end = flight.departure_time, flight.arrival_time
+            if flight.airplane_id in spans:
+                span_start, span_end = spans[flight.airplane_id]
+                start, end = min(start, span_start), max(end, span_end)
+            spans[flight.airplane_id] = (start, end)
+        if not spans:
+            return
+
+        for flight_id, airplane_id, departure_time, arrival_time in reduce(
+            operator.or_,
+            (
+                overlapping(airplane_id, start, end)
+                for airplane_id, (start, end) in spans.items()
+            ),
+        ).values_list("id", "airplane_id", "departure_time", "arrival_time"):
+            if flight_id in self._loaded_flight_ids:
+                continue
+            self._loaded_flight_ids.add(flight_id)
+            self.airplane_schedules[airplane_id].add(
+                departure_time.timestamp(), arrival_time.timestamp(), flight_id
+            )
+
+    def load_crew_schedules(self, built):
+        """
+        Add the existing flights of the crew that may overlap the
+        ``(flight, crew_ids)`` pairs of ``built`` to the crew schedules,
+        with one query per chunk.
+        """
+        spans = {}
+        for flight, crew_ids in built:
+            for crew_id in crew_ids:
+                start, end = flight.departure_time, flight.arrival_time
+                if crew_id in spans:
+                    span_start, span_end = spans[crew_id]
+                    start, end = min(start, span_start), max(end, span_end)
+                spans[crew_id] = (start, end)
+        if not spans:
+            return
+
+        for crew_id, flight_id, departure_time, arrival_time in reduce(
+            operator.or_,
+            (
+                overlapping_duty([crew_id], start, end)
+                for crew_id, (start, end) in spans.items()
+            ),
+        ).values_list(
+            "crew_id",
+            "flight_id",
+            "flight__departure_time",
+            "flight__arrival_time",
+        ):
+            if (crew_id, flight_id) in self._loaded_duty:
+                continue
+            self._loaded_duty.add((crew_id, flight_id))
+            self.crew_schedules[crew_id].add(
+                departure_time.timestamp(), arrival_time.timestamp(), flight_id
+            )
+
+    @staticmethod
+    def _describe_busy(schedules, names, object_ids, start, end):
+        """
+        Messages for the ``object_ids`` whose schedules overlap the range,
+        naming existing flights and counting placeholders as imported ones.
+        """
+        existing = {}
+        imported = []
+        for object_id in object_ids:
+            flight_ids = schedules[object_id].overlapping(start, end)
+            if any(flight_id > 0 for flight_id in flight_ids):
+                existing[object_id] = sorted(
+                    flight_id for flight_id in flight_ids if flight_id > 0
+                )
+            if any(flight_id < 0 for flight_id in flight_ids):
+                imported.append(object_id)
+        messages = describe_conflicts(existing, names)
+        messages.extend(
+            f"{names[object_id]} is already on another flight of this "
+            f"import at an overlapping time."
+            for object_id in imported
+        )
+        return " ".join(messages)
+
+    def build(self, row):
+        if not isinstance(row, dict):
+            raise InvalidRow({"non_field_errors": "Expected an object."})
+
+        errors = {}
+        route_id = self._resolve_route(row, errors)
+        airplane_id = None
+        if not row.get("airplane"):
+            errors["airplane"] = "This field is required."
+        else:
+            airplane_id = self._resolve(
+                row["airplane"], self.airplanes, self.airplane_ids
+            )
+            if airplane_id is None:
+                errors["airplane"] = f"Unknown airplane: {row['airplane']}"
+        departure_time = self._parse_time(row, "departure_time", errors)
+        arrival_time = self._parse_time(row, "arrival_time", errors)
+        if (
+            departure_time and arrival_time
+            and arrival_time <= departure_time
+        ):
+            errors["arrival_time"] = "Must be after departure_time."
+        elif (
+            departure_time and arrival_time
+            and arrival_time - departure_time > settings.MAX_FLIGHT_DURATION
+        ):
+            errors["arrival_time"] = (
+                f"Flights can't last longer than "
+                f"{settings.MAX_FLIGHT_DURATION}."
+            )
+        crew_ids = self._resolve_crew(row.get("crew_members"), errors)
+
+        if errors:
+            raise InvalidRow(errors)
+        flight = Flight(
+            route_id=route_id,
+            airplane_id=airplane_id,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        )
+        return flight, crew_ids
+
+    def check(self, flight, crew_ids):
+        """
+        Reject a built row whose airplane or crew is already busy, then
+        book them for it. Needs the schedules loaded for the chunk.
+        """
+        start = flight.departure_time.timestamp()
+        end = flight.arrival_time.timestamp()
+        errors = {}
+        for field, schedules, names, object_ids in (
+            (
+                "airplane",
+                self.airplane_schedules,
+                self.airplane_names,
+                [flight.airplane_id],
+            ),
+            ("crew_members", self.crew_schedules, self.crew_names, crew_ids),
+        ):
+            message = self._describe_busy(
+                schedules, names, object_ids, start, end
+            )
+            if message:
+                errors[field] = message
+        if errors:
+            raise InvalidRow(errors)
+
+        placeholder_id = next(self._placeholder_ids)
+        self.airplane_schedules[flight.airplane_id].add(
+            start, end, placeholder_id
+        )
+        for crew_id in crew_ids:
+            self.crew_schedules[crew_id].add(start, end, placeholder_id)
+
+    def save_chunk(self, flights, crews):
+        Flight.objects.bulk_create(flights)
+        Flight.crew_members.through.objects.bulk_create(
+            Flight.crew_members.through(flight_id=flight.id, crew_id=crew_id)
+            for flight, crew_ids in zip(flights, crews)
+            for crew_id in crew_ids
+        )
+        # bulk_create sends no signals, so the search rows of the new
+        # flights are built here from the lookup tables.
+        FlightSearchIndex.objects.bulk_create(
+            self.build_search_entry(flight) for flight in flights
+        )
+        # Already in the schedules under their placeholder ids.
+        self._loaded_flight_ids.update(flight.id for flight in flights)
+        self._loaded_duty.update(
+            (crew_id, flight.id)
+            for flight, crew_ids in zip(flights, crews)
+            for crew_id in crew_ids
+        )
+
+    def build_search_entry(self, flight):
+        source_name, source_city, destination_name, destination_city = (
+            self.route_airports[flight.route_id]
+        )
+        return FlightSearchIndex(
+            flight_id=flight.id,
+            source_name=source_name,
+            source_city=source_city,
+            destination_name=destination_name,
+            destination_city=destination_city,
+            departure_date=timezone.localdate(flight.departure_time),
+            departure_time=flight.departure_time,
+            arrival_time=flight.arrival_time,
+            capacity=self.capacities[flight.airplane_id],
+        )
+
+    def run(self, rows):
+        """Import ``(line_number, row)`` pairs, see ``read_rows``."""
+        result = ImportResult()
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            for chunk in _chunked(rows, self.chunk_size):
+                errors = []
+                built = []
+                for line, row in chunk:
+                    try:
+                        built.append((line, *self.build(row)))
+                    except InvalidRow as error:
+                        errors.append((line, error.errors))
+
+                self.lock(built)
+                self.load_airplane_schedules(flight for _, flight, _ in built)
+                self.load_crew_schedules(
+                    (flight, crew_ids) for _, flight, crew_ids in built
+                )
+                flights = []
+                crews = []
+                for line, flight, crew_ids in built:
+                    try:
+                        self.check(flight, crew_ids)
+                    except InvalidRow as error:
+                        errors.append((line, error.errors))
+                        continue
+                    flights.append(flight)
+                    crews.append(crew_ids)
+
+                for line, row_errors in sorted(
+                    errors, key=operator.itemgetter(0)
+                ):
+                    result.add_error(line, row_errors)
+
+                if flights and (self.skip_invalid or not result.error_count):
+                    self.save_chunk(flights, crews)
+                    result.created += len(flights)
+
+            if result.error_count and not self.skip_invalid:
+                transaction.set_rollback(True)
+                result.created = 0
+            elif result.created:
+                transaction.on_commit(itinerary_index.invalidate)
+
+        result.seconds = time.perf_counter() - started
+        return result
@@ -0,0 +1,115 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from airport.models import Flight, FlightSearchIndex, Route
+
+REFRESHED_FIELDS = (
+    "source_name",
+    "source_city",
+    "destination_name",
+    "destination_city",
+    "departure_date",
+    "departure_time",
+    "arrival_time",
+    "capacity",
+    "tickets_sold",
+)
+
+
+def build_entry(flight):
+    source = flight.route.source
+    destination = flight.route.destination
+    return FlightSearchIndex(
+        flight_id=flight.id,
+        source_name=source.name,
+        source_city=source.closest_big_city,
+        destination_name=destination.name,
+        destination_city=destination.closest_big_city,
+        departure_date=timezone.localdate(flight.departure_time),
+        departure_time=flight.departure_time,
+        arrival_time=flight.arrival_time,
+        capacity=flight.airplane.capacity,
+        tickets_sold=flight.tickets_sold,
+    )
+
+
+def refresh_flights(flights):
+    """
+    Recompute the search entries of ``flights`` (a ``Flight`` queryset)
+    from scratch with one read and one upsert.
+    """
+    entries = [
+        build_entry(flight)
+        for flight in flights.select_related(
+            "route__source", "route__destination", "airplane"
+        ).annotate(tickets_sold=Count("tickets")).order_by()
+    ]
+    if entries:
+        FlightSearchIndex.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=["flight"],
+            update_fields=REFRESHED_FIELDS,
+        )
+
+
+def refresh_flight(flight_id):
+    refresh_flights(Flight.objects.filter(id=flight_id))
+
+
+@transaction.atomic
+def rebuild(batch_size=1000):
+    """
+    Recreate the whole index in one transaction, so readers keep seeing
+    the previous entries until the new ones are committed.
+    """
+    FlightSearchIndex.objects.all().delete()
+    flight_ids = list(
+        Flight.objects.order_by("id").values_list("id", flat=True)
+    )
+    for start in range(0, len(flight_ids), batch_size):
+        refresh_flights(
+            Flight.objects.filter(id__in=flight_ids[start:start + batch_size])
+        )
+    return len(flight_ids)
+
+
+def update_airport(airport):
+    FlightSearchIndex.objects.filter(
+        flight__route__source_id=airport.id
+    ).update(source_name=airport.name, source_city=airport.closest_big_city)
+    FlightSearchIndex.objects.filter(
+        flight__route__destination_id=airport.id
+    ).update(
+        destination_name=airport.name,
+        destination_city=airport.closest_big_city
+    )
+
+
+def update_route(route_id):
+    route = Route.objects.select_related("source", "destination").get(
+        id=route_id
+    )
+    FlightSearchIndex.objects.filter(flight__route_id=route_id).update(
+        source_name=route.source.name,
+        source_city=route.source.closest_big_city,
+        destination_name=route.destination.name,
+        destination_city=route.destination.closest_big_city,
+    )
+
+
+def update_airplane(airplane):
+    FlightSearchIndex.objects.filter(
+        flight__airplane_id=airplane.id
+    ).update(capacity=airplane.capacity)
+
+
+def add_sold(tickets, sign=1):
+    counts = Counter(ticket.flight_id for ticket in tickets)
+    for flight_id, count in counts.items():
+        FlightSearchIndex.objects.filter(flight_id=flight_id).update(
+            tickets_sold=F("tickets_sold") + sign * count
+        )
@@ -0,0 +1,121 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from airport.booking import (
+    SeatConflict,
+    get_held_seats,
+    get_taken_seats,
+    lock_flights,
+)
+from airport.models import SeatHold, Ticket
+from airport.seat_map import SeatMap
+
+logger = logging.getLogger(__name__)
+
+
+def _held_seats(flight):
+    return SeatHold.objects.filter(
+        flight_id=flight.id, expires_at__gt=timezone.now()
+    ).values_list("row", "seat")
+
+
+def get_held_map(flight):
+    held_map = SeatMap.empty(flight)
+    for row, seat in _held_seats(flight):
+        held_map.take(row, seat)
+    return held_map
+
+
+async def aget_held_map(flight):
+    held_map = SeatMap.empty(flight)
+    async for row, seat in _held_seats(flight):
+        held_map.take(row, seat)
+    return held_map
+
+
+@transaction.atomic
+def place_holds(user, flight, seats_data):
+    """
+    Hold the requested seats for ``user``. Seats the user already holds
+    keep their expiry, and a user holds at most
+    ``SEAT_HOLD_MAX_PER_FLIGHT`` seats of a flight at a time.
+    """
+    seats = set()
+    for seat_data in seats_data:
+        Ticket.validate_ticket(
+            seat_data["row"],
+            seat_data["seat"],
+            flight.airplane,
+            ValidationError
+        )
+        seats.add((flight.id, seat_data["row"], seat_data["seat"]))
+
+    lock_flights([flight.id])
+    now = timezone.now()
+    SeatHold.objects.filter(flight=flight, expires_at__lte=now).delete()
+
+    conflicts = get_taken_seats(seats) | get_held_seats(seats, user.id)
+    if conflicts:
+        raise SeatConflict(conflicts)
+
+    held = {
+        (hold.row, hold.seat): hold
+        for hold in SeatHold.objects.filter(flight=flight, user_id=user.id)
+    }
+    new_seats = sorted(
+        (row, seat) for _, row, seat in seats if (row, seat) not in held
+    )
+    max_holds = settings.SEAT_HOLD_MAX_PER_FLIGHT
+    if len(held) + len(new_seats) > max_holds:
+        raise ValidationError(
+            {"seats": f"At most {max_holds} seats can be held per flight."}
+        )
+
+    expires_at = now + settings.SEAT_HOLD_TTL
+    created = SeatHold.objects.bulk_create(
+        SeatHold(
+            flight=flight,
+            user_id=user.id,
+            row=row,
+            seat=seat,
+            expires_at=expires_at,
+        )
+        for row, seat in new_seats
+    )
+    return sorted(
+        [held[row, seat] for _, row, seat in seats if (row, seat) in held]
+        + created,
+        key=lambda hold: (hold.row, hold.seat),
+    )
+
+
+def release_expired_holds(batch_size=1000):
+    released = 0
+    while True:
+        hold_ids = list(
+            SeatHold.objects.filter(expires_at__lte=timezone.now())
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not hold_ids:
+            return released
+        released += SeatHold.objects.filter(id__in=hold_ids).delete()[0]
+
+
+def run_sweeper(interval, batch_size=1000):
+    """Release expired holds every ``interval`` seconds, forever."""
+    while True:
+        time.sleep(interval)
+        try:
+            released = release_expired_holds(batch_size=batch_size)
+            if released:
+                logger.info("Released %s expired seat holds", released)
+        except DatabaseError:
+            logger.exception("Could not release expired seat holds")
+        finally:
+            connection.close()
@@ -0,0 +1,218 @@
+import base64
+import random
+from collections import defaultdict
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+from airport.models import Ticket
+
+SEAT_MAP_CACHE_KEY = "airport:seat-map:{flight_id}"
+SEAT_MAP_VERSION_KEY = "airport:seat-map-version:{flight_id}"
+SEAT_MAP_CLAIM_KEY = "airport:seat-map-claim:{flight_id}:{version}"
+SEAT_MAP_CACHE_TIMEOUT = 60 * 60
+
+
+class SeatMap:
+    """
+    Occupancy bitmap of a flight: bit ``(row - 1) * seats_in_row + seat - 1``
+    is set when the seat is taken, most significant bit first in each byte.
+    """
+
+    def __init__(self, flight_id, rows, seats_in_row, bitmap=None):
+        self.flight_id = flight_id
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self.bitmap = bytearray(bitmap) if bitmap else bytearray(size)
+
+    @property
+    def capacity(self):
+        return self.rows * self.seats_in_row
+
+    @property
+    def tickets_taken(self):
+        return int.from_bytes(self.bitmap, "big").bit_count()
+
+    @property
+    def tickets_available(self):
+        return self.capacity - self.tickets_taken
+
+    @property
+    def occupancy(self):
+        return base64.b64encode(self.bitmap).decode()
+
+    def _position(self, row, seat):
+        index = (row - 1) * self.seats_in_row + seat - 1
+        return index // 8, 0x80 >> (index % 8)
+
+    def is_taken(self, row, seat):
+        byte, mask = self._position(row, seat)
+        return bool(self.bitmap[byte] & mask)
+
+    def take(self, row, seat):
+        byte, mask = self._position(row, seat)
+        self.bitmap[byte] |= mask
+
+    def matches(self, airplane):
+        return (
+            self.rows == airplane.rows
+            and self.seats_in_row == airplane.seats_in_row
+        )
+
+    @classmethod
+    def empty(cls, flight):
+        return cls(
+            flight.id, flight.airplane.rows, flight.airplane.seats_in_row
+        )
+
+    @classmethod
+    def build(cls, flight):
+        seat_map = cls.empty(flight)
+        for row, seat in _taken_seats(flight.id):
+            seat_map.take(row, seat)
+        return seat_map
+
+    @classmethod
+    async def abuild(cls, flight):
+        seat_map = cls.empty(flight)
+        async for row, seat in _taken_seats(flight.id):
+            seat_map.take(row, seat)
+        return seat_map
+
+    def to_cache(self, version):
+        return version, self.rows, self.seats_in_row, bytes(self.bitmap)
+
+
+def _taken_seats(flight_id):
+    return Ticket.objects.filter(flight_id=flight_id).values_list(
+        "row", "seat"
+    )
+
+
+def _version_key(flight_id):
+    return SEAT_MAP_VERSION_KEY.format(flight_id=flight_id)
+
+
+def _keys(flight_id):
+    return _version_key(flight_id), SEAT_MAP_CACHE_KEY.format(
+        flight_id=flight_id
+    )
+
+
+def _new_version():
+    return random.getrandbits(48)
+
+
+def _from_cache(flight, cached, version):
+    """
+    The cached map of ``flight`` if it was stored at ``version``. A map
+    built from an older snapshot carries the version read before the
+    snapshot, so it stops being served once a write bumps the version.
+    """
+    if cached is not None and cached[0] == version:
+        seat_map = SeatMap(flight.id, *cached[1:])
+        if seat_map.matches(flight.airplane):
+            return seat_map
+    return None
+
+
+def get_seat_map(flight):
+    version_key, key = _keys(flight.id)
+    cached = cache.get_many([version_key, key])
+    version = cached.get(version_key)
+    if version is None:
+        cache.add(version_key, _new_version(), None)
+        version = cache.get(version_key)
+    seat_map = _from_cache(flight, cached.get(key), version)
+    if seat_map is None:
+        seat_map = SeatMap.build(flight)
+        cache.set(key, seat_map.to_cache(version), SEAT_MAP_CACHE_TIMEOUT)
+    return seat_map
+
+
+async def aget_seat_map(flight):
+    version_key, key = _keys(flight.id)
+    cached = await cache.aget_many([version_key, key])
+    version = cached.get(version_key)
+    if version is None:
+        await cache.aadd(version_key, _new_version(), None)
+        version = await cache.aget(version_key)
+    seat_map = _from_cache(flight, cached.get(key), version)
+    if seat_map is None:
+        seat_map = await SeatMap.abuild(flight)
+        await cache.aset(
+            key, seat_map.to_cache(version), SEAT_MAP_CACHE_TIMEOUT
+        )
+    return seat_map
+
+
+def _bump_version(flight_id):
+    try:
+        return cache.incr(_version_key(flight_id))
+    except ValueError:
+        # Lost version: the next read starts a new one and rebuilds.
+        return None
+
+
+def _store(flight_id, version, seat_map):
+    """
+    Store ``seat_map``, built from the map cached at ``version``, if no
+    other write bumped the version in between; otherwise the stale map is
+    left to be rebuilt by the next read.
+    """
+    new_version = _bump_version(flight_id)
+    if seat_map is None or new_version != version + 1:
+        return
+    if cache.add(
+        SEAT_MAP_CLAIM_KEY.format(flight_id=flight_id, version=new_version),
+        True,
+        SEAT_MAP_CACHE_TIMEOUT,
+    ):
+        cache.set(
+            SEAT_MAP_CACHE_KEY.format(flight_id=flight_id),
+            seat_map.to_cache(new_version),
+            SEAT_MAP_CACHE_TIMEOUT,
+        )
+    else:
+        # A colliding writer on a backend without an atomic incr.
+        _bump_version(flight_id)
+
+
+def add_tickets(tickets):
+    """
+    Must run inside the transaction that created ``tickets``, while their
+    flights are locked. Applies the new seats to the cached maps and
+    stores them after commit with a compare-and-set on the version.
+    """
+    seats_by_flight = defaultdict(list)
+    for ticket in tickets:
+        seats_by_flight[ticket.flight_id].append((ticket.row, ticket.seat))
+
+    cached = cache.get_many(
+        [key for flight_id in seats_by_flight for key in _keys(flight_id)]
+    )
+    for flight_id, seats in seats_by_flight.items():
+        version_key, key = _keys(flight_id)
+        version = cached.get(version_key)
+        entry = cached.get(key)
+        seat_map = None
+        if version is not None and entry is not None and entry[0] == version:
+            seat_map = SeatMap(flight_id, *entry[1:])
+            if all(
+                row <= seat_map.rows and seat <= seat_map.seats_in_row
+                for row, seat in seats
+            ):
+                for row, seat in seats:
+                    seat_map.take(row, seat)
+            else:
+                # Cached for an older airplane layout; rebuilt on read.
+                seat_map = None
+        transaction.on_commit(partial(_store, flight_id, version, seat_map))
+
+
+def invalidate(*flight_ids):
+    """Must run after the writes to the flights' tickets commit."""
+    for flight_id in flight_ids:
+        _bump_version(flight_id)
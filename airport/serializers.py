@@ -1,4 +1,8 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -9,9 +13,14 @@ from airport.models import (
     AirplaneType,
     Airplane,
     Flight,
+    FlightSearchIndex,
     Order,
+    SeatHold,
     Ticket
 )
+from airport import booking
+from airport.crew_roster import crew_conflicts, describe_conflicts, lock_crew
+from airport.fleet import lock_airplanes, overlapping_flights
 
 
 class AirportSerializer(serializers.ModelSerializer):
@@ -74,8 +83,110 @@ class FlightSerializer(serializers.ModelSerializer):
             "crew_members"
         )
 
+    def _current(self, attrs, field):
+        return attrs.get(field, getattr(self.instance, field, None))
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        departure_time = self._current(attrs, "departure_time")
+        arrival_time = self._current(attrs, "arrival_time")
+        if departure_time and arrival_time and arrival_time <= departure_time:
+            raise ValidationError(
+                {"arrival_time": "Must be after departure_time."}
+            )
+        if (
+            departure_time and arrival_time
+            and arrival_time - departure_time > settings.MAX_FLIGHT_DURATION
+        ):
+            raise ValidationError({
+                "arrival_time": f"Flights can't last longer than "
+                                f"{settings.MAX_FLIGHT_DURATION}."
+            })
+        return data
 
-class FlightListSerializer(FlightSerializer):
+    def check_airplane(self, validated_data):
+        """
+        Rejects flights overlapping another flight of the same airplane.
+        Must run inside a transaction; the airplane stays locked until the
+        flight is saved.
+        """
+        if self.instance is not None and not validated_data.keys() & {
+            "airplane", "departure_time", "arrival_time"
+        }:
+            return
+
+        airplane = self._current(validated_data, "airplane")
+        lock_airplanes([airplane.id])
+        flight_ids = overlapping_flights(
+            airplane.id,
+            self._current(validated_data, "departure_time"),
+            self._current(validated_data, "arrival_time"),
+            exclude_flight_id=getattr(self.instance, "id", None),
+        )
+        if flight_ids:
+            raise ValidationError({
+                "airplane": describe_conflicts(
+                    {airplane.id: flight_ids}, {airplane.id: airplane.name}
+                )
+            })
+
+    def check_crew(self, validated_data):
+        """
+        Rejects crew already flying at overlapping times. Must run inside a
+        transaction; the crew stays locked until the flight is saved.
+        """
+        if "crew_members" in validated_data:
+            crew = validated_data["crew_members"]
+        elif self.instance is not None:
+            crew = list(self.instance.crew_members.all())
+        else:
+            crew = []
+        if not crew:
+            return
+
+        crew_ids = [member.id for member in crew]
+        lock_crew(crew_ids)
+        conflicts = crew_conflicts(
+            crew_ids,
+            self._current(validated_data, "departure_time"),
+            self._current(validated_data, "arrival_time"),
+            exclude_flight_id=getattr(self.instance, "id", None),
+        )
+        if conflicts:
+            raise ValidationError({
+                "crew_members": describe_conflicts(
+                    conflicts,
+                    {member.id: member.full_name for member in crew},
+                )
+            })
+
+    @transaction.atomic
+    def create(self, validated_data):
+        self.check_airplane(validated_data)
+        self.check_crew(validated_data)
+        return super().create(validated_data)
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        self.check_airplane(validated_data)
+        self.check_crew(validated_data)
+        return super().update(instance, validated_data)
+
+
+class FlightAvailabilitySerializer(FlightSerializer):
+    capacity = serializers.IntegerField(
+        source="airplane.capacity", read_only=True
+    )
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta(FlightSerializer.Meta):
+        fields = FlightSerializer.Meta.fields + (
+            "capacity",
+            "tickets_available"
+        )
+
+
+class FlightListSerializer(FlightAvailabilitySerializer):
     route = RouteListSerializer(read_only=True)
     airplane = serializers.SlugRelatedField(slug_field="name", read_only=True)
     crew_members = serializers.SlugRelatedField(
@@ -83,12 +194,51 @@ class FlightListSerializer(FlightSerializer):
     )
 
 
-class FlightDetailSerializer(FlightSerializer):
+class FlightDetailSerializer(FlightAvailabilitySerializer):
     route = RouteDetailSerializer(read_only=True)
     airplane = AirplaneListSerializer(read_only=True)
     crew_members = CrewSerializer(many=True, read_only=True)
 
 
+class FlightSearchSerializer(serializers.ModelSerializer):
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = FlightSearchIndex
+        fields = (
+            "flight",
+            "source_name",
+            "source_city",
+            "destination_name",
+            "destination_city",
+            "departure_time",
+            "arrival_time",
+            "capacity",
+            "tickets_available"
+        )
+
+
+class SeatMapSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(source="flight_id", read_only=True)
+    rows = serializers.IntegerField(read_only=True)
+    seats_in_row = serializers.IntegerField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
+    occupancy = serializers.CharField(read_only=True)
+    held = serializers.CharField(source="held.occupancy", read_only=True)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ("id", "row", "seat", "expires_at")
+        read_only_fields = ("expires_at",)
+
+
+class SeatHoldRequestSerializer(serializers.Serializer):
+    seats = SeatHoldSerializer(many=True, allow_empty=False)
+
+
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
@@ -113,21 +263,150 @@ class TicketDetailSerializer(TicketSerializer):
     flight = FlightDetailSerializer(read_only=True)
 
 
+class OrderTicketSerializer(serializers.ModelSerializer):
+    flight = serializers.IntegerField(source="flight_id")
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "flight")
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = OrderTicketSerializer(
+        many=True, read_only=False, allow_empty=False
+    )
 
     class Meta:
         model = Order
         fields = ("id", "tickets", "created_at")
 
+    def validate(self, attrs):
+        data = super(OrderSerializer, self).validate(attrs=attrs)
+        booking.validate_tickets(attrs["tickets"])
+        return data
+
     @transaction.atomic
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
         order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+        booking.create_tickets(order, tickets_data)
         return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class FlightFilterSerializer(serializers.Serializer):
+    route = serializers.IntegerField(required=False)
+    departure_date = serializers.DateField(required=False)
+    arrival_date = serializers.DateField(required=False)
+    min_available = serializers.IntegerField(min_value=0, required=False)
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    departure_date = serializers.DateField()
+    max_stops = serializers.IntegerField(min_value=0, max_value=2, default=1)
+    min_connection = serializers.IntegerField(
+        min_value=0, default=45, help_text="Minutes"
+    )
+    max_connection = serializers.IntegerField(
+        min_value=1, default=24 * 60, help_text="Minutes"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+    stops = serializers.IntegerField(read_only=True)
+    flights = FlightListSerializer(many=True, read_only=True)
+
+
+class ScheduleWindowSerializer(serializers.Serializer):
+    start = serializers.DateField(default=timezone.localdate)
+    end = serializers.DateField(
+        required=False, help_text="Exclusive, 30 days after start by default"
+    )
+
+    def validate(self, attrs):
+        attrs.setdefault("end", attrs["start"] + timedelta(days=30))
+        if attrs["end"] <= attrs["start"]:
+            raise ValidationError({"end": "Must be after start."})
+        return attrs
+
+
+class CrewFlightSerializer(serializers.ModelSerializer):
+    route = RouteListSerializer(read_only=True)
+    airplane = serializers.SlugRelatedField(slug_field="name", read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = ("id", "route", "airplane", "departure_time", "arrival_time")
+
+
+class CrewScheduleSerializer(serializers.Serializer):
+    crew = CrewSerializer(read_only=True)
+    start = serializers.DateField(read_only=True)
+    end = serializers.DateField(read_only=True)
+    flight_count = serializers.IntegerField(read_only=True)
+    duty_hours = serializers.SerializerMethodField()
+    flights = CrewFlightSerializer(many=True, read_only=True)
+
+    def get_duty_hours(self, schedule) -> float:
+        duty_time = schedule["duty_time"] or timedelta()
+        return round(duty_time.total_seconds() / 3600, 2)
+
+
+class IdleGapSerializer(serializers.Serializer):
+    start = serializers.DateTimeField(read_only=True)
+    end = serializers.DateTimeField(read_only=True)
+    hours = serializers.SerializerMethodField()
+
+    def get_hours(self, gap) -> float:
+        return round((gap["end"] - gap["start"]).total_seconds() / 3600, 2)
+
+
+class AirplaneUtilizationSerializer(AirplaneListSerializer):
+    flight_count = serializers.IntegerField(read_only=True)
+    hours_flown = serializers.SerializerMethodField()
+    idle_hours = serializers.SerializerMethodField()
+    utilization = serializers.SerializerMethodField()
+    gaps = IdleGapSerializer(many=True, read_only=True)
+
+    class Meta(AirplaneListSerializer.Meta):
+        fields = (
+            "id",
+            "name",
+            "airplane_type",
+            "flight_count",
+            "hours_flown",
+            "idle_hours",
+            "utilization",
+            "gaps",
+        )
+
+    def _hours(self, duration):
+        return round(duration.total_seconds() / 3600, 2)
+
+    def get_hours_flown(self, airplane) -> float:
+        return self._hours(airplane.flight_time or timedelta())
+
+    def get_idle_hours(self, airplane) -> float:
+        return self._hours(sum(
+            (gap["end"] - gap["start"] for gap in airplane.gaps), timedelta()
+        ))
+
+    def get_utilization(self, airplane) -> float:
+        """Share of the window spent flying."""
+        window = self.context["end"] - self.context["start"]
+        flight_time = airplane.flight_time or timedelta()
+        return round(flight_time / window, 4)
+
+
+class FleetUtilizationSerializer(serializers.Serializer):
+    start = serializers.DateField(read_only=True)
+    end = serializers.DateField(read_only=True)
+    airplanes = AirplaneUtilizationSerializer(many=True, read_only=True)
@@ -0,0 +1,96 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from airport import response_cache, search_index, seat_map
+from airport.itineraries import itinerary_index
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Route,
+    Ticket,
+)
+
+REFERENCE_MODELS = (Airport, AirplaneType, Airplane, Crew, Route)
+
+
+@receiver(post_delete, sender=Ticket)
+def invalidate_seat_map(sender, instance, **kwargs):
+    transaction.on_commit(partial(seat_map.invalidate, instance.flight_id))
+
+
+@receiver(post_save, sender=Ticket)
+def count_sold_ticket(sender, instance, created, **kwargs):
+    if created:
+        search_index.add_sold([instance])
+    else:
+        search_index.refresh_flight(instance.flight_id)
+
+
+@receiver(post_delete, sender=Ticket)
+def uncount_sold_ticket(sender, instance, **kwargs):
+    search_index.add_sold([instance], sign=-1)
+
+
+@receiver(post_save, sender=Flight)
+def refresh_flight_search_entry(sender, instance, **kwargs):
+    search_index.refresh_flight(instance.id)
+
+
+@receiver(post_save, sender=Route)
+def update_route_search_entries(sender, instance, created, **kwargs):
+    if not created:
+        search_index.update_route(instance.id)
+
+
+@receiver(post_save, sender=Airport)
+def update_airport_search_entries(sender, instance, created, **kwargs):
+    if not created:
+        search_index.update_airport(instance)
+
+
+@receiver(post_save, sender=Airplane)
+def update_airplane_search_entries(sender, instance, created, **kwargs):
+    if not created:
+        search_index.update_airplane(instance)
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def update_itinerary_index(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(itinerary_index.update_flights, instance.id)
+    )
+
+
+@receiver(post_save, sender=Route)
+def invalidate_itinerary_index(sender, created, **kwargs):
+    # Flights of a new route are added as they are saved.
+    if not created:
+        transaction.on_commit(itinerary_index.invalidate)
+
+
+def bump_reference_version(sender, **kwargs):
+    transaction.on_commit(partial(response_cache.bump_version, sender))
+
+
+def bump_reference_m2m_versions(sender, instance, model, **kwargs):
+    for changed_model in {type(instance), model}:
+        transaction.on_commit(
+            partial(response_cache.bump_version, changed_model)
+        )
+
+
+for reference_model in REFERENCE_MODELS:
+    post_save.connect(bump_reference_version, sender=reference_model)
+    post_delete.connect(bump_reference_version, sender=reference_model)
+    for m2m_field in reference_model._meta.many_to_many:
+        m2m_changed.connect(
+            bump_reference_m2m_versions,
+            sender=m2m_field.remote_field.through,
+        )
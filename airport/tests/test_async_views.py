@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import Order, Ticket
+from airport.tests.test_flight_api import sample_flight
+
+ASYNC_FLIGHT_URL = reverse("airport:async-flight-list")
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        sample_flight(
+            route=self.flight.route,
+            airplane=self.flight.airplane,
+            departure_time="2024-01-02T12:30:00Z",
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=1)
+
+    def assert_same_response(self, async_url, sync_url):
+        async_res = self.client.get(async_url)
+        sync_res = self.client.get(sync_url)
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res["Content-Type"], "application/json")
+        self.assertEqual(async_res.content, sync_res.content)
+
+    def test_flight_list_matches_sync_endpoint(self):
+        self.assert_same_response(
+            f"{ASYNC_FLIGHT_URL}?count=true&min_available=1",
+            f"{FLIGHT_URL}?count=true&min_available=1",
+        )
+
+    def test_flight_list_follows_cursor(self):
+        res = self.client.get(ASYNC_FLIGHT_URL, {"page_size": 1})
+        self.assertEqual(len(res.json()["results"]), 1)
+
+        next_page = self.client.get(res.json()["next"])
+
+        self.assertEqual(
+            next_page.json()["results"][0]["id"], self.flight.id
+        )
+        self.assertIsNone(next_page.json()["next"])
+
+    def test_flight_detail_matches_sync_endpoint(self):
+        self.assert_same_response(
+            reverse("airport:async-flight-detail", args=[self.flight.id]),
+            reverse("airport:flight-detail", args=[self.flight.id]),
+        )
+
+    def test_seat_map_matches_sync_endpoint(self):
+        self.assert_same_response(
+            reverse("airport:async-flight-seat-map", args=[self.flight.id]),
+            reverse("airport:flight-seat-map", args=[self.flight.id]),
+        )
+
+    def test_airport_list_matches_sync_endpoint(self):
+        self.assert_same_response(
+            reverse("airport:async-airport-list"),
+            reverse("airport:airport-list"),
+        )
+
+    def test_missing_flight(self):
+        for pk in (0, "abc"):
+            res = self.client.get(
+                reverse("airport:async-flight-detail", args=[pk])
+            )
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(
+                res.json(), {"detail": "No Flight matches the given query."}
+            )
+
+    def test_write_methods_rejected(self):
+        res = self.client.post(ASYNC_FLIGHT_URL, {})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_jwt_authentication(self):
+        client = APIClient()
+
+        res = client.get(ASYNC_FLIGHT_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res)
+
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        res = client.get(ASYNC_FLIGHT_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
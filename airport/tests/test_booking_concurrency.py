@@ -0,0 +1,127 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.booking import (
+    LOCK_NOT_AVAILABLE,
+    LOCK_TIMEOUT_MS,
+    is_lock_timeout,
+)
+from airport.models import Order, Ticket
+from airport.tests.test_flight_api import sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+BUYERS = 8
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("Concurrent writes need a file or server database.")
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.flight = sample_flight()
+
+    def book(self, seats, barrier, results):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = {
+            "tickets": [
+                {"row": row, "seat": seat, "flight": self.flight.id}
+                for row, seat in seats
+            ]
+        }
+        barrier.wait()
+        started = time.monotonic()
+        try:
+            res = client.post(ORDER_URL, payload, format="json")
+            results.append((seats, res, time.monotonic() - started))
+        finally:
+            connection.close()
+
+    def test_concurrent_orders_never_double_book(self):
+        barrier = threading.Barrier(BUYERS)
+        results = []
+        threads = [
+            threading.Thread(
+                target=self.book,
+                args=([(1, buyer % 4 + 1), (2, buyer + 1)], barrier, results),
+            )
+            for buyer in range(BUYERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), BUYERS)
+        booked = []
+        for seats, res, elapsed in results:
+            self.assertIn(
+                res.status_code,
+                (status.HTTP_201_CREATED, status.HTTP_409_CONFLICT),
+            )
+            self.assertLess(elapsed, LOCK_TIMEOUT_MS / 1000 + 5)
+            if res.status_code == status.HTTP_201_CREATED:
+                booked.extend(seats)
+            else:
+                self.assertIn("conflicts", res.data)
+
+        self.assertEqual(len(booked), len(set(booked)))
+        self.assertEqual(
+            sorted(booked),
+            sorted(Ticket.objects.values_list("row", "seat")),
+        )
+        self.assertEqual(Order.objects.count(), len(booked) // 2)
+
+
+class LockTimeoutTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "testpass")
+        )
+        self.flight = sample_flight()
+
+    def lock_timeout(self):
+        if connection.vendor == "postgresql":
+            error = OperationalError("canceling statement due to lock timeout")
+            error.__cause__ = mock.Mock(
+                sqlstate=LOCK_NOT_AVAILABLE, pgcode=LOCK_NOT_AVAILABLE
+            )
+            return error
+        return OperationalError("database is locked")
+
+    def order(self):
+        return self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+
+    def test_lock_timeout_is_a_conflict(self):
+        self.assertTrue(is_lock_timeout(self.lock_timeout()))
+        with mock.patch(
+            "airport.booking.lock_flights", side_effect=self.lock_timeout()
+        ):
+            res = self.order()
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_other_database_errors_are_raised(self):
+        error = OperationalError("server closed the connection unexpectedly")
+
+        self.assertFalse(is_lock_timeout(error))
+        with mock.patch("airport.booking.lock_flights", side_effect=error):
+            with self.assertRaises(OperationalError):
+                self.order()
@@ -0,0 +1,215 @@
+import io
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.crew_roster import DutySchedule
+from airport.models import Airplane, Crew, Flight
+from airport.schedule_import import ScheduleImporter, read_rows
+from airport.tests.test_flight_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+def schedule_url(crew_id):
+    return reverse("airport:crew-schedule", args=[crew_id])
+
+
+class DutyScheduleTests(TestCase):
+    def test_finds_overlapping_intervals(self):
+        schedule = DutySchedule()
+        for start, end, flight_id in ((0, 10, 1), (20, 30, 2), (40, 50, 3)):
+            schedule.add(start, end, flight_id)
+
+        self.assertEqual(schedule.overlapping(25, 45), [3, 2])
+        self.assertEqual(schedule.overlapping(10, 20), [])
+        self.assertEqual(schedule.overlapping(-5, 0), [])
+
+    def test_finds_overlaps_behind_nested_intervals(self):
+        schedule = DutySchedule()
+        schedule.add(0, 100, 1)
+        schedule.add(10, 20, 2)
+
+        self.assertEqual(schedule.overlapping(50, 60), [1])
+
+    def test_unsorted_adds_match_a_linear_scan(self):
+        rng = random.Random(7)
+        schedule = DutySchedule()
+        intervals = []
+        for flight_id in range(500):
+            start = rng.randrange(10_000)
+            end = start + rng.randrange(1, 300)
+            schedule.add(start, end, flight_id)
+            intervals.append((start, end, flight_id))
+
+        for _ in range(200):
+            start = rng.randrange(10_000)
+            end = start + rng.randrange(1, 300)
+            self.assertEqual(
+                sorted(schedule.overlapping(start, end)),
+                sorted(
+                    flight_id
+                    for interval_start, interval_end, flight_id in intervals
+                    if interval_start < end and interval_end > start
+                ),
+            )
+
+
+class CrewRosterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["reference"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        self.crew = Crew.objects.create(first_name="Ann", last_name="Pilot")
+        self.flight = sample_flight(
+            departure_time="2024-06-01T08:00:00Z",
+            arrival_time="2024-06-01T10:00:00Z",
+        )
+        self.flight.crew_members.add(self.crew)
+        # Another airplane, so only the crew can be double-booked.
+        self.airplane = Airplane.objects.create(
+            name="Second airplane",
+            rows=30,
+            seats_in_row=8,
+            airplane_type=self.flight.airplane.airplane_type,
+        )
+
+    def create_flight(self, departure_time, arrival_time):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(FLIGHT_URL, {
+                "route": self.flight.route_id,
+                "airplane": self.airplane.id,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "crew_members": [self.crew.id],
+            })
+
+    def test_overlapping_assignment_rejected(self):
+        response = self.create_flight(
+            "2024-06-01T09:00:00Z", "2024-06-01T11:00:00Z"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["crew_members"],
+            [
+                f"Ann Pilot is already on flight {self.flight.id} "
+                f"at an overlapping time."
+            ],
+        )
+
+    def test_back_to_back_assignments_allowed(self):
+        response = self.create_flight(
+            "2024-06-01T10:00:00Z", "2024-06-01T12:00:00Z"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.create_flight(
+            "2024-06-01T11:00:00Z", "2024-06-01T13:00:00Z"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_assignments_written_without_signals_are_seen(self):
+        other = sample_flight(
+            departure_time="2024-06-02T08:00:00Z",
+            arrival_time="2024-06-02T10:00:00Z",
+        )
+        Flight.crew_members.through.objects.bulk_create([
+            Flight.crew_members.through(flight=other, crew=self.crew)
+        ])
+
+        response = self.create_flight(
+            "2024-06-02T09:00:00Z", "2024-06-02T11:00:00Z"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(other.id), response.data["crew_members"][0])
+
+    def test_import_rejects_overlapping_crew(self):
+        rows = [
+            {
+                "route": self.flight.route_id,
+                "airplane": self.airplane.id,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "crew_members": [self.crew.id],
+            }
+            for departure_time, arrival_time in (
+                ("2024-06-01T09:00:00Z", "2024-06-01T11:00:00Z"),
+                ("2024-06-02T08:00:00Z", "2024-06-02T10:00:00Z"),
+                ("2024-06-02T09:00:00Z", "2024-06-02T11:00:00Z"),
+            )
+        ]
+
+        result = ScheduleImporter(chunk_size=2, skip_invalid=True).run(
+            read_rows(
+                io.StringIO("\n".join(json.dumps(row) for row in rows)),
+                "ndjson",
+            )
+        )
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(
+            [error["line"] for error in result.errors], [1, 3]
+        )
+        self.assertIn(
+            f"already on flight {self.flight.id}",
+            result.errors[0]["errors"]["crew_members"],
+        )
+        self.assertIn(
+            "another flight of this import",
+            result.errors[1]["errors"]["crew_members"],
+        )
+
+    def test_schedule_with_duty_totals(self):
+        sample_flight(
+            departure_time="2024-06-03T08:00:00Z",
+            arrival_time="2024-06-03T11:30:00Z",
+        ).crew_members.add(self.crew)
+        sample_flight(
+            departure_time="2024-07-03T08:00:00Z",
+            arrival_time="2024-07-03T11:30:00Z",
+        ).crew_members.add(self.crew)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                schedule_url(self.crew.id),
+                {"start": "2024-06-01", "end": "2024-06-08"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["flight_count"], 2)
+        self.assertEqual(response.data["duty_hours"], 5.5)
+        self.assertEqual(
+            [flight["id"] for flight in response.data["flights"]],
+            list(
+                Flight.objects.filter(
+                    departure_time__lt="2024-06-08T00:00:00Z"
+                ).order_by("departure_time").values_list("id", flat=True)
+            ),
+        )
+        self.assertEqual(
+            response.data["flights"][0]["route"]["source"], "Test airport"
+        )
+        self.assertEqual(len(queries), 3)
+
+    def test_schedule_rejects_empty_window(self):
+        response = self.client.get(
+            schedule_url(self.crew.id),
+            {"start": "2024-06-08", "end": "2024-06-01"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
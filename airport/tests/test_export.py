@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Crew, Flight, Order, Ticket
+from airport.serializers import (
+    FlightListSerializer,
+    OrderListSerializer,
+    TicketListSerializer,
+)
+from airport.tests.test_flight_api import sample_flight
+
+
+def export_url(dataset):
+    return reverse("airport:export", args=[dataset])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+        self.flight = sample_flight()
+        self.flight.crew_members.add(
+            Crew.objects.create(first_name="First", last_name="Last"),
+            Crew.objects.create(first_name="Second", last_name="Last"),
+        )
+        sample_flight(departure_time="2024-02-01T12:30:00Z")
+        order = Order.objects.create(user=self.admin)
+        Ticket.objects.create(flight=self.flight, order=order, row=2, seat=1)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=3)
+
+    def get_export(self, dataset, **params):
+        res = self.client.get(export_url(dataset), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return b"".join(res.streaming_content).decode()
+
+    def serialized(self, serializer_class, queryset):
+        return json.loads(
+            json.dumps(serializer_class(queryset, many=True).data)
+        )
+
+    def test_ndjson_flights_match_list_serializer(self):
+        content = self.get_export("flights", output="ndjson")
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        flights = Flight.objects.with_tickets_available().order_by("id")
+        self.assertEqual(
+            rows, self.serialized(FlightListSerializer, flights)
+        )
+
+    def test_ndjson_orders_and_tickets_match_list_serializers(self):
+        orders = [
+            json.loads(line)
+            for line in self.get_export("orders").splitlines()
+        ]
+        tickets = [
+            json.loads(line)
+            for line in self.get_export("tickets").splitlines()
+        ]
+
+        expected_orders = self.serialized(
+            OrderListSerializer, Order.objects.all()
+        )
+        expected_tickets = self.serialized(
+            TicketListSerializer, Ticket.objects.order_by("id")
+        )
+        # Nested flights are not annotated with availability in the API.
+        for order in orders:
+            for ticket in order["tickets"]:
+                del ticket["flight"]["tickets_available"]
+        for ticket in tickets:
+            del ticket["flight"]["tickets_available"]
+        self.assertEqual(orders, expected_orders)
+        self.assertEqual(tickets, expected_tickets)
+
+    def test_csv_flights(self):
+        content = self.get_export("flights", output="csv")
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["route.source"], "Test airport")
+        self.assertEqual(
+            json.loads(rows[0]["crew_members"]),
+            ["First Last", "Second Last"],
+        )
+        self.assertEqual(rows[0]["tickets_available"], "238")
+
+    def test_unknown_dataset_and_format(self):
+        res1 = self.client.get(export_url("airports"))
+        res2 = self.client.get(export_url("flights"), {"output": "xml"})
+
+        self.assertEqual(res1.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_admin_only(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "testpass")
+        )
+
+        res = self.client.get(export_url("flights"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        out = io.StringIO()
+
+        call_command(
+            "export_airport_data",
+            "tickets",
+            "--output-format=csv",
+            "--chunk-size=1",
+            stdout=out,
+        )
+
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(
+            [(row["row"], row["seat"]) for row in rows],
+            [("2", "1"), ("1", "3")],
+        )
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Crew, Order, Ticket
+from airport.tests.test_flight_api import FLIGHT_URL, sample_flight
+from airport.tests.test_order_api import ORDER_URL
+
+ROUTE_URL = reverse("airport:route-list")
+AIRPLANE_URL = reverse("airport:airplane-list")
+
+
+class FastListSerializerTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+        crew = [
+            Crew.objects.create(first_name=f"First {index}", last_name="Last")
+            for index in range(3)
+        ]
+        for index in range(4):
+            flight = sample_flight(
+                departure_time=f"2024-01-0{index + 1}T12:30:00.123456Z"
+            )
+            flight.crew_members.add(*crew[index % 2:])
+            order = Order.objects.create(user=self.user)
+            for seat in range(1, index + 2):
+                Ticket.objects.create(
+                    flight=flight, order=order, row=2, seat=seat
+                )
+            Ticket.objects.create(flight=flight, order=order, row=1, seat=8)
+
+    def get_content(self, url, params=None, fast=False):
+        for cache in caches.all():
+            cache.clear()
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.content
+
+    def assertSameContent(self, url, params=None):
+        content = self.get_content(url, params)
+        self.assertEqual(self.get_content(url, params, fast=True), content)
+        return content
+
+    def test_flight_list(self):
+        self.assertSameContent(FLIGHT_URL)
+        self.assertSameContent(
+            FLIGHT_URL, {"ordering": "tickets_available", "page_size": 2}
+        )
+
+    def test_flight_list_next_page(self):
+        res = self.client.get(FLIGHT_URL, {"page_size": 2})
+
+        self.assertSameContent(res.data["next"])
+
+    def test_flight_crew_ordered_by_id(self):
+        flight = sample_flight(departure_time="2024-02-01T12:30:00Z")
+        crew = [
+            Crew.objects.create(first_name=name, last_name="Crew")
+            for name in ("Ann", "Bob")
+        ]
+        flight.crew_members.add(crew[1])
+        flight.crew_members.add(crew[0])
+
+        for fast in (False, True):
+            with override_settings(FAST_LIST_SERIALIZERS=fast):
+                res = self.client.get(FLIGHT_URL, {"page_size": 1})
+            self.assertEqual(
+                res.data["results"][0]["crew_members"],
+                ["Ann Crew", "Bob Crew"],
+            )
+
+    def test_route_list(self):
+        self.assertSameContent(ROUTE_URL)
+
+    def test_airplane_list(self):
+        self.assertSameContent(AIRPLANE_URL)
+
+    def test_order_list(self):
+        self.assertSameContent(ORDER_URL)
+        self.assertSameContent(ORDER_URL, {"page_size": 2, "count": "true"})
@@ -0,0 +1,244 @@
+import io
+import json
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from airport.fleet import overlapping_flights
+from airport.models import Airplane, Crew, Flight
+from airport.schedule_import import ScheduleImporter, read_rows
+from airport.serializers import FlightSerializer
+from airport.tests.test_flight_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+UTILIZATION_URL = reverse("airport:airplane-utilization")
+
+
+def at(hour, minute=0, day=1):
+    return datetime(2024, 6, day, hour, minute, tzinfo=timezone.utc)
+
+
+class FleetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["reference"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        self.flight = sample_flight(
+            departure_time="2024-06-01T08:00:00Z",
+            arrival_time="2024-06-01T10:00:00Z",
+        )
+        self.airplane = self.flight.airplane
+
+    def add_flight(self, departure_time, arrival_time, airplane=None):
+        return Flight.objects.create(
+            route_id=self.flight.route_id,
+            airplane=airplane or self.airplane,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        )
+
+
+class AirplaneOverlapTests(FleetTestCase):
+    def create_flight(self, departure_time, arrival_time):
+        crew = Crew.objects.create(first_name="Bob", last_name="Pilot")
+        return self.client.post(FLIGHT_URL, {
+            "route": self.flight.route_id,
+            "airplane": self.airplane.id,
+            "departure_time": departure_time,
+            "arrival_time": arrival_time,
+            "crew_members": [crew.id],
+        })
+
+    def test_overlapping_flight_rejected(self):
+        response = self.create_flight(
+            "2024-06-01T09:00:00Z", "2024-06-01T11:00:00Z"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["airplane"],
+            [
+                f"test airplane is already on flight {self.flight.id} "
+                f"at an overlapping time."
+            ],
+        )
+
+    def test_back_to_back_flights_allowed(self):
+        response = self.create_flight(
+            "2024-06-01T10:00:00Z", "2024-06-01T12:00:00Z"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_finds_flight_departing_before_range(self):
+        earlier = self.add_flight(at(4), at(7))
+
+        self.assertEqual(
+            overlapping_flights(self.airplane.id, at(9), at(9, 30)),
+            [self.flight.id],
+        )
+        self.assertEqual(
+            overlapping_flights(self.airplane.id, at(6, 30), at(6, 45)),
+            [earlier.id],
+        )
+        self.assertEqual(
+            overlapping_flights(self.airplane.id, at(7), at(8)), []
+        )
+
+    def test_flights_longer_than_the_lookback_rejected(self):
+        response = self.create_flight(
+            "2024-06-02T10:00:00Z", "2024-06-04T10:30:00Z"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_time", response.data)
+
+        row = {
+            "route": self.flight.route_id,
+            "airplane": self.airplane.id,
+            "departure_time": "2024-06-02T10:00:00Z",
+            "arrival_time": "2024-06-04T10:30:00Z",
+        }
+        result = ScheduleImporter(skip_invalid=True).run(
+            read_rows(io.StringIO(json.dumps(row)), "ndjson")
+        )
+        self.assertIn("arrival_time", result.errors[0]["errors"])
+
+    def test_finds_flight_behind_shorter_ones(self):
+        long_flight = self.add_flight(at(12), at(23))
+        self.add_flight(at(13), at(14))
+
+        self.assertEqual(
+            overlapping_flights(self.airplane.id, at(15), at(16)),
+            [long_flight.id],
+        )
+
+    def test_update_checks_other_flights_only(self):
+        self.add_flight(at(4), at(7))
+
+        serializer = FlightSerializer(
+            self.flight,
+            data={"departure_time": at(8, 30), "arrival_time": at(10, 30)},
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        serializer = FlightSerializer(
+            self.flight, data={"departure_time": at(6)}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+
+    def test_import_rejects_overlapping_flights(self):
+        rows = [
+            {
+                "route": self.flight.route_id,
+                "airplane": self.airplane.id,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+            }
+            for departure_time, arrival_time in (
+                ("2024-06-01T09:00:00Z", "2024-06-01T11:00:00Z"),
+                ("2024-06-01T12:00:00Z", "2024-06-01T14:00:00Z"),
+                ("2024-06-01T13:00:00Z", "2024-06-01T15:00:00Z"),
+            )
+        ]
+
+        result = ScheduleImporter(skip_invalid=True).run(read_rows(
+            io.StringIO("\n".join(json.dumps(row) for row in rows)),
+            "ndjson",
+        ))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(
+            [error["line"] for error in result.errors], [1, 3]
+        )
+        self.assertIn(
+            f"already on flight {self.flight.id}",
+            result.errors[0]["errors"]["airplane"],
+        )
+        self.assertIn(
+            "another flight of this import",
+            result.errors[1]["errors"]["airplane"],
+        )
+
+    def test_import_finds_flight_behind_shorter_ones(self):
+        long_flight = self.add_flight(at(12), at(23))
+        self.add_flight(at(13), at(14))
+        row = {
+            "route": self.flight.route_id,
+            "airplane": self.airplane.id,
+            "departure_time": "2024-06-01T15:00:00Z",
+            "arrival_time": "2024-06-01T16:00:00Z",
+        }
+
+        result = ScheduleImporter(skip_invalid=True).run(
+            read_rows(io.StringIO(json.dumps(row)), "ndjson")
+        )
+
+        self.assertEqual(result.created, 0)
+        self.assertIn(
+            f"already on flight {long_flight.id}",
+            result.errors[0]["errors"]["airplane"],
+        )
+
+
+class FleetUtilizationTests(FleetTestCase):
+    def test_hours_flown_and_idle_gaps(self):
+        self.add_flight(at(12), at(13, 30))
+        self.add_flight(at(23), at(1, day=2))
+        self.add_flight(at(8, day=3), at(9, day=3))
+        idle = Airplane.objects.create(
+            name="Idle airplane",
+            rows=10,
+            seats_in_row=4,
+            airplane_type=self.airplane.airplane_type,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                UTILIZATION_URL, {"start": "2024-06-01", "end": "2024-06-02"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        busy, idle_row = response.data["airplanes"]
+        self.assertEqual(busy["id"], self.airplane.id)
+        self.assertEqual(busy["flight_count"], 3)
+        self.assertEqual(busy["hours_flown"], 4.5)
+        self.assertEqual(busy["idle_hours"], 19.5)
+        self.assertEqual(busy["utilization"], 0.1875)
+        self.assertEqual(
+            [(gap["start"], gap["end"]) for gap in busy["gaps"]],
+            [
+                ("2024-06-01T00:00:00Z", "2024-06-01T08:00:00Z"),
+                ("2024-06-01T10:00:00Z", "2024-06-01T12:00:00Z"),
+                ("2024-06-01T13:30:00Z", "2024-06-01T23:00:00Z"),
+            ],
+        )
+        self.assertEqual(idle_row["id"], idle.id)
+        self.assertEqual(idle_row["flight_count"], 0)
+        self.assertEqual(idle_row["hours_flown"], 0)
+        self.assertEqual(idle_row["idle_hours"], 24)
+        self.assertEqual(len(queries), 2)
+
+    def test_rejects_empty_window(self):
+        response = self.client.get(
+            UTILIZATION_URL, {"start": "2024-06-08", "end": "2024-06-01"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
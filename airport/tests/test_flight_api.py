@@ -1,4 +1,4 @@
-from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 
@@ -11,7 +11,9 @@ from airport.models import (
     Airplane,
     AirplaneType,
     Crew,
-    Flight
+    Flight,
+    Order,
+    Ticket
 )
 from airport.serializers import FlightListSerializer, FlightDetailSerializer
 
@@ -60,6 +62,10 @@ def sample_flight(**params):
     return Flight.objects.create(**defaults)
 
 
+def with_tickets_available(flight):
+    return Flight.objects.with_tickets_available().get(id=flight.id)
+
+
 def detail_url(flight_id):
     return reverse("airport:flight-detail", args=[flight_id])
 
@@ -76,7 +82,7 @@ class UnauthenticatedFlightApiTests(TestCase):
 class AuthenticatedFlightApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
-        self.user = settings.AUTH_USER_MODEL.objects.create_user(
+        self.user = get_user_model().objects.create_user(
             "test@test.com",
             "testpass",
         )
@@ -88,11 +94,13 @@ class AuthenticatedFlightApiTests(TestCase):
 
         res = self.client.get(FLIGHT_URL)
 
-        flights = Flight.objects.all()
+        flights = Flight.objects.with_tickets_available().order_by(
+            "-departure_time", "-id"
+        )
         serializer = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_flights_by_route(self):
         route1 = sample_route(source=sample_airport(name="airport 1"))
@@ -104,11 +112,15 @@ class AuthenticatedFlightApiTests(TestCase):
             FLIGHT_URL, {"route": f"{route1.id}"}
         )
 
-        serializer1 = FlightListSerializer(flight1)
-        serializer2 = FlightListSerializer(flight2)
+        serializer1 = FlightListSerializer(
+            with_tickets_available(flight1)
+        )
+        serializer2 = FlightListSerializer(
+            with_tickets_available(flight2)
+        )
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_filter_flights_by_date(self):
         flight1 = sample_flight(departure_time="2024-11-11T11:11:00Z", arrival_time="2024-12-12T12:12:00Z")
@@ -122,13 +134,70 @@ class AuthenticatedFlightApiTests(TestCase):
             FLIGHT_URL, {"arrival_date": "2024-06-06"}
         )
 
-        serializer1 = FlightListSerializer(flight1)
-        serializer2 = FlightListSerializer(flight2)
-        serializer3 = FlightListSerializer(flight3)
+        serializer1 = FlightListSerializer(
+            with_tickets_available(flight1)
+        )
+        serializer2 = FlightListSerializer(
+            with_tickets_available(flight2)
+        )
+        serializer3 = FlightListSerializer(
+            with_tickets_available(flight3)
+        )
 
-        self.assertIn(serializer1.data, res1.data)
-        self.assertIn(serializer2.data, res2.data)
-        self.assertNotIn(serializer3.data, res2.data)
+        self.assertIn(serializer1.data, res1.data["results"])
+        self.assertIn(serializer2.data, res2.data["results"])
+        self.assertNotIn(serializer3.data, res2.data["results"])
+
+    def test_list_flights_with_tickets_available(self):
+        flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=flight, order=order, row=1, seat=1)
+        Ticket.objects.create(flight=flight, order=order, row=1, seat=2)
+
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.data["results"][0]["capacity"], 240)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 238)
+
+    def test_filter_and_order_flights_by_tickets_available(self):
+        full_flight = sample_flight()
+        empty_flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        for row in range(1, 31):
+            for seat in range(1, 9):
+                Ticket.objects.create(
+                    flight=full_flight, order=order, row=row, seat=seat
+                )
+
+        res1 = self.client.get(FLIGHT_URL, {"min_available": 1})
+        res2 = self.client.get(FLIGHT_URL, {"ordering": "tickets_available"})
+
+        self.assertEqual(
+            [flight["id"] for flight in res1.data["results"]],
+            [empty_flight.id],
+        )
+        self.assertEqual(
+            [flight["id"] for flight in res2.data["results"]],
+            [full_flight.id, empty_flight.id],
+        )
+
+    def test_invalid_min_available_rejected(self):
+        for value in ("x", "-1"):
+            res = self.client.get(FLIGHT_URL, {"min_available": value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("min_available", res.data)
+
+    def test_invalid_filters_rejected(self):
+        for param, value in (
+            ("departure_date", "2024-13-45"),
+            ("arrival_date", "tomorrow"),
+            ("route", "x"),
+        ):
+            res = self.client.get(FLIGHT_URL, {param: value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(param, res.data)
 
     def test_retrieve_flight_detail(self):
         flight = sample_flight()
@@ -136,7 +205,9 @@ class AuthenticatedFlightApiTests(TestCase):
         url = detail_url(flight.id)
         res = self.client.get(url)
 
-        serializer = FlightDetailSerializer(flight)
+        serializer = FlightDetailSerializer(
+            with_tickets_available(flight)
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
@@ -162,7 +233,7 @@ class AuthenticatedFlightApiTests(TestCase):
 class AdminFlightApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
-        self.user = settings.AUTH_USER_MODEL.objects.create_user(
+        self.user = get_user_model().objects.create_user(
             "admin@admin.com", "testpass", is_staff=True
         )
         self.client.force_authenticate(self.user)
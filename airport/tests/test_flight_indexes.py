@@ -0,0 +1,90 @@
+import os
+
+from django.db import connection
+from django.test import TestCase
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airport.models import Flight
+from airport.tests.test_flight_api import sample_flight
+from airport.views import FlightViewSet
+
+SEEDED_FLIGHTS = int(os.environ.get("EXPLAIN_TEST_FLIGHTS", 1_000_000))
+
+SQLITE_SEED = """
+    WITH RECURSIVE seq(n) AS (
+        SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s
+    )
+    INSERT INTO airport_flight
+        (route_id, airplane_id, departure_time, arrival_time)
+    SELECT
+        %s,
+        %s,
+        datetime('2020-01-01', '+' || (n * 7) || ' minutes'),
+        datetime('2020-01-01', '+' || (n * 7 + 90) || ' minutes')
+    FROM seq
+"""
+
+POSTGRESQL_SEED = """
+    INSERT INTO airport_flight
+        (route_id, airplane_id, departure_time, arrival_time)
+    SELECT
+        %s,
+        %s,
+        timestamptz '2020-01-01' + n * interval '7 minutes',
+        timestamptz '2020-01-01' + (n * 7 + 90) * interval '1 minute'
+    FROM generate_series(1, %s) AS n
+"""
+
+
+class FlightSearchIndexUsageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        flight = sample_flight()
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    POSTGRESQL_SEED,
+                    [flight.route_id, flight.airplane_id, SEEDED_FLIGHTS],
+                )
+                cursor.execute("ANALYZE airport_flight")
+            else:
+                cursor.execute(
+                    SQLITE_SEED,
+                    [SEEDED_FLIGHTS, flight.route_id, flight.airplane_id],
+                )
+                cursor.execute("ANALYZE")
+        cls.route_id = flight.route_id
+
+    def get_plan(self, params):
+        request = Request(APIRequestFactory().get("/", params))
+        view = FlightViewSet(action="list", request=request, format_kwarg=None)
+        return view.get_queryset().explain()
+
+    def assertNoFlightTableScan(self, params):
+        plan = self.get_plan(params)
+        table = Flight._meta.db_table
+
+        if connection.vendor == "postgresql":
+            self.assertNotIn(f"Seq Scan on {table}", plan)
+        else:
+            self.assertFalse(
+                any(
+                    line.strip().endswith(f"SCAN {table}")
+                    for line in plan.splitlines()
+                ),
+                plan,
+            )
+            self.assertIn(f"SEARCH {table} USING", plan)
+
+    def test_departure_date_filter_uses_index(self):
+        self.assertNoFlightTableScan({"departure_date": "2024-03-03"})
+
+    def test_arrival_date_filter_uses_index(self):
+        self.assertNoFlightTableScan({"arrival_date": "2024-03-03"})
+
+    def test_route_and_departure_date_filter_uses_index(self):
+        self.assertNoFlightTableScan(
+            {"route": self.route_id, "departure_date": "2024-03-03"}
+        )
@@ -0,0 +1,160 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport import search_index
+from airport.models import FlightSearchIndex, Order, Ticket
+from airport.tests.test_flight_api import sample_airport, sample_flight
+from airport.tests.test_order_api import ORDER_URL, tickets_payload
+
+FLIGHT_SEARCH_URL = reverse("airport:flight-search-list")
+
+
+class FlightSearchIndexTests(TestCase):
+    def setUp(self):
+        self.flight = sample_flight()
+
+    def get_entry(self):
+        return FlightSearchIndex.objects.get(flight=self.flight)
+
+    def test_entry_is_created_with_flight(self):
+        entry = self.get_entry()
+
+        self.assertEqual(entry.source_city, "Test city")
+        self.assertEqual(entry.destination_city, "City 2")
+        self.assertEqual(str(entry.departure_date), "2024-01-01")
+        self.assertEqual(entry.capacity, 240)
+        self.assertEqual(entry.tickets_available, 240)
+
+    def test_tickets_update_sold_count(self):
+        order = Order.objects.create(
+            user=get_user_model().objects.create_user("a@a.com", "pass")
+        )
+        ticket = Ticket.objects.create(
+            flight=self.flight, order=order, row=1, seat=1
+        )
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+        self.assertEqual(self.get_entry().tickets_sold, 2)
+
+        ticket.delete()
+        self.assertEqual(self.get_entry().tickets_sold, 1)
+
+    def test_reference_changes_are_propagated(self):
+        source = self.flight.route.source
+        source.closest_big_city = "New city"
+        source.save()
+
+        airplane = self.flight.airplane
+        airplane.rows = 10
+        airplane.save()
+
+        route = self.flight.route
+        route.destination = sample_airport(
+            name="Airport 3", closest_big_city="City 3"
+        )
+        route.save()
+
+        entry = self.get_entry()
+        self.assertEqual(entry.source_city, "New city")
+        self.assertEqual(entry.destination_city, "City 3")
+        self.assertEqual(entry.capacity, 80)
+
+    def test_flight_delete_removes_entry(self):
+        self.flight.delete()
+
+        self.assertFalse(FlightSearchIndex.objects.exists())
+
+    def test_rebuild_command(self):
+        FlightSearchIndex.objects.all().delete()
+
+        call_command("rebuild_flight_search_index", stdout=None)
+
+        self.assertEqual(self.get_entry().capacity, 240)
+
+    def test_failed_rebuild_keeps_entries(self):
+        with mock.patch.object(
+                search_index, "refresh_flights", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                search_index.rebuild()
+
+        self.assertEqual(self.get_entry().capacity, 240)
+
+
+class FlightSearchApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.other_flight = sample_flight(
+            departure_time="2024-01-02T12:30:00Z"
+        )
+
+    def search(self, **params):
+        res = self.client.get(FLIGHT_SEARCH_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [entry["flight"] for entry in res.data["results"]]
+
+    def test_search_by_cities_and_date(self):
+        self.assertEqual(
+            self.search(
+                source_city="Test city",
+                destination_city="City 2",
+                departure_date="2024-01-01",
+            ),
+            [self.flight.id],
+        )
+        self.assertEqual(self.search(source_city="City 2"), [])
+
+    def test_search_reads_only_index_table(self):
+        with CaptureQueriesContext(connection) as context:
+            self.search(source_city="Test city", departure_date="2024-01-01")
+
+        sql = " ".join(query["sql"] for query in context.captured_queries)
+        self.assertIn(FlightSearchIndex._meta.db_table, sql)
+        self.assertNotIn('"airport_flight"', sql)
+        self.assertNotIn('"airport_airport"', sql)
+
+    def test_booked_tickets_reduce_availability(self):
+        self.client.post(
+            ORDER_URL,
+            {"tickets": tickets_payload(self.flight, 240)},
+            format="json",
+        )
+
+        res = self.client.get(FLIGHT_SEARCH_URL)
+        availability = {
+            entry["flight"]: entry["tickets_available"]
+            for entry in res.data["results"]
+        }
+        self.assertEqual(
+            availability, {self.flight.id: 0, self.other_flight.id: 240}
+        )
+        self.assertEqual(self.search(min_available=1), [self.other_flight.id])
+
+    def test_invalid_min_available_rejected(self):
+        res = self.client.get(FLIGHT_SEARCH_URL, {"min_available": "x"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_departure_date_rejected(self):
+        res = self.client.get(
+            FLIGHT_SEARCH_URL, {"departure_date": "2024-13-45"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("departure_date", res.data)
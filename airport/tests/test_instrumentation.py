@@ -0,0 +1,141 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from airport.instrumentation import (
+    QueryBudgetExceeded,
+    RequestMetrics,
+    fingerprint,
+    registry,
+)
+from airport.models import Order, Ticket
+from airport.tests.test_query_count import sample_flight_with_crew
+from user.tokens import AccessToken
+
+FLIGHT_URL = reverse("airport:flight-list")
+METRICS_URL = reverse("metrics")
+
+
+class FingerprintTests(TestCase):
+    def test_repeated_queries_share_a_fingerprint(self):
+        metrics = RequestMetrics()
+        for flight_id in (1, 2, 3):
+            metrics.add_query(
+                f'SELECT * FROM "airport_ticket" WHERE "flight_id" = '
+                f"{flight_id} LIMIT 21",
+                0.001,
+            )
+        metrics.add_query("SELECT 1", 0.001)
+
+        self.assertEqual(metrics.query_count, 4)
+        self.assertEqual(metrics.duplicate_count, 2)
+
+    def test_in_lists_collapse(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s)'),
+        )
+
+
+@override_settings(REQUEST_METRICS=True, QUERY_BUDGET_STRICT=True)
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.flight = sample_flight_with_crew()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=1)
+
+    def test_server_timing_header(self):
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        timing = res["Server-Timing"]
+        for metric in ("db;dur=", "serialize;dur=", "render;dur=", "total"):
+            self.assertIn(metric, timing)
+        self.assertIn('desc="2 queries"', timing)
+
+    def test_serializer_time_excludes_sql(self):
+        data = serializers.BaseSerializer.data
+
+        self.client.get(FLIGHT_URL)
+
+        self.assertIs(serializers.BaseSerializer.data, data)
+        match = re.search(
+            r'airport_serializer_seconds_total\{view="airport:flight-list"\} '
+            r"(\S+)",
+            registry.export(),
+        )
+        self.assertGreater(float(match[1]), 0)
+
+    def test_async_views_are_instrumented(self):
+        res = self.client.get(reverse("airport:async-flight-list"))
+
+        self.assertIn('desc="2 queries"', res["Server-Timing"])
+
+    def test_budgeted_views_stay_within_budget(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_flight_with_crew()
+        detail_views = ("airport:flight-detail", "airport:flight-seat-map")
+        for view_name in settings.QUERY_BUDGETS:
+            args = [self.flight.id] if view_name in detail_views else []
+            res = self.client.get(reverse(view_name, args=args))
+            self.assertEqual(res.status_code, status.HTTP_200_OK, view_name)
+
+    def test_exceeding_the_budget_fails(self):
+        with override_settings(QUERY_BUDGETS={"airport:flight-list": 1}):
+            with self.assertRaisesMessage(
+                QueryBudgetExceeded, "ran 2 queries, budget is 1"
+            ):
+                self.client.get(FLIGHT_URL)
+
+    def test_metrics_endpoint(self):
+        self.client.get(FLIGHT_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            'airport_http_requests_total{view="airport:flight-list",'
+            'method="GET",status="200"} 1\n',
+            res.content.decode(),
+        )
+        self.assertIn(
+            'airport_db_queries_total{view="airport:flight-list"} 2\n',
+            res.content.decode(),
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_endpoint_token(self):
+        self.assertEqual(
+            self.client.get(METRICS_URL).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer secret")
+        res = client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(REQUEST_METRICS=False)
+    def test_disabled(self):
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertNotIn("Server-Timing", res)
+        self.assertEqual(
+            self.client.get(METRICS_URL).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
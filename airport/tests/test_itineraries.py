@@ -0,0 +1,196 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.itineraries import (
+    SEQUENCE_KEY,
+    itinerary_index,
+    record_change,
+)
+from airport.models import Airplane, AirplaneType, Flight, Route
+from airport.response_cache import get_cache
+from airport.tests.test_flight_api import sample_airport
+
+ITINERARY_URL = reverse("airport:flight-itineraries")
+DAY = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def at(hours):
+    return DAY + timedelta(hours=hours)
+
+
+class ItinerarySearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        itinerary_index.invalidate()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.airports = {
+            code: sample_airport(name=code) for code in ("A", "B", "C", "D")
+        }
+        self.airplane = Airplane.objects.create(
+            name="test airplane",
+            rows=30,
+            seats_in_row=8,
+            airplane_type=AirplaneType.objects.create(name="test type"),
+        )
+
+    def flight(self, source, destination, departure, arrival):
+        route, _ = Route.objects.get_or_create(
+            source=self.airports[source],
+            destination=self.airports[destination],
+            defaults={"distance": 1000},
+        )
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=at(departure),
+            arrival_time=at(arrival),
+        )
+
+    def search(self, source, destination, **params):
+        res = self.client.get(
+            ITINERARY_URL,
+            {
+                "source": self.airports[source].id,
+                "destination": self.airports[destination].id,
+                "departure_date": "2024-05-01",
+                **params,
+            },
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [
+            [flight["id"] for flight in itinerary["flights"]]
+            for itinerary in res.data
+        ]
+
+    def test_direct_and_connecting_itineraries(self):
+        direct = self.flight("A", "C", 8, 14)
+        first_leg = self.flight("A", "B", 6, 8)
+        second_leg = self.flight("B", "C", 9, 12)
+
+        self.assertEqual(
+            self.search("A", "C"),
+            [[first_leg.id, second_leg.id], [direct.id]],
+        )
+        self.assertEqual(self.search("A", "C", max_stops=0), [[direct.id]])
+
+    def test_minimum_connection_time_is_respected(self):
+        self.flight("A", "B", 6, 8)
+        self.flight("B", "C", 8.5, 12)
+
+        self.assertEqual(self.search("A", "C"), [])
+        self.assertEqual(len(self.search("A", "C", min_connection=30)), 1)
+
+    def test_two_stop_itinerary(self):
+        legs = [
+            self.flight("A", "B", 6, 8),
+            self.flight("B", "C", 9, 11),
+            self.flight("C", "D", 12, 14),
+        ]
+
+        self.assertEqual(self.search("A", "D"), [])
+        self.assertEqual(
+            self.search("A", "D", max_stops=2),
+            [[leg.id for leg in legs]],
+        )
+
+    def test_dominated_itineraries_are_dropped(self):
+        self.flight("A", "C", 6, 16)
+        better = self.flight("A", "C", 7, 12)
+
+        self.assertEqual(self.search("A", "C"), [[better.id]])
+
+    def test_later_arrival_keeps_its_connection_window(self):
+        self.flight("A", "B", 6, 8)
+        later = self.flight("A", "B", 6, 10)
+        connection = self.flight("B", "C", 11.5, 13)
+
+        self.assertEqual(
+            self.search("A", "C", max_connection=120),
+            [[later.id, connection.id]],
+        )
+
+    def test_itinerary_response(self):
+        first_leg = self.flight("A", "B", 6, 8)
+        self.flight("B", "C", 9, 12)
+
+        res = self.client.get(
+            ITINERARY_URL,
+            {
+                "source": self.airports["A"].id,
+                "destination": self.airports["C"].id,
+                "departure_date": "2024-05-01",
+            },
+        )
+
+        itinerary = res.data[0]
+        self.assertEqual(itinerary["stops"], 1)
+        self.assertEqual(itinerary["departure_time"], "2024-05-01T06:00:00Z")
+        self.assertEqual(itinerary["arrival_time"], "2024-05-01T12:00:00Z")
+        self.assertEqual(itinerary["flights"][0]["id"], first_leg.id)
+        self.assertEqual(itinerary["flights"][0]["tickets_available"], 240)
+
+    def test_index_follows_flight_writes(self):
+        self.flight("A", "B", 6, 8)
+        self.assertEqual(self.search("A", "C"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second_leg = self.flight("B", "C", 9, 12)
+        self.assertEqual(len(self.search("A", "C")), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second_leg.delete()
+        self.assertEqual(self.search("A", "C"), [])
+
+    def test_index_follows_writes_of_other_processes(self):
+        self.flight("A", "B", 6, 8)
+        self.assertEqual(self.search("A", "C"), [])
+
+        # Committed by another worker: only the shared change log moves.
+        second_leg = self.flight("B", "C", 9, 12)
+        self.assertEqual(self.search("A", "C"), [])
+        record_change([second_leg.id])
+
+        self.assertEqual(len(self.search("A", "C")), 1)
+
+    def test_flight_changes_are_replayed_without_a_rebuild(self):
+        first_leg = self.flight("A", "B", 6, 8)
+        self.search("A", "C")
+        second_leg = self.flight("B", "C", 9, 12)
+        record_change([second_leg.id])
+        first_leg.delete()
+        record_change([first_leg.id])
+
+        with self.assertNumQueries(1):
+            journeys = itinerary_index.search(
+                self.airports["B"].id,
+                self.airports["C"].id,
+                at(0),
+                at(24),
+            )
+
+        self.assertEqual(journeys, [(second_leg.id,)])
+        self.assertEqual(self.search("A", "C"), [])
+
+    def test_lost_change_rebuilds_the_index(self):
+        self.flight("A", "B", 6, 8)
+        self.search("A", "C")
+        self.flight("B", "C", 9, 12)
+        get_cache().incr(SEQUENCE_KEY)
+
+        with mock.patch("airport.itineraries.CHANGE_GRACE", 0):
+            self.assertEqual(self.search("A", "C"), [])
+            self.assertEqual(len(self.search("A", "C")), 1)
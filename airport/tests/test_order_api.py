@@ -0,0 +1,186 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.eager_loading import get_eager_loading_plan
+from airport.models import Crew, Order, Ticket
+from airport.serializers import OrderListSerializer
+from airport.tests.test_flight_api import sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def tickets_payload(flight, count, start_row=1):
+    return [
+        {
+            "row": start_row + index // 8,
+            "seat": index % 8 + 1,
+            "flight": flight.id,
+        }
+        for index in range(count)
+    ]
+
+
+class OrderApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def create_order(self, tickets):
+        return self.client.post(
+            ORDER_URL, {"tickets": tickets}, format="json"
+        )
+
+    def test_create_order(self):
+        res = self.create_order(tickets_payload(self.flight, 3))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.tickets.count(), 3)
+        self.assertEqual(
+            res.data["tickets"][0],
+            {
+                "id": order.tickets.first().id,
+                "row": 1,
+                "seat": 1,
+                "flight": self.flight.id,
+            },
+        )
+
+    def test_order_query_count_does_not_depend_on_ticket_count(self):
+        with CaptureQueriesContext(connection) as small_order:
+            self.create_order(tickets_payload(self.flight, 1))
+        with CaptureQueriesContext(connection) as large_order:
+            self.create_order(
+                tickets_payload(self.flight, 60, start_row=2)
+            )
+
+        self.assertEqual(
+            len(small_order.captured_queries),
+            len(large_order.captured_queries),
+        )
+        self.assertEqual(Ticket.objects.count(), 61)
+
+    def test_seat_out_of_range_rejected(self):
+        res = self.create_order(
+            [{"row": 31, "seat": 1, "flight": self.flight.id}]
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["tickets"][0])
+        self.assertFalse(Order.objects.exists())
+
+    def test_unknown_flight_rejected(self):
+        res = self.create_order([{"row": 1, "seat": 1, "flight": 0}])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("flight", res.data["tickets"][0])
+
+    def test_repeated_seat_in_order_rejected(self):
+        res = self.create_order(
+            tickets_payload(self.flight, 1) * 2
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_taken_seat_rejected(self):
+        self.create_order(tickets_payload(self.flight, 1))
+
+        res = self.create_order(tickets_payload(self.flight, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["conflicts"],
+            [{"flight": self.flight.id, "row": 1, "seat": 1}],
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertEqual(Order.objects.count(), 1)
+
+
+class OrderListQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_orders(self, order_count, tickets_per_order):
+        for _ in range(order_count):
+            order = Order.objects.create(user=self.user)
+            flight = sample_flight()
+            flight.crew_members.add(
+                Crew.objects.create(first_name="First", last_name="Last")
+            )
+            Ticket.objects.bulk_create(
+                Ticket(
+                    flight=flight,
+                    order=order,
+                    row=ticket["row"],
+                    seat=ticket["seat"],
+                )
+                for ticket in tickets_payload(flight, tickets_per_order)
+            )
+
+    def list_orders(self):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(ORDER_URL, {"page_size": 10})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, len(context.captured_queries)
+
+    def test_order_list_plan_matches_serializer(self):
+        plan = get_eager_loading_plan(OrderListSerializer)
+
+        self.assertEqual(plan.select_related, [])
+        [(lookup, tickets_plan)] = plan.prefetches
+        self.assertEqual(lookup, "tickets")
+        self.assertEqual(
+            set(tickets_plan.select_related),
+            {
+                "flight",
+                "flight__route",
+                "flight__route__source",
+                "flight__route__destination",
+                "flight__airplane",
+            },
+        )
+        self.assertEqual(
+            [lookup for lookup, _ in tickets_plan.prefetches],
+            ["flight__crew_members"],
+        )
+
+    def test_order_list_query_count_is_constant(self):
+        self.create_orders(1, 1)
+        _, queries_for_one = self.list_orders()
+
+        self.create_orders(10, 20)
+        res, queries_for_page = self.list_orders()
+
+        self.assertEqual(len(res.data["results"]), 10)
+        self.assertTrue(
+            all(len(order["tickets"]) == 20 for order in res.data["results"])
+        )
+        self.assertEqual(
+            res.data["results"][0]["tickets"][0]["flight"]["crew_members"],
+            ["First Last"],
+        )
+        self.assertEqual(queries_for_page, queries_for_one)
+        self.assertEqual(queries_for_page, 3)
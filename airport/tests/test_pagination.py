@@ -0,0 +1,94 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Order
+from airport.tests.test_flight_api import FLIGHT_URL, sample_flight
+from airport.tests.test_order_api import ORDER_URL
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def collect_pages(self, url, params):
+        ids = []
+        res = self.client.get(url, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                return ids
+            res = self.client.get(res.data["next"])
+
+    def test_flights_are_paged_by_departure_time_and_id(self):
+        flights = [
+            sample_flight(departure_time=f"2024-01-0{day}T12:00:00Z")
+            for day in (1, 2, 2, 2, 3)
+        ]
+
+        ids = self.collect_pages(FLIGHT_URL, {"page_size": 2})
+
+        self.assertEqual(
+            ids,
+            [
+                flights[4].id,
+                flights[3].id,
+                flights[2].id,
+                flights[1].id,
+                flights[0].id,
+            ],
+        )
+
+    def test_orders_are_paged_by_created_at_and_id(self):
+        orders = [Order.objects.create(user=self.user) for _ in range(5)]
+
+        ids = self.collect_pages(ORDER_URL, {"page_size": 2})
+
+        self.assertEqual(ids, [order.id for order in reversed(orders)])
+
+    def test_count_is_optional(self):
+        sample_flight()
+
+        res1 = self.client.get(FLIGHT_URL)
+        res2 = self.client.get(FLIGHT_URL, {"count": "true"})
+
+        self.assertNotIn("count", res1.data)
+        self.assertEqual(res2.data["count"], 1)
+
+    def test_invalid_cursor(self):
+        res = self.client.get(FLIGHT_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor(self):
+        sample_flight()
+        for url, params, position in (
+            (FLIGHT_URL, {}, ["garbage", 1]),
+            (FLIGHT_URL, {}, [None, None]),
+            (FLIGHT_URL, {}, [{"a": 1}, 2]),
+            (FLIGHT_URL, {}, ["2024-01-01T12:00:00Z", "x"]),
+            (FLIGHT_URL, {"ordering": "tickets_available"}, ["x", 1, 1]),
+            (ORDER_URL, {}, [[1], 1]),
+        ):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps(position).encode()
+            ).decode()
+
+            res = self.client.get(url, {**params, "cursor": cursor})
+
+            self.assertEqual(
+                res.status_code, status.HTTP_404_NOT_FOUND, position
+            )
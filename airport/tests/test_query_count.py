@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Crew
+from airport.tests.test_flight_api import (
+    FLIGHT_URL,
+    detail_url,
+    sample_flight,
+    sample_route,
+)
+
+ROUTE_URL = reverse("airport:route-list")
+
+
+def sample_flight_with_crew(crew_count=3):
+    flight = sample_flight()
+    for index in range(crew_count):
+        flight.crew_members.add(
+            Crew.objects.create(
+                first_name=f"First {index}", last_name=f"Last {index}"
+            )
+        )
+    return flight
+
+
+class QueryCountTestMixin:
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, create_object, params=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_object()
+        queries_for_one = self.count_queries(url, params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(4):
+                create_object()
+        queries_for_many = self.count_queries(url, params)
+
+        self.assertEqual(queries_for_one, queries_for_many)
+
+
+class EagerLoadingQueryCountTests(QueryCountTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_flight_list_query_count_is_constant(self):
+        self.assertConstantQueries(FLIGHT_URL, sample_flight_with_crew)
+
+    def test_flight_detail_query_count(self):
+        flight = sample_flight_with_crew(crew_count=5)
+
+        self.assertEqual(self.count_queries(detail_url(flight.id)), 2)
+
+    def test_route_list_query_count_is_constant(self):
+        self.assertConstantQueries(ROUTE_URL, sample_route)
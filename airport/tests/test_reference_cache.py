@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.tests.test_flight_api import sample_airport, sample_route
+
+AIRPORT_URL = reverse("airport:airport-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_repeated_list_is_served_from_cache(self):
+        sample_airport()
+        res1 = self.client.get(AIRPORT_URL)
+
+        with CaptureQueriesContext(connection) as context:
+            res2 = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(res2.status_code, status.HTTP_200_OK)
+        self.assertEqual(res1.data, res2.data)
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_query_params_are_part_of_the_key(self):
+        sample_airport()
+        res1 = self.client.get(AIRPORT_URL)
+        res2 = self.client.get(AIRPORT_URL, {"unused": "1"})
+
+        self.assertNotEqual(res1["ETag"], res2["ETag"])
+
+    def test_write_invalidates_cached_list(self):
+        sample_airport()
+        self.client.get(AIRPORT_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_airport(name="New airport")
+        res = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(
+            [airport["name"] for airport in res.data],
+            ["New airport", "Test airport"],
+        )
+
+    def test_dependent_model_invalidates_routes(self):
+        route = sample_route()
+        self.client.get(ROUTE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            route.source.delete()
+        res = self.client.get(ROUTE_URL)
+
+        self.assertEqual(res.data, [])
+
+    def test_matching_etag_returns_not_modified(self):
+        sample_airport()
+        res1 = self.client.get(AIRPORT_URL)
+
+        res2 = self.client.get(
+            AIRPORT_URL, HTTP_IF_NONE_MATCH=res1["ETag"]
+        )
+
+        self.assertEqual(res2.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res2["ETag"], res1["ETag"])
+
+    def test_etag_changes_after_write(self):
+        sample_airport()
+        res1 = self.client.get(AIRPORT_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_airport(name="New airport")
+        res2 = self.client.get(
+            AIRPORT_URL, HTTP_IF_NONE_MATCH=res1["ETag"]
+        )
+
+        self.assertEqual(res2.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res2["ETag"], res1["ETag"])
@@ -0,0 +1,114 @@
+import datetime
+import decimal
+import json
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from airport import renderers
+from airport.renderers import FastJSONRenderer
+from airport.tests.test_flight_api import sample_airport
+
+AIRPORT_URL = reverse("airport:airport-list")
+
+PAYLOADS = [
+    None,
+    [],
+    {"id": 1, "name": "Kyiv \u2028 Київ \u2029", "rate": 0.1},
+    ReturnList(
+        [ReturnDict({"id": 1, "names": ("a", "b")}, serializer=None)],
+        serializer=None,
+    ),
+    {
+        "when": datetime.datetime(
+            2024, 1, 1, 12, 30, 0, 123456, tzinfo=datetime.timezone.utc
+        ),
+        "day": datetime.date(2024, 1, 1),
+        "price": decimal.Decimal("10.50"),
+        "uuid": uuid.UUID("12345678123456781234567812345678"),
+        "lazy": gettext_lazy("lazy"),
+        "error": ErrorDetail("Invalid", code="invalid"),
+    },
+    {1: "non-string key", "big": 2 ** 70},
+]
+
+
+class FastJSONRendererTests(TestCase):
+    def assertRendersLikeDRF(self, media_type=None, context=None):
+        for payload in PAYLOADS:
+            self.assertEqual(
+                FastJSONRenderer().render(payload, media_type, context),
+                JSONRenderer().render(payload, media_type, context),
+                payload,
+            )
+
+    def test_same_bytes_as_json_renderer(self):
+        self.assertRendersLikeDRF()
+
+    def test_same_bytes_with_indent(self):
+        self.assertRendersLikeDRF("application/json; indent=4")
+        self.assertRendersLikeDRF(context={"indent": 2})
+
+    def test_non_finite_floats_rejected_like_drf(self):
+        for value in (float("nan"), float("inf"), -float("inf")):
+            payload = {"rows": [{"hours": value, "gap": None}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(payload)
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render(payload)
+
+    def test_exponent_floats_keep_their_value(self):
+        payload = {"values": [1e16, 1e-7, 1e300, 0.1875, 19.5]}
+
+        content = FastJSONRenderer().render(payload)
+
+        self.assertEqual(json.loads(content), payload)
+        if renderers.orjson is not None:
+            self.assertEqual(
+                content, b'{"values":[1e16,1e-7,1e300,0.1875,19.5]}'
+            )
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertRendersLikeDRF()
+
+
+class PreEncodedReferenceResponseTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "testpass")
+        )
+        sample_airport()
+
+    def test_cache_hit_is_not_encoded_again(self):
+        res1 = self.client.get(AIRPORT_URL)
+
+        with mock.patch.object(
+                JSONRenderer, "render", side_effect=AssertionError
+        ), mock.patch.object(renderers, "orjson", None):
+            res2 = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(res2.content, res1.content)
+        self.assertEqual(res2.data, res1.data)
+
+    def test_indented_response_is_not_pre_encoded(self):
+        self.client.get(AIRPORT_URL)
+
+        res = self.client.get(
+            AIRPORT_URL, HTTP_ACCEPT="application/json; indent=2"
+        )
+
+        self.assertIn(b'\n  {\n    "id"', res.content)
@@ -0,0 +1,241 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airplane, Crew, Flight, FlightSearchIndex
+from airport.tests.test_flight_api import sample_flight
+
+IMPORT_URL = reverse("airport:flight-import-schedule")
+
+CSV_TIMETABLE = (
+    "source,destination,airplane,departure_time,arrival_time,crew_members\n"
+    "Test airport,Airport 2,test airplane,"
+    "2024-06-01T08:00:00Z,2024-06-01T10:00:00Z,Ann Pilot;Bob Pilot\n"
+    "Test airport,Airport 2,test airplane,"
+    "2024-06-02T08:00:00Z,2024-06-02T10:00:00Z,\n"
+)
+
+
+class ScheduleImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.flight = sample_flight()
+        self.route = self.flight.route
+        self.airplane = self.flight.airplane
+        self.crew = [
+            Crew.objects.create(first_name="Ann", last_name="Pilot"),
+            Crew.objects.create(first_name="Bob", last_name="Pilot"),
+        ]
+
+    def write_file(self, content, suffix):
+        file = tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False, encoding="utf-8"
+        )
+        with file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def imported_flights(self):
+        return Flight.objects.exclude(id=self.flight.id).order_by(
+            "departure_time"
+        )
+
+    def test_import_csv_by_names(self):
+        path = self.write_file(CSV_TIMETABLE, ".csv")
+
+        call_command("import_schedule", path, stdout=io.StringIO())
+
+        flights = list(self.imported_flights())
+        self.assertEqual(len(flights), 2)
+        self.assertEqual(flights[0].route, self.route)
+        self.assertEqual(flights[0].airplane, self.airplane)
+        self.assertEqual(
+            sorted(crew.full_name for crew in flights[0].crew_members.all()),
+            ["Ann Pilot", "Bob Pilot"],
+        )
+        self.assertFalse(flights[1].crew_members.exists())
+        self.assertEqual(
+            FlightSearchIndex.objects.get(flight=flights[0]).source_city,
+            "Test city",
+        )
+
+    def test_import_ndjson_by_ids(self):
+        rows = [
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "departure_time": f"2024-06-0{day}T08:00:00Z",
+                "arrival_time": f"2024-06-0{day}T10:00:00Z",
+                "crew_members": [self.crew[0].id],
+            }
+            for day in range(1, 6)
+        ]
+        path = self.write_file(
+            "\n".join(json.dumps(row) for row in rows), ".ndjson"
+        )
+
+        call_command(
+            "import_schedule",
+            path,
+            "--chunk-size=2",
+            stdout=io.StringIO(),
+        )
+
+        self.assertEqual(self.imported_flights().count(), 5)
+        self.assertEqual(
+            Flight.crew_members.through.objects.filter(
+                crew=self.crew[0]
+            ).count(),
+            5,
+        )
+
+    def test_invalid_rows_abort_import(self):
+        path = self.write_file(
+            CSV_TIMETABLE
+            + "Nowhere,Airport 2,test airplane,2024-06-03T08:00:00Z,"
+              "2024-06-03T07:00:00Z,Carl Nobody\n",
+            ".csv",
+        )
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "import_schedule",
+                path,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+        self.assertFalse(self.imported_flights().exists())
+
+        call_command(
+            "import_schedule",
+            path,
+            "--skip-invalid",
+            stdout=io.StringIO(),
+            stderr=io.StringIO(),
+        )
+        self.assertEqual(self.imported_flights().count(), 2)
+
+
+class ScheduleImportApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.airplane = sample_flight().airplane
+        Crew.objects.create(first_name="Ann", last_name="Pilot")
+        Crew.objects.create(first_name="Bob", last_name="Pilot")
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+
+    def upload(self, content, name="timetable.csv", **data):
+        if isinstance(content, str):
+            content = content.encode()
+        return self.client.post(
+            IMPORT_URL,
+            {
+                "file": SimpleUploadedFile(name, content, "text/csv"),
+                **data,
+            },
+            format="multipart",
+        )
+
+    def test_import_endpoint(self):
+        res = self.upload(CSV_TIMETABLE)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["created"], 2)
+        self.assertEqual(Flight.objects.count(), 3)
+
+    def test_import_endpoint_reports_errors(self):
+        res = self.upload(
+            CSV_TIMETABLE.replace("test airplane", "missing", 1)
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["errors"],
+            [{"line": 2, "errors": {"airplane": "Unknown airplane: missing"}}],
+        )
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_import_endpoint_rejects_non_scalar_values(self):
+        rows = [
+            {"airplane": [1]},
+            {"source": {"a": 1}, "destination": "Airport 2"},
+            {"route": True, "crew_members": {"Ann": 1}},
+            {"route": "²", "crew_members": [["Ann Pilot"]]},
+        ]
+
+        res = self.upload(
+            "\n".join(json.dumps(row) for row in rows),
+            name="timetable.ndjson",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = [error["errors"] for error in res.data["errors"]]
+        self.assertEqual(errors[0]["airplane"], "Unknown airplane: [1]")
+        self.assertEqual(errors[1]["source"], "Unknown airport: {'a': 1}")
+        self.assertEqual(errors[2]["route"], "Unknown route: True")
+        self.assertEqual(
+            errors[2]["crew_members"],
+            "Expected a list or a ;-separated string.",
+        )
+        self.assertEqual(errors[3]["route"], "Unknown route: ²")
+        self.assertEqual(
+            errors[3]["crew_members"], "Unknown crew member: ['Ann Pilot']"
+        )
+
+    def test_import_endpoint_rejects_invalid_utf8(self):
+        res = self.upload(CSV_TIMETABLE.encode() + b"\xff\xfe,\n")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["file"], "The file is not valid UTF-8.")
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_import_locks_only_referenced_rows(self):
+        Airplane.objects.create(
+            name="Other airplane",
+            rows=10,
+            seats_in_row=4,
+            airplane_type=self.airplane.airplane_type,
+        )
+        Crew.objects.create(first_name="Carl", last_name="Idle")
+
+        with mock.patch(
+            "airport.schedule_import.lock_airplanes"
+        ) as lock_airplanes, mock.patch(
+            "airport.schedule_import.lock_crew"
+        ) as lock_crew:
+            self.upload(CSV_TIMETABLE)
+
+        lock_airplanes.assert_called_once_with({self.airplane.id})
+        lock_crew.assert_called_once_with(
+            set(Crew.objects.filter(last_name="Pilot").values_list(
+                "id", flat=True
+            ))
+        )
+
+    def test_import_endpoint_admin_only(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@test.com", "testpass")
+        )
+
+        res = self.upload(CSV_TIMETABLE)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,172 @@
+import base64
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import SeatHold, Ticket
+from airport.seat_holds import release_expired_holds
+from airport.tests.test_flight_api import sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def holds_url(flight_id):
+    return reverse("airport:flight-holds", args=[flight_id])
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def hold(self, seats, user=None):
+        self.client.force_authenticate(user or self.user)
+        return self.client.post(
+            holds_url(self.flight.id),
+            {"seats": [{"row": row, "seat": seat} for row, seat in seats]},
+            format="json",
+        )
+
+    def test_place_holds(self):
+        res = self.hold([(1, 1), (1, 2)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        hold = SeatHold.objects.get(row=1, seat=1)
+        self.assertEqual(hold.user, self.user)
+        self.assertGreater(hold.expires_at, timezone.now())
+
+    def test_holding_again_keeps_expiry(self):
+        self.hold([(1, 1)])
+        expires_at = timezone.now() + timedelta(minutes=1)
+        SeatHold.objects.update(expires_at=expires_at)
+
+        res = self.hold([(1, 1), (1, 2)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(
+            SeatHold.objects.get(row=1, seat=1).expires_at, expires_at
+        )
+        self.assertGreater(
+            SeatHold.objects.get(row=1, seat=2).expires_at, expires_at
+        )
+
+    @override_settings(SEAT_HOLD_MAX_PER_FLIGHT=2)
+    def test_holds_per_flight_limited(self):
+        res1 = self.hold([(1, 1), (1, 2), (1, 3)])
+        res2 = self.hold([(1, 1), (1, 2)])
+        res3 = self.hold([(1, 3)])
+        res4 = self.hold([(1, 3)], user=self.other_user)
+
+        self.assertEqual(res1.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res2.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res3.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res4.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            SeatHold.objects.filter(user=self.user).count(), 2
+        )
+
+    def test_list_and_release_own_holds(self):
+        self.hold([(1, 1)])
+        self.hold([(1, 2)], user=self.other_user)
+
+        self.client.force_authenticate(self.user)
+        res1 = self.client.get(holds_url(self.flight.id))
+        res2 = self.client.delete(holds_url(self.flight.id))
+
+        self.assertEqual([hold["seat"] for hold in res1.data], [1])
+        self.assertEqual(res2.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            list(SeatHold.objects.values_list("user", flat=True)),
+            [self.other_user.id],
+        )
+
+    def test_seat_held_by_other_user_conflicts(self):
+        self.hold([(1, 1)], user=self.other_user)
+
+        res1 = self.hold([(1, 1)])
+        res2 = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res1.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res2.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_expired_hold_does_not_block(self):
+        self.hold([(1, 1)], user=self.other_user)
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        res = self.hold([(1, 1)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+
+    def test_order_converts_own_holds_into_tickets(self):
+        self.hold([(1, 1), (1, 2)])
+
+        res = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Ticket.objects.filter(row=1, seat=1).exists())
+        self.assertEqual(
+            list(SeatHold.objects.values_list("seat", flat=True)), [2]
+        )
+
+    def test_seat_map_shows_held_seats(self):
+        self.hold([(1, 2)])
+
+        res = self.client.get(
+            reverse("airport:flight-seat-map", args=[self.flight.id])
+        )
+
+        self.assertEqual(base64.b64decode(res.data["held"])[0], 0x40)
+
+    def test_release_expired_holds(self):
+        self.hold([(1, 1), (1, 2), (1, 3)])
+        SeatHold.objects.filter(seat__lt=3).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(release_expired_holds(batch_size=1), 2)
+        self.assertEqual(
+            list(SeatHold.objects.values_list("seat", flat=True)), [3]
+        )
+
+    def test_release_expired_holds_command(self):
+        self.hold([(1, 1)])
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        call_command("release_expired_holds", stdout=StringIO())
+
+        self.assertFalse(SeatHold.objects.exists())
@@ -0,0 +1,165 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Order, Ticket
+from airport.seat_map import (
+    SEAT_MAP_CACHE_KEY,
+    SEAT_MAP_VERSION_KEY,
+    SeatMap,
+    add_tickets,
+    get_seat_map,
+    invalidate,
+)
+from airport.tests.test_flight_api import sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def seat_map_url(flight_id):
+    return reverse("airport:flight-seat-map", args=[flight_id])
+
+
+class SeatMapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+
+    def test_bitmap_marks_taken_seats(self):
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=2, seat=8
+        )
+
+        seat_map = SeatMap.build(self.flight)
+
+        self.assertEqual(len(seat_map.bitmap), 30)
+        self.assertTrue(seat_map.is_taken(1, 1))
+        self.assertTrue(seat_map.is_taken(2, 8))
+        self.assertFalse(seat_map.is_taken(1, 2))
+        self.assertEqual(seat_map.tickets_available, 238)
+
+    def test_seat_map_endpoint(self):
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+
+        res = self.client.get(seat_map_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rows"], 30)
+        self.assertEqual(res.data["seats_in_row"], 8)
+        self.assertEqual(res.data["capacity"], 240)
+        self.assertEqual(res.data["tickets_available"], 239)
+        bitmap = base64.b64decode(res.data["occupancy"])
+        self.assertEqual(bitmap[0], 0x80)
+
+    def test_cached_seat_map_does_not_query_tickets(self):
+        get_seat_map(self.flight)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(seat_map_url(self.flight.id))
+
+        ticket_table = Ticket._meta.db_table
+        self.assertFalse(
+            any(
+                ticket_table in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+    def test_order_updates_cached_seat_map(self):
+        get_seat_map(self.flight)
+        payload = {
+            "tickets": [
+                {"row": 3, "seat": 4, "flight": self.flight.id},
+            ]
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(get_seat_map(self.flight).is_taken(3, 4))
+
+    def test_deleting_tickets_invalidates_seat_map(self):
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        get_seat_map(self.flight)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.delete()
+
+        self.assertFalse(get_seat_map(self.flight).is_taken(1, 1))
+
+    def test_seat_map_built_before_commit_is_not_served(self):
+        get_seat_map(self.flight)
+        version = cache.get(
+            SEAT_MAP_VERSION_KEY.format(flight_id=self.flight.id)
+        )
+        Ticket.objects.create(
+            flight=self.flight, order=self.order, row=1, seat=1
+        )
+        # A reader that loaded the tickets before the order committed.
+        cache.set(
+            SEAT_MAP_CACHE_KEY.format(flight_id=self.flight.id),
+            SeatMap.empty(self.flight).to_cache(version),
+        )
+
+        invalidate(self.flight.id)
+
+        self.assertTrue(get_seat_map(self.flight).is_taken(1, 1))
+
+    def test_order_patches_cached_seat_map(self):
+        get_seat_map(self.flight)
+        payload = {
+            "tickets": [
+                {"row": 3, "seat": 4, "flight": self.flight.id},
+            ]
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(ORDER_URL, payload, format="json")
+
+        with self.assertNumQueries(0):
+            seat_map = get_seat_map(self.flight)
+        self.assertTrue(seat_map.is_taken(3, 4))
+
+    def test_concurrent_updates_rebuild_seat_map(self):
+        get_seat_map(self.flight)
+        tickets = [
+            Ticket.objects.create(
+                flight=self.flight, order=self.order, row=1, seat=seat
+            )
+            for seat in (1, 2)
+        ]
+
+        # Both bookings read the map before either stored its update.
+        with self.captureOnCommitCallbacks() as first:
+            add_tickets(tickets[:1])
+        with self.captureOnCommitCallbacks() as second:
+            add_tickets(tickets[1:])
+        for callback in first + second:
+            callback()
+
+        seat_map = get_seat_map(self.flight)
+        self.assertTrue(seat_map.is_taken(1, 1))
+        self.assertTrue(seat_map.is_taken(1, 2))
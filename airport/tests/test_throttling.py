@@ -0,0 +1,125 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.throttling import (
+    SQLiteCounterStore,
+    ScopedThrottle,
+    UserThrottle,
+    get_store,
+)
+from airport.tests.test_flight_api import sample_flight
+
+
+class SlidingWindowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(
+            user=get_user_model().objects.create_user(
+                "test@test.com", "testpass"
+            ),
+            META={"REMOTE_ADDR": "127.0.0.1"},
+        )
+        self.now = 600.0
+
+    def hit(self):
+        throttle = UserThrottle()
+        throttle.rate = "3/minute"
+        throttle.num_requests, throttle.duration = 3, 60
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(self.request, None), throttle
+
+    def assert_sliding_window(self):
+        for _ in range(3):
+            self.assertTrue(self.hit()[0])
+        allowed, throttle = self.hit()
+        self.assertFalse(allowed)
+        # Until a third of the next window has passed.
+        self.assertEqual(throttle.wait(), 80)
+
+        # Half way into the next window the previous one still weighs 1.5.
+        self.now += 90
+        self.assertTrue(self.hit()[0])
+        allowed, throttle = self.hit()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 10)
+
+        self.now += 10
+        self.assertTrue(self.hit()[0])
+
+    def test_cache_store(self):
+        self.assert_sliding_window()
+
+    def test_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = {
+                "BACKEND": "airport.throttling.SQLiteCounterStore",
+                "LOCATION": os.path.join(directory, "throttle.sqlite3"),
+            }
+            with override_settings(THROTTLE_STORE=store):
+                self.assert_sliding_window()
+                get_store().connection.close()
+
+    def test_sqlite_store_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            location = os.path.join(directory, "throttle.sqlite3")
+            first = SQLiteCounterStore(location)
+            second = SQLiteCounterStore(location)
+
+            first.add_hit("key", 10, 60)
+            second.add_hit("key", 11, 60)
+            first.add_hit("key", 11, 60)
+
+            self.assertEqual(second.get_counts("key", 11), (1, 2))
+            first.connection.close()
+            second.connection.close()
+
+
+class ScopedThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    @mock.patch.dict(ScopedThrottle.THROTTLE_RATES, {"search": "2/minute"})
+    def test_search_scope(self):
+        url = reverse("airport:flight-list")
+        for _ in range(2):
+            self.assertEqual(
+                self.client.get(url).status_code, status.HTTP_200_OK
+            )
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+        # Other scopes keep their own counters.
+        res = self.client.get(reverse("airport:order-list"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @mock.patch.dict(ScopedThrottle.THROTTLE_RATES, {"booking": "1/minute"})
+    def test_booking_scope_covers_order_creation(self):
+        url = reverse("airport:order-list")
+        payload = {
+            "tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]
+        }
+
+        res = self.client.post(url, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        payload["tickets"][0]["seat"] = 2
+        res = self.client.post(url, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Crew, Order, Ticket
+from airport.tests.test_flight_api import sample_flight
+
+TICKET_URL = reverse("airport:ticket-list")
+
+
+def ticket_detail_url(ticket_id):
+    return reverse("airport:ticket-detail", args=[ticket_id])
+
+
+class TicketApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def sample_ticket(self, user=None, departure_time=None, seat=1):
+        flight = sample_flight(
+            departure_time=departure_time or timezone.now() + timedelta(days=1)
+        )
+        flight.crew_members.add(
+            Crew.objects.create(first_name="First", last_name="Last")
+        )
+        order = Order.objects.create(user=user or self.user)
+        return Ticket.objects.create(
+            flight=flight, order=order, row=1, seat=seat
+        )
+
+    def test_list_only_own_tickets(self):
+        own = self.sample_ticket()
+        self.sample_ticket(user=self.other_user)
+
+        res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [ticket["id"] for ticket in res.data["results"]], [own.id]
+        )
+        self.assertEqual(
+            res.data["results"][0]["flight"]["crew_members"], ["First Last"]
+        )
+
+    def test_retrieve_other_users_ticket_not_found(self):
+        ticket = self.sample_ticket(user=self.other_user)
+
+        res = self.client.get(ticket_detail_url(ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_ticket_not_allowed(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+
+        res = self.client.post(TICKET_URL, {})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_filter_upcoming_and_past_tickets(self):
+        upcoming = self.sample_ticket()
+        past = self.sample_ticket(
+            departure_time=timezone.now() - timedelta(days=1)
+        )
+
+        res1 = self.client.get(TICKET_URL, {"departure": "upcoming"})
+        res2 = self.client.get(TICKET_URL, {"departure": "past"})
+
+        self.assertEqual(
+            [ticket["id"] for ticket in res1.data["results"]], [upcoming.id]
+        )
+        self.assertEqual(
+            [ticket["id"] for ticket in res2.data["results"]], [past.id]
+        )
+
+    def test_tickets_are_paged_by_cursor(self):
+        tickets = [self.sample_ticket() for _ in range(3)]
+
+        res1 = self.client.get(TICKET_URL, {"page_size": 2})
+        res2 = self.client.get(res1.data["next"])
+
+        self.assertEqual(
+            [
+                ticket["id"]
+                for ticket in res1.data["results"] + res2.data["results"]
+            ],
+            [ticket.id for ticket in reversed(tickets)],
+        )
+        self.assertIsNone(res2.data["next"])
+
+    def test_list_query_count_is_constant(self):
+        self.sample_ticket()
+        with CaptureQueriesContext(connection) as one_ticket:
+            self.client.get(TICKET_URL)
+
+        for _ in range(5):
+            self.sample_ticket()
+        with CaptureQueriesContext(connection) as many_tickets:
+            self.client.get(TICKET_URL)
+
+        self.assertEqual(
+            len(one_ticket.captured_queries),
+            len(many_tickets.captured_queries),
+        )
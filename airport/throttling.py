@@ -0,0 +1,187 @@
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+
+
+class CacheCounterStore:
+    """
+    Window counters in a Django cache. Shared between processes when the
+    cache is (e.g. ``RedisCache``), per process with local memory.
+    """
+
+    def __init__(self, location):
+        self.cache = caches[location]
+
+    def get_counts(self, key, window):
+        """Hit counts of the window before ``window`` and of ``window``."""
+        previous_key, current_key = f"{key}:{window - 1}", f"{key}:{window}"
+        counts = self.cache.get_many([previous_key, current_key])
+        return counts.get(previous_key, 0), counts.get(current_key, 0)
+
+    def add_hit(self, key, window, duration):
+        current_key = f"{key}:{window}"
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            if not self.cache.add(current_key, 1, duration * 2):
+                self.cache.incr(current_key)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class SQLiteCounterStore:
+    """
+    Window counters in a local SQLite file, shared by all worker processes
+    on the host without running a separate server.
+    """
+
+    purge_every = 1000
+
+    def __init__(self, location):
+        self.location = location
+        self._local = threading.local()
+        self._hits = 0
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.location, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_counter ("
+                "key TEXT NOT NULL, window INTEGER NOT NULL, "
+                "count INTEGER NOT NULL, expires REAL NOT NULL, "
+                "PRIMARY KEY (key, window)) WITHOUT ROWID"
+            )
+            self._local.connection = connection
+        return connection
+
+    def get_counts(self, key, window):
+        counts = dict(self.connection.execute(
+            "SELECT window, count FROM throttle_counter "
+            "WHERE key = ? AND window IN (?, ?)",
+            (key, window - 1, window),
+        ))
+        return counts.get(window - 1, 0), counts.get(window, 0)
+
+    def add_hit(self, key, window, duration):
+        self._hits += 1
+        if self._hits % self.purge_every == 0:
+            self.connection.execute(
+                "DELETE FROM throttle_counter WHERE expires < ?",
+                (time.time(),),
+            )
+        self.connection.execute(
+            "INSERT INTO throttle_counter VALUES (?, ?, 1, ?) "
+            "ON CONFLICT (key, window) DO UPDATE SET count = count + 1",
+            (key, window, (window + 2) * duration),
+        )
+
+    def clear(self):
+        self.connection.execute("DELETE FROM throttle_counter")
+
+
+@lru_cache(maxsize=None)
+def _load_store(backend, location):
+    return import_string(backend)(location)
+
+
+def get_store():
+    return _load_store(
+        settings.THROTTLE_STORE["BACKEND"],
+        str(settings.THROTTLE_STORE["LOCATION"]),
+    )
+
+
+def _reset_store(setting, **kwargs):
+    if setting == "THROTTLE_STORE":
+        _load_store.cache_clear()
+
+
+setting_changed.connect(_reset_store)
+
+
+class SlidingWindowMixin:
+    """
+    Rate limit over a sliding window approximated from two fixed windows:
+    the count of the current one plus the count of the previous one
+    weighted by how much of it the sliding window still covers. Keeps two
+    integers per client in the ``THROTTLE_STORE`` instead of a list of
+    request timestamps.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        self.window = int(window)
+        self.elapsed = offset
+        store = get_store()
+        self.previous, self.current = store.get_counts(self.key, self.window)
+        weight = 1 - offset / self.duration
+        # Rejected requests are not counted, like the history throttles.
+        # Concurrent checks may let a few requests over the limit.
+        if self.previous * weight + self.current + 1 > self.num_requests:
+            return self.throttle_failure()
+        store.add_hit(self.key, self.window, self.duration)
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        room = self.num_requests - 1
+        if self.current <= room and self.previous:
+            # Enough of the previous window has to slide out.
+            covered = 1 - (room - self.current) / self.previous
+            return max(covered * self.duration - self.elapsed, 0)
+        # The next window starts with this one as its previous.
+        covered = 1 - room / self.current if self.current else 0
+        return self.duration - self.elapsed + covered * self.duration
+
+
+class AnonThrottle(SlidingWindowMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserThrottle(SlidingWindowMixin, throttling.UserRateThrottle):
+    pass
+
+
+def get_throttle_scope(view):
+    scopes = getattr(view, "throttle_scopes", {})
+    return scopes.get(getattr(view, "action", None)) or getattr(
+        view, "throttle_scope", None
+    )
+
+
+class ScopedThrottle(SlidingWindowMixin, throttling.ScopedRateThrottle):
+    """
+    Extra limit for views with a ``throttle_scope``, or per action with
+    ``throttle_scopes``, on top of the anon/user limits.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = get_throttle_scope(view)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
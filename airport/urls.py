@@ -1,13 +1,16 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from airport import async_views
 from airport.views import (
     AirportViewSet,
     RouteViewSet,
     CrewViewSet,
     AirplaneTypeViewSet,
     AirplaneViewSet,
+    ExportView,
     FlightViewSet,
+    FlightSearchViewSet,
     OrderViewSet,
     TicketViewSet
 )
@@ -19,11 +22,35 @@ router.register("crew", CrewViewSet)
 router.register("airplane-types", AirplaneTypeViewSet)
 router.register("airplanes", AirplaneViewSet)
 router.register("flights", FlightViewSet)
+router.register(
+    "flight-search", FlightSearchViewSet, basename="flight-search"
+)
 router.register("orders", OrderViewSet)
 router.register("tickets", TicketViewSet)
 
 urlpatterns = [
-    path("", include(router.urls))
+    path("", include(router.urls)),
+    path("export/<slug:dataset>/", ExportView.as_view(), name="export"),
+    path(
+        "async/airports/",
+        async_views.airport_list,
+        name="async-airport-list",
+    ),
+    path(
+        "async/flights/",
+        async_views.flight_list,
+        name="async-flight-list",
+    ),
+    path(
+        "async/flights/<str:pk>/",
+        async_views.flight_detail,
+        name="async-flight-detail",
+    ),
+    path(
+        "async/flights/<str:pk>/seat-map/",
+        async_views.flight_seat_map,
+        name="async-flight-seat-map",
+    ),
 ]
 
 app_name = "airport"
@@ -1,8 +1,22 @@
-from datetime import datetime
-
-from rest_framework import viewsets, generics
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticated
+import hmac
+import io
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Sum
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import viewsets, generics, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from airport import export, schedule_import
+from airport.fleet import get_utilization
+from airport.instrumentation import registry
 
 from airport.models import (
     Airport,
@@ -11,9 +25,29 @@ from airport.models import (
     AirplaneType,
     Airplane,
     Flight,
+    FlightSearchIndex,
     Order,
+    SeatHold,
     Ticket
 )
+from airport.eager_loading import EagerLoadingMixin, get_eager_loading_plan
+from airport.fast_serializers import (
+    FastAirplaneListSerializer,
+    FastFlightListSerializer,
+    FastListMixin,
+    FastOrderListSerializer,
+    FastRouteListSerializer
+)
+from airport.itineraries import itinerary_index
+from airport.pagination import (
+    FlightPagination,
+    FlightSearchPagination,
+    OrderPagination,
+    TicketPagination
+)
+from airport.response_cache import CachedResponseMixin
+from airport.seat_holds import get_held_map, place_holds
+from airport.seat_map import get_seat_map
 from airport.serializers import (
     AirportSerializer,
     RouteSerializer,
@@ -26,22 +60,48 @@ from airport.serializers import (
     RouteListSerializer,
     RouteDetailSerializer,
     AirplaneListSerializer,
+    AirplaneUtilizationSerializer,
+    FleetUtilizationSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
+    FlightSearchSerializer,
+    FlightFilterSerializer,
     TicketListSerializer,
     TicketDetailSerializer,
-    OrderListSerializer
+    OrderListSerializer,
+    SeatMapSerializer,
+    SeatHoldSerializer,
+    SeatHoldRequestSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
+    CrewFlightSerializer,
+    CrewScheduleSerializer,
+    ScheduleWindowSerializer
 )
+from user.authentication import get_request_user
 
 
-class AirportViewSet(generics.ListCreateAPIView, viewsets.GenericViewSet):
+class AirportViewSet(
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+    viewsets.GenericViewSet
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
+    cache_models = (Airport,)
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    EagerLoadingMixin,
+    viewsets.ModelViewSet
+):
     queryset = Route.objects.all()
     serializer_class = RouteSerializer
+    cache_models = (Route, Airport)
+    fast_serializer_class = FastRouteListSerializer
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -50,79 +110,378 @@ class RouteViewSet(viewsets.ModelViewSet):
             return RouteDetailSerializer
         return self.serializer_class
 
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+def get_flight_filters(request):
+    """The validated flight filter query parameters of ``request``."""
+    filters = FlightFilterSerializer(data=request.query_params)
+    filters.is_valid(raise_exception=True)
+    return filters.validated_data
+
+
+def get_window(request):
+    """
+    The validated ``start``/``end`` query parameters of ``request`` with
+    the datetimes at the start of those days.
+    """
+    window = ScheduleWindowSerializer(data=request.query_params)
+    window.is_valid(raise_exception=True)
+    start, end = (
+        timezone.make_aware(datetime.combine(day, time.min))
+        for day in (
+            window.validated_data["start"], window.validated_data["end"]
+        )
+    )
+    return window, start, end
+
 
-class CrewViewSet(generics.ListCreateAPIView, viewsets.GenericViewSet):
+class CrewViewSet(
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+    viewsets.GenericViewSet
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
+    cache_models = (Crew,)
 
+    def get_serializer_class(self):
+        if self.action == "schedule":
+            return CrewScheduleSerializer
+        return self.serializer_class
 
-class AirplaneTypeViewSet(generics.ListCreateAPIView, viewsets.GenericViewSet):
+    @action(methods=["GET"], detail=True)
+    def schedule(self, request, pk=None):
+        crew = self.get_object()
+        window, start, end = get_window(request)
+
+        flights = crew.flights.filter(
+            departure_time__gte=start, departure_time__lt=end
+        )
+        totals = flights.aggregate(
+            flight_count=Count("id"),
+            duty_time=Sum(F("arrival_time") - F("departure_time")),
+        )
+        serializer = self.get_serializer({
+            "crew": crew,
+            **window.validated_data,
+            **totals,
+            "flights": get_eager_loading_plan(CrewFlightSerializer).apply(
+                flights.order_by("departure_time", "id")
+            ),
+        })
+        return Response(serializer.data)
+
+
+class AirplaneTypeViewSet(
+    CachedResponseMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+    viewsets.GenericViewSet
+):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
+    cache_models = (AirplaneType,)
 
 
-class AirplaneViewSet(generics.ListCreateAPIView, viewsets.GenericViewSet):
+class AirplaneViewSet(
+    CachedResponseMixin,
+    FastListMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+    viewsets.GenericViewSet
+):
     queryset = Airplane.objects.all()
     serializer_class = AirplaneSerializer
+    cache_models = (Airplane, AirplaneType)
+    fast_serializer_class = FastAirplaneListSerializer
 
     def get_serializer_class(self):
         if self.action == "list":
             return AirplaneListSerializer
+        if self.action == "utilization":
+            return FleetUtilizationSerializer
         return self.serializer_class
 
+    @action(methods=["GET"], detail=False)
+    def utilization(self, request):
+        """Hours flown and idle gaps of every airplane over a window."""
+        window, start, end = get_window(request)
+        airplanes = get_utilization(
+            get_eager_loading_plan(AirplaneUtilizationSerializer).apply(
+                self.get_queryset()
+            ),
+            start,
+            end,
+        )
+        serializer = self.get_serializer(
+            {**window.validated_data, "airplanes": airplanes},
+            context={**self.get_serializer_context(), "start": start,
+                     "end": end},
+        )
+        return Response(serializer.data)
+
 
 class FlightViewSet(
+    FastListMixin,
+    EagerLoadingMixin,
     generics.ListCreateAPIView,
     generics.RetrieveAPIView,
     viewsets.GenericViewSet
 ):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
+    pagination_class = FlightPagination
+    throttle_scopes = {
+        "list": "search",
+        "retrieve": "search",
+        "seat_map": "search",
+        "itineraries": "search",
+        "holds": "booking",
+        "create": "admin",
+        "import_schedule": "admin",
+    }
+    fast_serializer_class = FastFlightListSerializer
 
     def get_serializer_class(self):
         if self.action == "list":
             return FlightListSerializer
         if self.action == "retrieve":
             return FlightDetailSerializer
+        if self.action == "seat_map":
+            return SeatMapSerializer
+        if self.action == "holds":
+            return SeatHoldRequestSerializer
+        if self.action == "itineraries":
+            return ItinerarySerializer
         return self.serializer_class
 
+    availability_orderings = ("tickets_available", "-tickets_available")
+
+    def get_keyset_ordering(self):
+        ordering = self.request.query_params.get("ordering")
+        if ordering in self.availability_orderings:
+            return ordering, "-departure_time", "-id"
+        return FlightPagination.ordering
+
+    @staticmethod
+    def _day_range(day):
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        return start, start + timedelta(days=1)
+
     def get_queryset(self):
-        route_id_str = self.request.query_params.get("route")
-        departure_date = self.request.query_params.get("departure_date")
-        arrival_date = self.request.query_params.get("arrival_date")
-
-        queryset = self.queryset
-
-        if route_id_str:
-            queryset = queryset.filter(route_id=int(route_id_str))
-        if departure_date:
-            departure_date = datetime.strptime(
-                departure_date, "%Y-%m-%d"
-            ).date()
-            queryset = queryset.filter(departure_time__date=departure_date)
-        if arrival_date:
-            arrival_date = datetime.strptime(arrival_date, "%Y-%m-%d").date()
-            queryset = queryset.filter(arrival_time__date=arrival_date)
+        filters = get_flight_filters(self.request)
+        ordering = self.request.query_params.get("ordering")
+
+        queryset = super().get_queryset()
+
+        if "route" in filters:
+            queryset = queryset.filter(route_id=filters["route"])
+        if "departure_date" in filters:
+            start, end = self._day_range(filters["departure_date"])
+            queryset = queryset.filter(
+                departure_time__gte=start, departure_time__lt=end
+            )
+        if "arrival_date" in filters:
+            start, end = self._day_range(filters["arrival_date"])
+            queryset = queryset.filter(
+                arrival_time__gte=start, arrival_time__lt=end
+            )
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.with_tickets_available()
+            if "min_available" in filters:
+                queryset = queryset.filter(
+                    tickets_available__gte=filters["min_available"]
+                )
+            if ordering in self.availability_orderings:
+                queryset = queryset.order_by(*self.get_keyset_ordering())
+        if self.action in ("seat_map", "holds"):
+            queryset = queryset.select_related("airplane")
 
         return queryset
 
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        flight = self.get_object()
+        seat_map = get_seat_map(flight)
+        seat_map.held = get_held_map(flight)
+        serializer = self.get_serializer(seat_map)
+        return Response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def itineraries(self, request):
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+
+        departure_after, departure_before = self._day_range(
+            params["departure_date"]
+        )
+        journeys = itinerary_index.search(
+            params["source"],
+            params["destination"],
+            departure_after,
+            departure_before,
+            max_stops=params["max_stops"],
+            min_connection=timedelta(minutes=params["min_connection"]),
+            max_connection=timedelta(minutes=params["max_connection"]),
+            limit=params["limit"],
+        )
+
+        flights = get_eager_loading_plan(FlightListSerializer).apply(
+            Flight.objects.with_tickets_available()
+        ).in_bulk({flight_id for journey in journeys for flight_id in journey})
+        itineraries = []
+        for journey in journeys:
+            if not all(flight_id in flights for flight_id in journey):
+                continue
+            legs = [flights[flight_id] for flight_id in journey]
+            itineraries.append({
+                "departure_time": legs[0].departure_time,
+                "arrival_time": legs[-1].arrival_time,
+                "stops": len(legs) - 1,
+                "flights": legs,
+            })
+
+        serializer = self.get_serializer(itineraries, many=True)
+        return Response(serializer.data)
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        parser_classes=(MultiPartParser,),
+    )
+    def import_schedule(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError(
+                {"file": "Upload a CSV or NDJSON timetable."}
+            )
+        input_format = request.data.get("input_format") or (
+            schedule_import.guess_format(upload.name)
+        )
+        if input_format not in schedule_import.FORMATS:
+            raise ValidationError(
+                {"input_format": f"Choose one of: "
+                                 f"{', '.join(schedule_import.FORMATS)}"}
+            )
+
+        importer = schedule_import.ScheduleImporter(
+            skip_invalid=request.data.get("skip_invalid") in ("1", "true")
+        )
+        try:
+            result = importer.run(
+                schedule_import.read_rows(
+                    io.TextIOWrapper(
+                        upload.file, encoding="utf-8", newline=""
+                    ),
+                    input_format,
+                )
+            )
+        except UnicodeDecodeError:
+            raise ValidationError({"file": "The file is not valid UTF-8."})
+
+        if result.error_count and not importer.skip_invalid:
+            return Response(
+                result.as_dict(), status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)
+
+    @action(
+        methods=["GET", "POST", "DELETE"],
+        detail=True,
+        permission_classes=(IsAuthenticated,),
+    )
+    def holds(self, request, pk=None):
+        flight = self.get_object()
+        holds = SeatHold.objects.filter(
+            flight=flight,
+            user_id=request.user.id,
+            expires_at__gt=timezone.now()
+        )
+
+        if request.method == "POST":
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            holds = place_holds(
+                request.user, flight, serializer.validated_data["seats"]
+            )
+            return Response(
+                SeatHoldSerializer(holds, many=True).data,
+                status=status.HTTP_201_CREATED
+            )
+        if request.method == "DELETE":
+            holds.delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        return Response(SeatHoldSerializer(holds, many=True).data)
+
+
+class FlightSearchViewSet(
+    EagerLoadingMixin,
+    generics.ListAPIView,
+    viewsets.GenericViewSet
+):
+    queryset = FlightSearchIndex.objects.all()
+    serializer_class = FlightSearchSerializer
+    pagination_class = FlightSearchPagination
+    throttle_scope = "search"
+
+    def get_queryset(self):
+        source_city = self.request.query_params.get("source_city")
+        destination_city = self.request.query_params.get("destination_city")
+        filters = get_flight_filters(self.request)
+
+        queryset = super().get_queryset()
+
+        if source_city:
+            queryset = queryset.filter(source_city=source_city)
+        if destination_city:
+            queryset = queryset.filter(destination_city=destination_city)
+        if "departure_date" in filters:
+            queryset = queryset.filter(
+                departure_date=filters["departure_date"]
+            )
+        if "min_available" in filters:
+            queryset = queryset.filter(
+                tickets_sold__lte=F("capacity") - filters["min_available"]
+            )
 
-class Pagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
+        return queryset
 
 
 class TicketViewSet(
-    generics.ListCreateAPIView,
+    EagerLoadingMixin,
+    generics.ListAPIView,
     generics.RetrieveAPIView,
     viewsets.GenericViewSet
 ):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
-    pagination_class = Pagination
+    pagination_class = TicketPagination
 
     def get_queryset(self):
-        return Ticket.objects.filter(user=self.request.user)
+        departure = self.request.query_params.get("departure")
+
+        queryset = super().get_queryset().filter(
+            order__user_id=self.request.user.id
+        ).select_related("order")
+
+        if departure == "upcoming":
+            queryset = queryset.filter(
+                flight__departure_time__gte=timezone.now()
+            )
+        elif departure == "past":
+            queryset = queryset.filter(
+                flight__departure_time__lt=timezone.now()
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -132,16 +491,21 @@ class TicketViewSet(
         return self.serializer_class
 
 
-class OrderViewSet(generics.ListCreateAPIView, viewsets.GenericViewSet):
-    queryset = Order.objects.prefetch_related(
-        "tickets__flight__airplane"
-    )
+class OrderViewSet(
+    FastListMixin,
+    EagerLoadingMixin,
+    generics.ListCreateAPIView,
+    viewsets.GenericViewSet
+):
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
-    pagination_class = Pagination
+    pagination_class = OrderPagination
+    fast_serializer_class = FastOrderListSerializer
+    throttle_scopes = {"create": "booking"}
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user_id=self.request.user.id)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -149,4 +513,44 @@ class OrderViewSet(generics.ListCreateAPIView, viewsets.GenericViewSet):
         return OrderSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user=get_request_user(self.request))
+
+
+class ExportView(APIView):
+    permission_classes = (IsAdminUser,)
+    throttle_scope = "admin"
+
+    def get(self, request, dataset):
+        output_format = request.query_params.get("output", "ndjson")
+        if dataset not in export.DATASETS:
+            raise NotFound(f"Unknown dataset: {dataset}")
+        if output_format not in export.CONTENT_TYPES:
+            raise ValidationError(
+                {"output": f"Choose one of: {', '.join(export.CONTENT_TYPES)}"}
+            )
+
+        response = StreamingHttpResponse(
+            export.stream(dataset, output_format),
+            content_type=export.CONTENT_TYPES[output_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{dataset}.{output_format}"'
+        )
+        return response
+
+
+def metrics(request):
+    """Request metrics in the Prometheus text format."""
+    if settings.METRICS_TOKEN:
+        allowed = hmac.compare_digest(
+            request.headers.get("Authorization", ""),
+            f"Bearer {settings.METRICS_TOKEN}",
+        )
+    else:
+        allowed = request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS
+    if not settings.REQUEST_METRICS or not allowed:
+        raise Http404
+    return HttpResponse(
+        registry.export(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,7 +1,13 @@
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_service.settings")
 
 application = get_asgi_application()
+
+if settings.DEBUG:
+    # Serve the admin and browsable API assets the way runserver does.
+    application = ASGIStaticFilesHandler(application)
@@ -1,3 +1,4 @@
+import importlib.util
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -33,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "airport.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -62,13 +64,24 @@ TEMPLATES = [
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "airport.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport.throttling.AnonThrottle",
+        "airport.throttling.UserThrottle",
+        "airport.throttling.ScopedThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.environ.get("ANON_THROTTLE_RATE", "10/day"),
+        "user": os.environ.get("USER_THROTTLE_RATE", "30/day"),
+        "search": os.environ.get("SEARCH_THROTTLE_RATE", "60/minute"),
+        "booking": os.environ.get("BOOKING_THROTTLE_RATE", "10/minute"),
+        "admin": os.environ.get("ADMIN_THROTTLE_RATE", "100/hour"),
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "user.permissions.IsAdminOrIfAuthenticatedReadOnly",
@@ -101,6 +114,85 @@ DATABASES = {
     }
 }
 
+# Seat maps and reference data carry versions that writes bump; both
+# caches must be shared by all workers for the bumps to reach them.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DEFAULT_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("DEFAULT_CACHE_LOCATION", ""),
+    },
+    "reference": {
+        "BACKEND": os.environ.get(
+            "REFERENCE_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get(
+            "REFERENCE_CACHE_LOCATION", "airport-reference-data"
+        ),
+    },
+    # Token revocation markers and user row versions; must be shared by all
+    # workers for a revocation to reach them.
+    "auth": {
+        "BACKEND": os.environ.get(
+            "AUTH_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("AUTH_CACHE_LOCATION", "airport-auth"),
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    },
+}
+
+AUTH_CACHE_ALIAS = "auth"
+
+# Users kept in each process for views that need the ``User`` row.
+AUTH_USER_CACHE_SIZE = 1024
+
+# Where throttle counters live: a cache alias for
+# airport.throttling.CacheCounterStore (shared when the cache is Redis) or
+# a file path for airport.throttling.SQLiteCounterStore.
+THROTTLE_STORE = {
+    "BACKEND": os.environ.get(
+        "THROTTLE_STORE_BACKEND", "airport.throttling.CacheCounterStore"
+    ),
+    "LOCATION": os.environ.get("THROTTLE_STORE_LOCATION", "default"),
+}
+
+REFERENCE_CACHE_ALIAS = "reference"
+
+REFERENCE_CACHE_TIMEOUT = 60 * 60
+
+FAST_LIST_SERIALIZERS = (
+    os.environ.get("FAST_LIST_SERIALIZERS", "false").lower() == "true"
+)
+
+REQUEST_METRICS = (
+    os.environ.get("REQUEST_METRICS", "false").lower() == "true"
+)
+
+# Bearer token for /metrics; without one it only answers INTERNAL_IPS.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Most queries a request to each view may run. JWT authentication runs
+# none for tokens carrying the issue time claim.
+QUERY_BUDGETS = {
+    "airport:airport-list": 1,
+    "airport:route-list": 1,
+    "airport:airplane-list": 1,
+    "airport:flight-list": 2,
+    "airport:flight-detail": 2,
+    "airport:flight-seat-map": 3,
+    "airport:flight-search-list": 1,
+    "airport:order-list": 3,
+    "airport:ticket-list": 2,
+}
+
+QUERY_BUDGET_STRICT = (
+    os.environ.get("QUERY_BUDGET_STRICT", "false").lower() == "true"
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -116,6 +208,45 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Algorithm for new password hashes: argon2 (needs ``pip install
+# argon2-cffi``, optional), scrypt or pbkdf2. Hashes of the other ones are
+# still accepted and redone with it on the next login.
+PASSWORD_HASHER = os.environ.get(
+    "PASSWORD_HASHER",
+    "argon2" if importlib.util.find_spec("argon2") else "scrypt",
+)
+
+PASSWORD_HASHER_CLASSES = {
+    "argon2": "user.hashers.Argon2PasswordHasher",
+    "scrypt": "user.hashers.ScryptPasswordHasher",
+    "pbkdf2": "user.hashers.PBKDF2PasswordHasher",
+}
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(
+        path for name, path in PASSWORD_HASHER_CLASSES.items()
+        if name != PASSWORD_HASHER
+    ),
+]
+
+# Costs of about 20-50 ms and 16-19 MiB per hash.
+PASSWORD_HASH_PARAMS = {
+    "argon2": {"time_cost": 2, "memory_cost": 19 * 1024, "parallelism": 1},
+    "scrypt": {
+        "work_factor": 2 ** 14,
+        "block_size": 8,
+        "parallelism": 1,
+        "maxmem": 64 * 1024 * 1024,
+    },
+}
+
+# Threads per process computing password hashes, 0 to hash in the request
+# thread, and how many requests may wait for them before getting a 503.
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 1))
+
+PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 64))
+
 AUTH_USER_MODEL = "user.User"
 
 LANGUAGE_CODE = "en-us"
@@ -138,4 +269,13 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
 }
+
+SEAT_HOLD_TTL = timedelta(minutes=10)
+# Most seats one user may hold on one flight at a time.
+SEAT_HOLD_MAX_PER_FLIGHT = 10
+
+# Longest flight accepted; overlap checks only look this far back.
+MAX_FLIGHT_DURATION = timedelta(hours=48)
@@ -0,0 +1,56 @@
+"""
+Production profile, used with ``gunicorn -c gunicorn.conf.py``:
+
+    DJANGO_SETTINGS_MODULE=airport_service.settings_prod
+"""
+import os
+import tempfile
+
+from airport_service.settings import *  # noqa: F401, F403
+from airport_service.settings import CACHES, DATABASES
+
+DEBUG = False
+
+# Every gunicorn thread keeps its connection open between requests, so the
+# workers * threads connections form a pool of that size; keep it below the
+# server's max_connections. Health checks replace connections that died
+# while idle before a request uses them.
+DATABASES["default"].update({
+    "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+    "CONN_HEALTH_CHECKS": True,
+})
+
+# Throttle counters shared by all workers of the host.
+THROTTLE_STORE = {
+    "BACKEND": os.environ.get(
+        "THROTTLE_STORE_BACKEND", "airport.throttling.SQLiteCounterStore"
+    ),
+    "LOCATION": os.environ.get(
+        "THROTTLE_STORE_LOCATION",
+        os.path.join(tempfile.gettempdir(), "airport-throttle.sqlite3"),
+    ),
+}
+
+# Token revocations, seat map and reference data versions and the
+# itinerary index version have to reach every worker of the host, so each
+# cache defaults to a directory shared by them; set the *_CACHE_BACKEND and
+# *_CACHE_LOCATION variables to use Redis across hosts.
+for alias, directory in (
+    ("default", "airport-default"),
+    ("reference", "airport-reference"),
+    ("auth", "airport-auth"),
+):
+    prefix = alias.upper()
+    CACHES[alias].update({
+        "BACKEND": os.environ.get(
+            f"{prefix}_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            f"{prefix}_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), directory),
+        ),
+    })
+    CACHES[alias].setdefault("OPTIONS", {}).setdefault(
+        "MAX_ENTRIES", 100_000
+    )
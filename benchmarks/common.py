@@ -0,0 +1,54 @@
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_service.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Runs the benchmark against a throwaway test database created from the
+    configured one, so real data is never touched.
+    """
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def report(title, rows, headers):
+    print(title)
+    widths = [
+        max(len(str(value)) for value in column)
+        for column in zip(headers, *rows)
+    ]
+    for row in (headers, *rows):
+        print("  ".join(
+            str(value).rjust(width) for value, width in zip(row, widths)
+        ))
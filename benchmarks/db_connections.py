@@ -0,0 +1,93 @@
+"""
+Request latency through the full WSGI handler with a new database
+connection per request (``CONN_MAX_AGE=0``, the default settings) and with
+persistent, health-checked connections (``settings_prod``). Run it against
+Postgres; sqlite connections are nearly free.
+
+    python -m benchmarks.db_connections --repeat 200
+"""
+import argparse
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.common import measure, report, setup_django, test_database
+from benchmarks.serializers import seed
+
+PATHS = (
+    "/api/airport/airports/",
+    "/api/airport/flights/?page_size=10",
+    "/api/airport/orders/?page_size=10",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--conn-max-age", type=int, default=600)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    handler = WSGIHandler()
+    opened = []
+    connection_created.connect(
+        lambda **kwargs: opened.append(1), weak=False
+    )
+    no_throttling = override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_CLASSES": [],
+        }
+    )
+
+    with test_database(), no_throttling:
+        user = seed(flights=100, routes=50, airplanes=20, tickets_per_order=5)
+        token = str(AccessToken.for_user(user))
+
+        def request(path):
+            path, _, query = path.partition("?")
+            environ = {
+                "HTTP_HOST": "testserver",
+                "PATH_INFO": path,
+                "QUERY_STRING": query,
+                "HTTP_AUTHORIZATION": f"Bearer {token}",
+            }
+            setup_testing_defaults(environ)
+            response = handler(environ, lambda status, headers: None)
+            assert response.status_code == 200, response.content
+            response.close()
+
+        rows = []
+        modes = (
+            ("per request", 0, False),
+            ("persistent", args.conn_max_age, True),
+        )
+        for path in PATHS:
+            for mode, max_age, health_checks in modes:
+                connection.close()
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+                connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+                request(path)
+                opened.clear()
+                median = measure(lambda: request(path), repeat=args.repeat)
+                rows.append((
+                    path,
+                    mode,
+                    f"{median:.2f}",
+                    f"{len(opened) / args.repeat:.2f}",
+                ))
+
+    report(
+        f"{connection.vendor}, median of {args.repeat} requests",
+        rows,
+        ("path", "connections", "ms", "connects/request"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Times 2-stop itinerary searches over a synthetic schedule.
+
+    python -m benchmarks.itineraries --flights 100000 --airports 300
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import measure, report, setup_django, test_database
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(flights, airports, days, rng):
+    from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+
+    airport_objs = Airport.objects.bulk_create(
+        Airport(name=f"Airport {index}", closest_big_city=f"City {index}")
+        for index in range(airports)
+    )
+    routes = Route.objects.bulk_create(
+        Route(source=source, destination=destination, distance=1000)
+        for source in airport_objs
+        for destination in rng.sample(airport_objs, 10)
+        if source != destination
+    )
+    airplane = Airplane.objects.create(
+        name="Bench",
+        rows=30,
+        seats_in_row=6,
+        airplane_type=AirplaneType.objects.create(name="Bench"),
+    )
+
+    def make_flight():
+        departure = START + timedelta(minutes=rng.randrange(days * 24 * 60))
+        return Flight(
+            route=rng.choice(routes),
+            airplane=airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(minutes=rng.randrange(60, 600)),
+        )
+
+    Flight.objects.bulk_create(
+        (make_flight() for _ in range(flights)), batch_size=5000
+    )
+    return [airport.id for airport in airport_objs]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flights", type=int, default=100_000)
+    parser.add_argument("--airports", type=int, default=300)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--searches", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from airport.itineraries import ItineraryIndex
+
+    rng = random.Random(42)
+    with test_database():
+        airport_ids = seed(args.flights, args.airports, args.days, rng)
+        index = ItineraryIndex()
+
+        started = time.perf_counter()
+        index._refresh()
+        build_ms = (time.perf_counter() - started) * 1000
+
+        rows = []
+        for max_stops in (0, 1, 2):
+            pairs = [
+                tuple(rng.sample(airport_ids, 2))
+                for _ in range(args.searches)
+            ]
+            day = START + timedelta(days=args.days // 2)
+            results = []
+
+            def run():
+                source, destination = pairs[len(results) % len(pairs)]
+                results.append(index.search(
+                    source,
+                    destination,
+                    day,
+                    day + timedelta(days=1),
+                    max_stops=max_stops,
+                ))
+
+            median = measure(run, repeat=args.searches)
+            found = sum(1 for result in results if result)
+            rows.append(
+                (max_stops, f"{median:.2f}", f"{found}/{len(results)}")
+            )
+
+        report(
+            f"{args.flights} flights, {args.airports} airports, "
+            f"index built in {build_ms:.0f} ms (median search ms)",
+            rows,
+            ("max_stops", "search", "found"),
+        )
+
+
+if __name__ == "__main__":
+    main()
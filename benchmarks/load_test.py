@@ -0,0 +1,240 @@
+"""
+Load test of the sync (WSGI) read endpoints against the async (ASGI) ones.
+Starts each server as a single process on the configured database, logs in
+as an existing user and keeps ``--concurrency`` keep-alive connections
+busy for ``--duration`` seconds per endpoint.
+
+    python -m benchmarks.load_test --email=<email> --password=<password>
+
+The database needs a few flights (e.g. from ``manage.py import_schedule``).
+Throttling is relaxed for the servers started by this script.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import report
+
+SERVERS = {
+    "wsgi": (
+        [sys.executable, "manage.py", "runserver", "--noreload"],
+        "{host}:{port}",
+        "/api/airport/",
+    ),
+    "asgi": (
+        [
+            sys.executable, "-m", "uvicorn",
+            "airport_service.asgi:application",
+            "--no-access-log", "--log-level", "warning",
+        ],
+        "--host={host} --port={port}",
+        "/api/airport/async/",
+    ),
+}
+ENDPOINTS = (
+    "flights/",
+    "flights/{flight_id}/",
+    "flights/{flight_id}/seat-map/",
+    "airports/",
+)
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client, enough for JSON GETs."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=b""):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Content-Length: {len(body)}",
+            *(f"{name}: {value}" for name, value in (headers or {}).items()),
+        ]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while line := (await self.reader.readline()).strip():
+            name, value = line.decode().split(":", 1)
+            response_headers[name.lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            content = await self.reader.readexactly(
+                int(response_headers["content-length"])
+            )
+        elif response_headers.get("transfer-encoding") == "chunked":
+            content = b""
+            while size := int((await self.reader.readline()).strip(), 16):
+                content += await self.reader.readexactly(size)
+                await self.reader.readline()
+            await self.reader.readline()
+        else:
+            content = await self.reader.read()
+            self.close()
+        if response_headers.get("connection") == "close":
+            self.close()
+        return status, content
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+        else:
+            writer.close()
+            return
+
+
+async def login(host, port, email, password):
+    connection = Connection(host, port)
+    status, content = await connection.request(
+        "POST",
+        "/api/user/token/",
+        {"Content-Type": "application/json"},
+        json.dumps({"email": email, "password": password}).encode(),
+    )
+    connection.close()
+    if status != 200:
+        raise SystemExit(f"Login failed ({status}): {content[:200]}")
+    return json.loads(content)["access"]
+
+
+async def hammer(host, port, path, headers, concurrency, duration, timeout):
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def client():
+        nonlocal errors
+        connection = Connection(host, port)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                status, _ = await asyncio.wait_for(
+                    connection.request("GET", path, headers), timeout
+                )
+            except (OSError, ValueError, IndexError,
+                    asyncio.IncompleteReadError, asyncio.TimeoutError):
+                connection.close()
+                errors += 1
+                continue
+            if status != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        connection.close()
+
+    started = time.monotonic()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    if not latencies:
+        return 0, 0, 0, errors
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return (
+        len(latencies) / elapsed,
+        statistics.median(latencies) * 1000,
+        p99 * 1000,
+        errors,
+    )
+
+
+async def run_server(name, args):
+    command, address, prefix = SERVERS[name]
+    address = address.format(host=args.host, port=args.port).split()
+    env = {
+        **os.environ,
+        "ALLOWED_HOSTS": args.host,
+        "ANON_THROTTLE_RATE": "1000000/second",
+        "USER_THROTTLE_RATE": "1000000/second",
+    }
+    server = subprocess.Popen(
+        command + address,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    rows = []
+    try:
+        await wait_for_port(args.host, args.port)
+        token = await login(args.host, args.port, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        connection = Connection(args.host, args.port)
+        _, content = await connection.request(
+            "GET", f"{prefix}flights/?page_size=1", headers
+        )
+        connection.close()
+        results = json.loads(content)["results"]
+        if not results:
+            raise SystemExit("No flights in the database to load test.")
+
+        for endpoint in ENDPOINTS:
+            path = prefix + endpoint.format(flight_id=results[0]["id"])
+            rps, p50, p99, errors = await hammer(
+                args.host,
+                args.port,
+                path,
+                headers,
+                args.concurrency,
+                args.duration,
+                args.timeout,
+            )
+            rows.append((
+                name, path, f"{rps:.0f}", f"{p50:.1f}", f"{p99:.1f}", errors
+            ))
+    finally:
+        server.terminate()
+        server.wait()
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument(
+        "--timeout", type=float, default=30, help="per request, in seconds"
+    )
+    parser.add_argument(
+        "--servers", nargs="+", choices=SERVERS, default=list(SERVERS)
+    )
+    args = parser.parse_args()
+
+    rows = []
+    for name in args.servers:
+        rows.extend(await run_server(name, args))
+    report(
+        f"{args.concurrency} connections, {args.duration:g}s per endpoint",
+        rows,
+        ("server", "path", "req/s", "p50 ms", "p99 ms", "errors"),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""
+Latency of the flight list while other clients keep logging in. Starts a
+server per hasher configuration on the configured database, measures the
+flight list alone and then next to ``--logins`` clients posting to
+``/api/user/token/`` as fast as they can.
+
+    python -m benchmarks.login_storm --email=<email> --password=<password>
+
+The user's password is rehashed with each configuration's hasher on its
+first login. Throttling is relaxed for the servers started by this script.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import report
+from benchmarks.load_test import Connection, hammer, login, wait_for_port
+
+CONFIGURATIONS = (
+    ("pbkdf2", 0),
+    ("scrypt", 0),
+    ("scrypt", 1),
+    ("argon2", 1),
+)
+
+
+async def storm(host, port, email, password, clients, stop):
+    """Log in from ``clients`` connections until ``stop`` is set."""
+    body = json.dumps({"email": email, "password": password}).encode()
+    headers = {"Content-Type": "application/json"}
+    statuses = {}
+
+    async def client():
+        connection = Connection(host, port)
+        while not stop.is_set():
+            try:
+                status, _ = await connection.request(
+                    "POST", "/api/user/token/", headers, body
+                )
+            except (OSError, ValueError, IndexError,
+                    asyncio.IncompleteReadError):
+                connection.close()
+                status = "error"
+            statuses[status] = statuses.get(status, 0) + 1
+        connection.close()
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return statuses
+
+
+async def run_server(hasher, workers, args):
+    env = {
+        **os.environ,
+        "ALLOWED_HOSTS": args.host,
+        "ANON_THROTTLE_RATE": "1000000/second",
+        "USER_THROTTLE_RATE": "1000000/second",
+        "SEARCH_THROTTLE_RATE": "1000000/second",
+        "PASSWORD_HASHER": hasher,
+        "PASSWORD_HASH_WORKERS": str(workers),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, "manage.py", "runserver", "--noreload",
+            f"{args.host}:{args.port}",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    rows = []
+    try:
+        await wait_for_port(args.host, args.port)
+        token = await login(args.host, args.port, args.email, args.password)
+        for clients in (0, args.logins):
+            stop = asyncio.Event()
+            logins = asyncio.create_task(storm(
+                args.host, args.port, args.email, args.password,
+                clients, stop,
+            ))
+            started = time.monotonic()
+            rps, p50, p99, errors = await hammer(
+                args.host,
+                args.port,
+                "/api/airport/flights/",
+                {"Authorization": f"Bearer {token}"},
+                args.concurrency,
+                args.duration,
+                timeout=30,
+            )
+            stop.set()
+            statuses = await logins
+            elapsed = time.monotonic() - started
+            ok = statuses.pop(200, 0)
+            rows.append((
+                hasher,
+                workers or "inline",
+                clients,
+                f"{rps:.0f}",
+                f"{p50:.1f}",
+                f"{p99:.1f}",
+                errors,
+                f"{ok / elapsed:.0f}",
+                sum(statuses.values()),
+            ))
+    finally:
+        server.terminate()
+        server.wait()
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for hasher, workers in CONFIGURATIONS:
+        if hasher == "argon2" and not importlib.util.find_spec("argon2"):
+            continue
+        rows.extend(await run_server(hasher, workers, args))
+    report(
+        f"flight list at {args.concurrency} connections, "
+        f"{args.duration:g}s per run",
+        rows,
+        ("hasher", "hash workers", "login clients", "req/s", "p50 ms",
+         "p99 ms", "errors", "logins/s", "failed logins"),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Compares the latency of fetching page N of /orders/ with offset
+(page number) and keyset (cursor) pagination.
+
+    python -m benchmarks.pagination --orders 200000
+"""
+import argparse
+
+from benchmarks.common import measure, report, setup_django, test_database
+
+
+def seed(orders):
+    from datetime import timedelta
+
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from airport.models import Order
+
+    user = get_user_model().objects.create_user("bench@bench.com", "bench")
+    now = timezone.now()
+    created_at = Order._meta.get_field("created_at")
+    created_at.auto_now_add = False
+    try:
+        Order.objects.bulk_create(
+            (
+                Order(user=user, created_at=now - timedelta(seconds=index))
+                for index in range(orders)
+            ),
+            batch_size=5000,
+        )
+    finally:
+        created_at.auto_now_add = True
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 5000]
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from airport.models import Order
+    from airport.pagination import OrderPagination, Pagination
+
+    factory = APIRequestFactory()
+
+    with test_database():
+        user = seed(args.orders)
+        queryset = Order.objects.filter(user=user)
+
+        def offset_page(page):
+            paginator = Pagination()
+            request = Request(
+                factory.get(
+                    "/", {"page": page, "page_size": args.page_size}
+                )
+            )
+            paginator.page_size = args.page_size
+            return paginator.paginate_queryset(queryset, request)
+
+        def keyset_page(cursor):
+            paginator = OrderPagination()
+            params = {"page_size": args.page_size}
+            if cursor:
+                params["cursor"] = cursor
+            request = Request(factory.get("/", params))
+            paginator.paginate_queryset(queryset, request)
+            return paginator
+
+        rows = []
+        cursors = {1: None}
+        paginator = keyset_page(None)
+        for page in range(2, max(args.pages) + 1):
+            if paginator.next_position is None:
+                break
+            cursors[page] = paginator.encode_cursor(paginator.next_position)
+            paginator = keyset_page(cursors[page])
+
+        for page in args.pages:
+            if page not in cursors:
+                continue
+            rows.append((
+                page,
+                f"{measure(lambda: offset_page(page)):.2f}",
+                f"{measure(lambda: keyset_page(cursors[page])):.2f}",
+            ))
+
+        report(
+            f"{args.orders} orders, page size {args.page_size} "
+            f"(median ms)",
+            rows,
+            ("page", "offset", "keyset"),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compares DRF's JSONRenderer with FastJSONRenderer on list payloads shaped
+like the flight and route list responses.
+
+    python -m benchmarks.renderers
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import measure, report, setup_django
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def flight_page(size):
+    return {
+        "next": "http://localhost:8000/api/airport/flights/?cursor="
+                "WyIyMDI0LTAxLTAxVDEyOjMwOjAwWiIsIDEyXQ==",
+        "results": [
+            {
+                "id": index,
+                "route": {
+                    "id": index % 50,
+                    "source": f"Airport {index % 50}",
+                    "destination": f"Airport {index % 50 + 1}",
+                    "distance": 1000 + index,
+                },
+                "airplane": f"Airplane {index % 20}",
+                "departure_time": (
+                    START + timedelta(hours=index)
+                ).isoformat().replace("+00:00", "Z"),
+                "arrival_time": (
+                    START + timedelta(hours=index + 2)
+                ).isoformat().replace("+00:00", "Z"),
+                "crew_members": [
+                    f"Crew {member}" for member in range(index % 5 + 2)
+                ],
+                "capacity": 180,
+                "tickets_available": 180 - index % 180,
+            }
+            for index in range(size)
+        ],
+    }
+
+
+def route_list(size):
+    return [
+        {
+            "id": index,
+            "source": f"Airport {index}",
+            "destination": f"Airport {index + 1}",
+            "distance": 1000 + index,
+        }
+        for index in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from airport import renderers
+    from airport.renderers import FastJSONRenderer
+
+    class PreEncodedResponse:
+        pre_encoded_content = None
+
+    payloads = (
+        ("flights page of 10", flight_page(10)),
+        ("flights page of 100", flight_page(100)),
+        ("500 routes", route_list(500)),
+        ("5000 routes", route_list(5000)),
+    )
+
+    rows = []
+    for name, payload in payloads:
+        expected = JSONRenderer().render(payload)
+        assert FastJSONRenderer().render(payload) == expected, name
+        response = PreEncodedResponse()
+        response.pre_encoded_content = expected
+
+        def drf():
+            return JSONRenderer().render(payload)
+
+        def fast():
+            return FastJSONRenderer().render(payload)
+
+        def pre_encoded():
+            return FastJSONRenderer().render(
+                payload, renderer_context={"response": response}
+            )
+
+        rows.append((
+            name,
+            f"{len(expected) / 1024:.0f}",
+            f"{measure(drf, args.repeat):.3f}",
+            f"{measure(fast, args.repeat):.3f}",
+            f"{measure(pre_encoded, args.repeat):.4f}",
+        ))
+
+    report(
+        f"Render time, median ms "
+        f"(fast encoder: {'orjson' if renderers.orjson else 'stdlib'})",
+        rows,
+        ("payload", "KiB", "JSONRenderer", "FastJSONRenderer", "pre-encoded"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Times a bulk timetable import through ``ScheduleImporter``.
+
+    python -m benchmarks.schedule_import --flights 100000
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import report, setup_django, test_database
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(airports, crew, rng):
+    from airport.models import Airplane, AirplaneType, Airport, Crew, Route
+
+    airport_objs = Airport.objects.bulk_create(
+        Airport(name=f"Airport {index}", closest_big_city=f"City {index}")
+        for index in range(airports)
+    )
+    Route.objects.bulk_create(
+        Route(source=source, destination=destination, distance=1000)
+        for source in airport_objs
+        for destination in rng.sample(airport_objs, 10)
+        if source != destination
+    )
+    airplane_type = AirplaneType.objects.create(name="Bench")
+    Airplane.objects.bulk_create(
+        Airplane(
+            name=f"Bench {index}",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=airplane_type,
+        )
+        for index in range(50)
+    )
+    Crew.objects.bulk_create(
+        Crew(first_name="Crew", last_name=str(index)) for index in range(crew)
+    )
+
+
+def timetable(flights, rng):
+    from airport.models import Airplane, Crew, Route
+
+    routes = list(
+        Route.objects.values_list("source__name", "destination__name")
+    )
+    airplanes = list(Airplane.objects.values_list("name", flat=True))
+    crew = [
+        f"{first_name} {last_name}"
+        for first_name, last_name
+        in Crew.objects.values_list("first_name", "last_name")
+    ]
+    # Airplanes and crew can't be on overlapping flights, so every airplane
+    # flies back to back with crew from a pool of its own.
+    pools = [crew[index::len(airplanes)] for index in range(len(airplanes))]
+    clocks = [START] * len(airplanes)
+    for index in range(flights):
+        airplane = index % len(airplanes)
+        source, destination = rng.choice(routes)
+        departure = clocks[airplane] + timedelta(
+            minutes=rng.randrange(30, 240)
+        )
+        arrival = departure + timedelta(minutes=rng.randrange(60, 600))
+        clocks[airplane] = arrival
+        yield json.dumps({
+            "source": source,
+            "destination": destination,
+            "airplane": airplanes[airplane],
+            "departure_time": departure.isoformat(),
+            "arrival_time": arrival.isoformat(),
+            "crew_members": rng.sample(pools[airplane], 4),
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flights", type=int, default=100_000)
+    parser.add_argument("--airports", type=int, default=300)
+    parser.add_argument("--crew", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from airport.models import Flight
+    from airport.schedule_import import ScheduleImporter, read_rows
+
+    rng = random.Random(42)
+    with test_database():
+        seed(args.airports, args.crew, rng)
+        lines = list(timetable(args.flights, rng))
+
+        result = ScheduleImporter(chunk_size=args.chunk_size).run(
+            read_rows(lines, "ndjson")
+        )
+        assert Flight.objects.count() == args.flights, result.errors[:5]
+
+        report(
+            f"Imported {args.flights} flights with 4 crew members each",
+            [[
+                result.created,
+                f"{result.seconds:.1f}",
+                f"{result.rate:.0f}",
+            ]],
+            ["flights", "seconds", "flights/s"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Compares DRF serializers with the fast ``.values()`` serializers on the
+list endpoints: requests per second and peak memory allocated per request.
+
+    python -m benchmarks.serializers --flights 100 --routes 500
+"""
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import measure, report, setup_django, test_database
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(flights, routes, airplanes, tickets_per_order):
+    from django.contrib.auth import get_user_model
+
+    from airport.models import (
+        Airplane,
+        AirplaneType,
+        Airport,
+        Crew,
+        Flight,
+        Order,
+        Route,
+        Ticket,
+    )
+
+    airports = Airport.objects.bulk_create(
+        Airport(name=f"Airport {index}", closest_big_city=f"City {index}")
+        for index in range(routes + 1)
+    )
+    route_objs = Route.objects.bulk_create(
+        Route(source=source, destination=destination, distance=1000)
+        for source, destination in zip(airports, airports[1:])
+    )
+    airplane_type = AirplaneType.objects.create(name="Bench")
+    airplane_objs = Airplane.objects.bulk_create(
+        Airplane(
+            name=f"Bench {index}",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=airplane_type,
+        )
+        for index in range(airplanes)
+    )
+    crew = Crew.objects.bulk_create(
+        Crew(first_name="Crew", last_name=str(index)) for index in range(20)
+    )
+    flight_objs = Flight.objects.bulk_create(
+        Flight(
+            route=route_objs[index % len(route_objs)],
+            airplane=airplane_objs[index % len(airplane_objs)],
+            departure_time=START + timedelta(hours=index),
+            arrival_time=START + timedelta(hours=index + 2),
+        )
+        for index in range(flights)
+    )
+    Flight.crew_members.through.objects.bulk_create(
+        Flight.crew_members.through(flight_id=flight.id, crew_id=member.id)
+        for index, flight in enumerate(flight_objs)
+        for member in crew[index % 10:index % 10 + 4]
+    )
+
+    user = get_user_model().objects.create_user("bench@bench.com", "bench")
+    orders = Order.objects.bulk_create(
+        Order(user=user) for _ in range(flights)
+    )
+    Ticket.objects.bulk_create(
+        Ticket(flight=flight, order=order, row=1, seat=seat)
+        for flight, order in zip(flight_objs, orders)
+        for seat in range(1, tickets_per_order + 1)
+    )
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flights", type=int, default=100)
+    parser.add_argument("--routes", type=int, default=500)
+    parser.add_argument("--airplanes", type=int, default=200)
+    parser.add_argument("--tickets-per-order", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import caches
+    from django.test import override_settings
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from airport.views import (
+        AirplaneViewSet,
+        FlightViewSet,
+        OrderViewSet,
+        RouteViewSet,
+    )
+
+    factory = APIRequestFactory()
+    endpoints = (
+        ("flights", FlightViewSet, {"page_size": 100}),
+        ("orders", OrderViewSet, {"page_size": 100}),
+        ("routes", RouteViewSet, {}),
+        ("airplanes", AirplaneViewSet, {}),
+    )
+
+    with test_database():
+        user = seed(
+            args.flights, args.routes, args.airplanes, args.tickets_per_order
+        )
+
+        def run(viewset, params):
+            for cache in caches.all():
+                cache.clear()
+            view = viewset.as_view({"get": "list"}, throttle_classes=())
+            request = factory.get("/", params)
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            return response.content
+
+        def peak_kib(viewset, params):
+            tracemalloc.start()
+            try:
+                run(viewset, params)
+                return tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+
+        rows = []
+        for name, viewset, params in endpoints:
+            results = {}
+            for fast in (False, True):
+                with override_settings(FAST_LIST_SERIALIZERS=fast):
+                    content = run(viewset, params)
+                    median = measure(
+                        lambda: run(viewset, params), repeat=args.repeat
+                    )
+                    peak = peak_kib(viewset, params)
+                    results[fast] = (content, median, peak)
+            assert results[False][0] == results[True][0], name
+            rows.append((
+                name,
+                f"{1000 / results[False][1]:.0f}",
+                f"{1000 / results[True][1]:.0f}",
+                f"{results[False][2]:.0f}",
+                f"{results[True][2]:.0f}",
+            ))
+
+        report(
+            f"{args.flights} flights and orders of {args.tickets_per_order} "
+            f"tickets, {args.routes} routes, {args.airplanes} airplanes",
+            rows,
+            ("endpoint", "drf req/s", "fast req/s", "drf KiB", "fast KiB"),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Time per throttle check of DRF's UserRateThrottle (timestamp history in the
+cache) and the sliding-window UserThrottle on each counter store, for a
+client that keeps hitting its limit.
+
+    python -m benchmarks.throttling --checks 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checks", type=int, default=20_000)
+    parser.add_argument(
+        "--rates", nargs="+", default=["30/day", "1000/minute"]
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test import override_settings
+    from rest_framework.throttling import UserRateThrottle
+
+    from airport.throttling import UserThrottle, get_store
+
+    request = SimpleNamespace(
+        user=SimpleNamespace(pk=1, is_authenticated=True), META={}
+    )
+
+    def microseconds_per_check(throttle_class, rate):
+        throttle = throttle_class()
+        throttle.rate = rate
+        throttle.num_requests, throttle.duration = throttle.parse_rate(rate)
+        started = time.perf_counter()
+        for _ in range(args.checks):
+            throttle.allow_request(request, None)
+        return (time.perf_counter() - started) / args.checks * 1_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = (
+            ("drf history, locmem", UserRateThrottle, None),
+            (
+                "sliding window, locmem",
+                UserThrottle,
+                {
+                    "BACKEND": "airport.throttling.CacheCounterStore",
+                    "LOCATION": "default",
+                },
+            ),
+            (
+                "sliding window, sqlite",
+                UserThrottle,
+                {
+                    "BACKEND": "airport.throttling.SQLiteCounterStore",
+                    "LOCATION": os.path.join(directory, "throttle.sqlite3"),
+                },
+            ),
+        )
+        rows = []
+        for name, throttle_class, store in stores:
+            row = [name]
+            for rate in args.rates:
+                cache.clear()
+                with override_settings(THROTTLE_STORE=store or {}):
+                    if store:
+                        get_store().clear()
+                    row.append(
+                        f"{microseconds_per_check(throttle_class, rate):.1f}"
+                    )
+            rows.append(row)
+
+    report(
+        f"µs per check, {args.checks} checks by one client",
+        rows,
+        ("throttle", *args.rates),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+wsgi_app = "airport_service.wsgi:application"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Threads let a worker overlap requests waiting on Postgres; each thread
+# holds one persistent database connection (see settings_prod).
+worker_class = "gthread"
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap slow memory growth.
+max_requests = 1000
+max_requests_jitter = 100
+
+# Heartbeat files on tmpfs, disk-backed /tmp can stall workers in Docker.
+worker_tmp_dir = "/dev/shm"
+accesslog = "-"
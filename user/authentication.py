@@ -0,0 +1,168 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+ISSUED_AT_CLAIM = "issued_at"
+
+REVOKED_KEY = "user:revoked:{user_id}"
+VERSION_KEY = "user:version:{user_id}"
+
+
+def get_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def get_state(user_id):
+    """
+    When the user's tokens were last revoked (``None`` if they weren't,
+    or the marker expired along with every token it revoked), and the
+    user's row version. Cached ``User`` objects are only used with the
+    current version; it is random, so a version lost from the cache only
+    costs a reload.
+    """
+    cache = get_cache()
+    revoked_key = REVOKED_KEY.format(user_id=user_id)
+    version_key = VERSION_KEY.format(user_id=user_id)
+    state = cache.get_many([revoked_key, version_key])
+    if version_key not in state:
+        cache.add(version_key, uuid.uuid4().hex, None)
+        state[version_key] = cache.get(version_key)
+    return state.get(revoked_key), state[version_key]
+
+
+def revoke_tokens(user_id):
+    """
+    Reject the tokens issued to the user so far. The marker lives as long
+    as the longest-lived of them, so losing the cache never revokes
+    anything, it can only forget a revocation.
+    """
+    get_cache().set(
+        REVOKED_KEY.format(user_id=user_id),
+        time.time(),
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds(),
+    )
+    bump_version(user_id)
+
+
+def bump_version(user_id):
+    get_cache().set(
+        VERSION_KEY.format(user_id=user_id), uuid.uuid4().hex, None
+    )
+
+
+def _check_issued_at(token, revoked_at):
+    if revoked_at is not None and token[ISSUED_AT_CLAIM] <= revoked_at:
+        raise AuthenticationFailed(
+            _("Token has been revoked"), code="token_revoked"
+        )
+
+
+def check_revoked(token):
+    """Reject ``token`` if its user's tokens were revoked since."""
+    if ISSUED_AT_CLAIM not in token:
+        return
+    revoked_at, _version = get_state(token[api_settings.USER_ID_CLAIM])
+    _check_issued_at(token, revoked_at)
+
+
+class UserCache:
+    """
+    Per-process LRU of recently used ``User`` rows, each kept with the row
+    version it was loaded at and reloaded once the version moves on.
+    """
+
+    def __init__(self):
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._users.move_to_end(user_id)
+                return copy.copy(entry[1])
+
+        try:
+            user = get_user_model().objects.get(pk=user_id)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+
+        with self._lock:
+            self._users[user_id] = (version, user)
+            self._users.move_to_end(user_id)
+            while len(self._users) > settings.AUTH_USER_CACHE_SIZE:
+                self._users.popitem(last=False)
+        return copy.copy(user)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class StatelessUser(TokenUser):
+    """
+    ``request.user`` built from the claims of an access token. Permissions
+    only need ``is_staff``, which the token carries; views that need the
+    ``User`` row get it from ``instance``.
+    """
+
+    def __init__(self, token, version):
+        super().__init__(token)
+        self.version = version
+
+    @cached_property
+    def instance(self):
+        return user_cache.get(self.id, self.version)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without a ``user_user`` query. Each request costs one
+    ``get_many`` on the ``AUTH_CACHE_ALIAS`` cache for the revocation check,
+    which only works across workers when that cache is shared. Tokens issued
+    without the claims are authenticated against the database as before.
+    """
+
+    def get_user(self, validated_token):
+        if ISSUED_AT_CLAIM not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        revoked_at, version = get_state(
+            validated_token[api_settings.USER_ID_CLAIM]
+        )
+        _check_issued_at(validated_token, revoked_at)
+        return StatelessUser(validated_token, version)
+
+
+def get_request_user(request):
+    """The ``User`` row of ``request.user``."""
+    if isinstance(request.user, StatelessUser):
+        return request.user.instance
+    return request.user
@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins at the moment, try again shortly."
+    default_code = "hashing_busy"
+
+
+class HashPool:
+    """
+    ``PASSWORD_HASH_WORKERS`` threads that compute every password hash of
+    the process, so a burst of sign-ups or logins keeps at most that many
+    cores busy and leaves the rest to other requests. Callers wait for their
+    hash; once ``PASSWORD_HASH_QUEUE`` of them are waiting, further ones
+    fail with ``HashingBusy``. The hash functions release the GIL, so
+    threads run them in parallel.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._slots = None
+
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                self._slots = threading.BoundedSemaphore(
+                    settings.PASSWORD_HASH_WORKERS
+                    + settings.PASSWORD_HASH_QUEUE
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                    initializer=self._mark_pool_thread,
+                )
+            return self._executor, self._slots
+
+    def _mark_pool_thread(self):
+        self._local.in_pool = True
+
+    def run(self, func, *args, **kwargs):
+        if (
+            not settings.PASSWORD_HASH_WORKERS
+            or getattr(self._local, "in_pool", False)
+        ):
+            return func(*args, **kwargs)
+
+        executor, slots = self._start()
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            return executor.submit(func, *args, **kwargs).result()
+        finally:
+            slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = self._slots = None
+
+
+hash_pool = HashPool()
+
+
+def _reset_pool(setting, **kwargs):
+    if setting in ("PASSWORD_HASH_WORKERS", "PASSWORD_HASH_QUEUE"):
+        hash_pool.shutdown()
+
+
+setting_changed.connect(_reset_pool)
+
+
+class PooledHasherMixin:
+    """Computes hashes in the ``hash_pool``."""
+
+    def encode(self, *args, **kwargs):
+        return hash_pool.run(super().encode, *args, **kwargs)
+
+    def verify(self, *args, **kwargs):
+        return hash_pool.run(super().verify, *args, **kwargs)
+
+
+def tuned_param(name):
+    """
+    Cost parameter read from ``PASSWORD_HASH_PARAMS[algorithm]``. Hashes
+    made with other values are redone on the next login.
+    """
+    return property(
+        lambda self: settings.PASSWORD_HASH_PARAMS[self.algorithm][name]
+    )
+
+
+class ScryptPasswordHasher(PooledHasherMixin, hashers.ScryptPasswordHasher):
+    work_factor = tuned_param("work_factor")
+    block_size = tuned_param("block_size")
+    parallelism = tuned_param("parallelism")
+    # Also bounds the hashes that can be verified, so it has to cover the
+    # work factors of stored hashes too.
+    maxmem = tuned_param("maxmem")
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    time_cost = tuned_param("time_cost")
+    memory_cost = tuned_param("memory_cost")
+    parallelism = tuned_param("parallelism")
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    pass
@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import (
     AbstractUser,
     BaseUserManager,
@@ -43,3 +44,34 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    # Saving a change to any of these revokes the user's tokens.
+    AUTH_FIELDS = ("password", "is_active", "is_staff", "is_superuser")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user.reset_auth_fields()
+        return user
+
+    def _auth_field_values(self):
+        return tuple(self.__dict__.get(field) for field in self.AUTH_FIELDS)
+
+    def reset_auth_fields(self):
+        self._loaded_auth_fields = self._auth_field_values()
+
+    def auth_fields_changed(self):
+        return self._auth_field_values() != getattr(
+            self, "_loaded_auth_fields", None
+        )
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            # Rehashing with the current hasher keeps the password, and
+            # with it the user's tokens.
+            self.set_password(raw_password)
+            self._password = None
+            self.reset_auth_fields()
+            self.save(update_fields=["password"])
+
+        return check_password(raw_password, self.password, setter)
@@ -1,5 +1,9 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+
+from user.authentication import check_revoked
+from user.tokens import RefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -20,3 +24,15 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        check_revoked(self.token_class(attrs["refresh"]))
+        return super().validate(attrs)
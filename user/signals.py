@@ -0,0 +1,28 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user import authentication
+
+
+@receiver(post_save, sender=get_user_model())
+def update_auth_state(sender, instance, created, **kwargs):
+    # After commit, so a request racing the write can't cache the old row
+    # under the new version.
+    if not created and instance.auth_fields_changed():
+        transaction.on_commit(
+            partial(authentication.revoke_tokens, instance.pk)
+        )
+    else:
+        transaction.on_commit(
+            partial(authentication.bump_version, instance.pk)
+        )
+    instance.reset_auth_fields()
+
+
+@receiver(post_delete, sender=get_user_model())
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    transaction.on_commit(partial(authentication.revoke_tokens, instance.pk))
@@ -0,0 +1,195 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken as LegacyAccessToken
+
+from airport.tests.test_flight_api import sample_flight
+from user.authentication import (
+    ISSUED_AT_CLAIM,
+    REVOKED_KEY,
+    revoke_tokens,
+    user_cache,
+)
+from user.tokens import AccessToken
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+ME_URL = reverse("user:manage")
+TOKEN_URL = reverse("user:token_obtain_pair")
+REFRESH_URL = reverse("user:token_refresh")
+
+
+def user_queries(queries):
+    return [
+        query for query in queries
+        if '"user_user"' in query["sql"] and "INSERT" not in query["sql"]
+    ]
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["auth"].clear()
+        user_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.client = APIClient()
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_token_carries_claims(self):
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+        token = AccessToken(response.data["access"])
+
+        self.assertIs(token["is_staff"], False)
+        self.assertIn(ISSUED_AT_CLAIM, token)
+
+    def test_read_only_request_skips_user_query(self):
+        sample_flight()
+        self.authorize(AccessToken.for_user(self.user))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(queries.captured_queries), [])
+
+    def test_staff_claim_grants_write_access(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.authorize(AccessToken.for_user(self.user))
+
+        response = self.client.post(reverse("airport:crew-list"), {
+            "first_name": "Test", "last_name": "Crew",
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_user_row_is_cached_between_requests(self):
+        self.authorize(AccessToken.for_user(self.user))
+        self.client.get(ME_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data["email"], "test@test.com")
+        self.assertEqual(user_queries(queries.captured_queries), [])
+
+    def test_cached_user_is_reloaded_after_update(self):
+        self.authorize(AccessToken.for_user(self.user))
+        self.client.get(ME_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(ME_URL, {"email": "new@test.com"})
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "new@test.com")
+
+    def test_order_is_created_for_token_user(self):
+        flight = sample_flight()
+        self.authorize(AccessToken.for_user(self.user))
+
+        response = self.client.post(ORDER_URL, {
+            "tickets": [{"row": 1, "seat": 1, "flight": flight.id}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.user.orders.count(), 1)
+
+    def test_password_change_revokes_tokens(self):
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+        self.authorize(response.data["access"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(ME_URL, {"password": "newpass"})
+
+        self.assertEqual(
+            self.client.get(FLIGHT_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.client.post(
+                REFRESH_URL, {"refresh": response.data["refresh"]}
+            ).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_unrelated_update_keeps_tokens(self):
+        self.authorize(AccessToken.for_user(self.user))
+
+        self.user.first_name = "Test"
+        self.user.save()
+
+        self.assertEqual(
+            self.client.get(FLIGHT_URL).status_code, status.HTTP_200_OK
+        )
+
+    def test_deactivation_revokes_tokens(self):
+        self.authorize(AccessToken.for_user(self.user))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(
+            self.client.get(FLIGHT_URL).status_code, status.HTTP_200_OK
+        )
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            self.client.get(FLIGHT_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_lost_auth_cache_keeps_tokens(self):
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+        self.authorize(response.data["access"])
+
+        caches["auth"].clear()
+
+        self.assertEqual(
+            self.client.get(FLIGHT_URL).status_code, status.HTTP_200_OK
+        )
+        self.assertEqual(
+            self.client.post(
+                REFRESH_URL, {"refresh": response.data["refresh"]}
+            ).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_revocation_marker_expires_with_refresh_tokens(self):
+        revoke_tokens(self.user.pk)
+        key = REVOKED_KEY.format(user_id=self.user.pk)
+        lifetime = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        now = time.time()
+
+        with mock.patch("time.time", return_value=now + lifetime - 60):
+            self.assertIsNotNone(caches["auth"].get(key))
+        with mock.patch("time.time", return_value=now + lifetime + 60):
+            self.assertIsNone(caches["auth"].get(key))
+
+    def test_token_without_claims_loads_user(self):
+        self.authorize(LegacyAccessToken.for_user(self.user))
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "test@test.com")
@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user.authentication import user_cache
+from user.hashers import hash_pool
+from user.tokens import AccessToken
+
+REGISTER_URL = reverse("user:create")
+TOKEN_URL = reverse("user:token_obtain_pair")
+FLIGHT_URL = reverse("airport:flight-list")
+
+SCRYPT = [
+    "user.hashers.ScryptPasswordHasher",
+    "user.hashers.PBKDF2PasswordHasher",
+]
+
+
+@override_settings(PASSWORD_HASHERS=SCRYPT)
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["auth"].clear()
+        user_cache.clear()
+        self.client = APIClient()
+
+    def login(self):
+        return self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+
+    def test_new_password_uses_preferred_hasher(self):
+        response = self.client.post(
+            REGISTER_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            get_user_model().objects.get().password.startswith("scrypt$")
+        )
+
+    def test_login_rehashes_old_hash_and_keeps_tokens(self):
+        user = get_user_model().objects.create(
+            email="test@test.com",
+            password=make_password("testpass", hasher="pbkdf2_sha256"),
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertEqual(
+            self.client.get(FLIGHT_URL).status_code, status.HTTP_200_OK
+        )
+
+    def test_login_rehashes_with_new_params(self):
+        get_user_model().objects.create_user("test@test.com", "testpass")
+        params = {
+            **settings.PASSWORD_HASH_PARAMS,
+            "scrypt": {
+                **settings.PASSWORD_HASH_PARAMS["scrypt"],
+                "work_factor": 2 ** 12,
+            },
+        }
+
+        with self.settings(PASSWORD_HASH_PARAMS=params):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.assertTrue(
+            get_user_model().objects.get().password.startswith("scrypt$4096$")
+        )
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0)
+    def test_full_hash_pool_rejects_sign_up(self):
+        _executor, slots = hash_pool._start()
+        slots.acquire()
+        try:
+            response = self.client.post(
+                REGISTER_URL,
+                {"email": "test@test.com", "password": "testpass"},
+            )
+        finally:
+            slots.release()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertFalse(get_user_model().objects.exists())
@@ -0,0 +1,31 @@
+import time
+
+from rest_framework_simplejwt import tokens
+
+from user.authentication import ISSUED_AT_CLAIM
+
+CLAIM_FIELDS = ("is_staff", "is_superuser")
+
+
+class UserClaimsMixin:
+    """
+    Carries what permissions need and the precise issue time checked
+    against revocations, so ``StatelessJWTAuthentication`` can skip the
+    user query.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        token[ISSUED_AT_CLAIM] = time.time()
+        return token
+
+
+class AccessToken(UserClaimsMixin, tokens.AccessToken):
+    pass
+
+
+class RefreshToken(UserClaimsMixin, tokens.RefreshToken):
+    access_token_class = AccessToken
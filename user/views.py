@@ -1,6 +1,7 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
+from user.authentication import get_request_user
 from user.serializers import UserSerializer
 
 
@@ -14,4 +15,4 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        return get_request_user(self.request)